@@ -3,8 +3,9 @@
 """
 
 from .Gelya_Speach import GelyaSpeach
+from .tts_service import TTSService, get_tts_service
 
 # Создаем алиас для обратной совместимости
 AngelinaVoice = GelyaSpeach
 
-__all__ = ['GelyaSpeach', 'AngelinaVoice']
\ No newline at end of file
+__all__ = ['GelyaSpeach', 'AngelinaVoice', 'TTSService', 'get_tts_service']
\ No newline at end of file
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_phrase(text):
+    """Фраза для ключа кэша: без лишних пробелов по краям и внутри"""
+    return " ".join(str(text).split())
+
+
+class AudioCache:
+    """Кэш озвученных фраз: PCM в памяти + копия на диске.
+
+    Ключ - хэш текста и параметров голоса (модель, pitch, index_rate), так
+    что другая интонация или голос дают другую запись. В памяти держится
+    не больше max_memory_bytes сэмплов, самые давно не использованные
+    записи вытесняются (LRU) и дальше читаются с диска. Файлы на диске
+    (.npz: сэмплы float32 + частота) пишутся атомарно и тоже ограничены
+    по объему - удаляются самые старые.
+    """
+
+    def __init__(self, path="cache/tts_audio", max_memory_bytes=64 * 1024 * 1024,
+                 max_disk_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = {}
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._scan_disk()
+
+    def _scan_disk(self):
+        """Собирает список файлов кэша (от старых к новым)"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            files = []
+            for name in os.listdir(self.path):
+                if name.endswith(".npz"):
+                    full = os.path.join(self.path, name)
+                    stat = os.stat(full)
+                    files.append((stat.st_mtime, name[:-4], stat.st_size))
+        except OSError as e:
+            print(f"[TTS CACHE] Не удалось открыть {self.path}: {e}")
+            self.path = None
+            return
+
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def make_key(self, text, **voice):
+        """Ключ записи по тексту и параметрам голоса"""
+        params = "\0".join(f"{name}={voice[name]}" for name in sorted(voice))
+        raw = f"{normalize_phrase(text)}\0{params}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.npz")
+
+    def get(self, key):
+        """Возвращает (samples, samplerate) или None. Запись с диска поднимается в память"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            on_disk = self.path is not None and key in self._disk
+
+        if on_disk:
+            try:
+                with np.load(self._file(key), allow_pickle=False) as data:
+                    entry = (data["samples"], int(data["samplerate"]))
+            except Exception as e:
+                print(f"[TTS CACHE] Ошибка чтения записи {key[:8]}: {e}")
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, entry)
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, samples, samplerate):
+        """Сохраняет фразу в памяти и на диске"""
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        samples.flags.writeable = False
+        entry = (samples, int(samplerate))
+        with self._lock:
+            self._remember(key, entry)
+            self.stores += 1
+        if self.path is not None:
+            self._write(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        """Кладет запись в память и вытесняет лишние (под блокировкой)"""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[0].nbytes
+        self._memory[key] = entry
+        self._memory_bytes += entry[0].nbytes
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, (old_samples, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= old_samples.nbytes
+            self.evictions += 1
+
+    def _write(self, key, entry):
+        """Атомарная запись файла и ограничение объема на диске"""
+        samples, samplerate = entry
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".tts-", suffix=".tmp", dir=self.path)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, samples=samples, samplerate=np.int32(samplerate))
+                os.replace(tmp_path, self._file(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            print(f"[TTS CACHE] Не удалось сохранить запись: {e}")
+            return
+
+        size = os.path.getsize(self._file(key))
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+            removed = []
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                old_key = next(iter(self._disk))
+                self._disk_bytes -= self._disk.pop(old_key)
+                removed.append(old_key)
+
+        for old_key in removed:
+            try:
+                os.remove(self._file(old_key))
+            except OSError:
+                pass
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._memory or (self.path is not None and key in self._disk)
+
+    def stats(self):
+        """Счетчики попаданий и объем кэша"""
+        with self._lock:
+            total = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "hit_rate": (self.memory_hits + self.disk_hits) / total if total else 0.0,
+            }
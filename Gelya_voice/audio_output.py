@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+def _ramp(length):
+    """Плавное нарастание 0 -> 1 (sin^2: в сумме с зеркальным затуханием дает 1)"""
+    return np.sin(np.linspace(0, np.pi / 2, length, dtype=np.float32)) ** 2
+
+
+def _open_sounddevice(samplerate, channels, blocksize, callback):
+    import sounddevice as sd
+    return sd.OutputStream(samplerate=samplerate, channels=channels, dtype="float32",
+                           blocksize=blocksize, callback=callback)
+
+
+class AudioOutput:
+    """Постоянный выходной аудиопоток для озвучки.
+
+    Устройство открывается один раз (при первой фразе) и дальше не
+    закрывается: play() только добавляет PCM в очередь, которую забирает
+    колбэк потока. Куски одной фразы склеиваются без щелчков: хвост каждого
+    куска плавно затухает, а если он еще не проигран, начало следующего
+    накладывается на него (crossfade). Если очередь опустела раньше, чем
+    пришел следующий кусок, новый кусок начинается с плавного нарастания.
+
+    stream_factory(samplerate, channels, blocksize, callback) можно подменить
+    (например, имитацией устройства в бенчмарке).
+    """
+
+    def __init__(self, blocksize=512, crossfade_ms=10, stream_factory=None):
+        self.blocksize = blocksize
+        self.crossfade_ms = crossfade_ms
+        self.stream_factory = stream_factory or _open_sounddevice
+
+        self.samplerate = None
+        self.opens = 0
+        self.open_seconds = 0.0
+        self.chunks = 0
+        self.gaps = 0
+        # Время (perf_counter), когда колбэк отдал первый сэмпл текущей фразы
+        self.first_audio = None
+
+        self._stream = None
+        self._queue = deque()
+        self._offset = 0
+        self._fade = 0
+        self._expecting = False
+        self._playing = False
+        self._lock = threading.Lock()
+        self._drained = threading.Event()
+        self._drained.set()
+
+    def _ensure_stream(self, samplerate):
+        """Открывает поток или переоткрывает его при смене частоты"""
+        if self._stream is not None and samplerate == self.samplerate:
+            return
+        if self._stream is not None:
+            self.wait()
+            self._close_stream()
+
+        self._fade = max(1, int(samplerate * self.crossfade_ms / 1000))
+
+        started = time.perf_counter()
+        self._stream = self.stream_factory(samplerate, 1, self.blocksize, self._callback)
+        self._stream.start()
+        self.samplerate = samplerate
+        self.opens += 1
+        self.open_seconds += time.perf_counter() - started
+        print(f"[AUDIO OUT] Поток вывода открыт: {samplerate} Гц за {(time.perf_counter() - started) * 1000:.0f} мс")
+
+    def expect_more(self, expecting):
+        """Идет фраза, будут еще куски: пустая очередь между ними считается разрывом.
+
+        expect_more(True) начинает новую фразу и сбрасывает first_audio.
+        """
+        with self._lock:
+            if expecting and not self._expecting:
+                self.first_audio = None
+            self._expecting = expecting
+
+    def play(self, samples, samplerate):
+        """Добавляет кусок в очередь воспроизведения. Не блокирует"""
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1, dtype=np.float32)
+        else:
+            samples = samples.copy()
+        if not len(samples):
+            return
+
+        self._ensure_stream(samplerate)
+        fade = min(self._fade, len(samples) // 2)
+
+        with self._lock:
+            unplayed = 0
+            if self._queue:
+                last = self._queue[-1]
+                unplayed = len(last) - (self._offset if len(self._queue) == 1 else 0)
+
+            if fade and unplayed >= fade:
+                # Хвост предыдущего куска уже затухает - накладываем на него нарастающее начало
+                last[-fade:] += samples[:fade] * _ramp(fade)
+                samples = samples[fade:]
+            elif fade:
+                samples[:fade] *= _ramp(fade)
+
+            if fade and len(samples) >= fade:
+                samples[-fade:] *= _ramp(fade)[::-1]
+
+            if len(samples):
+                self._queue.append(samples)
+            self.chunks += 1
+            self._drained.clear()
+
+    def _callback(self, outdata, frames, time_info, status):
+        """Колбэк устройства: отдает очередь, остаток блока - тишина"""
+        out = outdata[:, 0]
+        filled = 0
+        with self._lock:
+            while filled < frames and self._queue:
+                chunk = self._queue[0]
+                take = min(frames - filled, len(chunk) - self._offset)
+                out[filled:filled + take] = chunk[self._offset:self._offset + take]
+                filled += take
+                self._offset += take
+                if self._offset >= len(chunk):
+                    self._queue.popleft()
+                    self._offset = 0
+
+            if filled:
+                self._playing = True
+                if self.first_audio is None:
+                    self.first_audio = time.perf_counter()
+
+            if filled < frames:
+                out[filled:] = 0
+                if self._playing and self._expecting:
+                    self.gaps += 1
+                if not self._queue:
+                    self._playing = False
+                    self._drained.set()
+
+    def wait(self, timeout=None):
+        """Ждет, пока вся очередь будет проиграна"""
+        return self._drained.wait(timeout)
+
+    def stop(self):
+        """Сбрасывает еще не проигранный звук (поток остается открытым)"""
+        with self._lock:
+            self._queue.clear()
+            self._offset = 0
+            self._playing = False
+            self._drained.set()
+
+    def _close_stream(self):
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except Exception as e:
+            print(f"[AUDIO OUT] Ошибка закрытия потока: {e}")
+        self._stream = None
+
+    def close(self):
+        """Закрывает устройство"""
+        self.stop()
+        if self._stream is not None:
+            self._close_stream()
+
+    def stats(self):
+        return {
+            "opens": self.opens,
+            "open_ms": self.open_seconds * 1000,
+            "chunks": self.chunks,
+            "gaps": self.gaps,
+            "samplerate": self.samplerate,
+        }
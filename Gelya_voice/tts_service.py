@@ -0,0 +1,389 @@
+import concurrent.futures
+import os
+import queue
+import re
+import threading
+import time
+
+
+DEFAULT_MODEL_PATH = "models/gelya_voice_1.pth"
+DEFAULT_INDEX_PATH = "logs/added_IVF2611_Flat_nprobe_1_gelya_voice_1_v1.index"
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:—])\s+")
+
+
+def split_phrases(text, max_chars=100, min_chars=12):
+    """Режет ответ на куски для потоковой озвучки.
+
+    Сначала по предложениям, слишком длинные предложения - по запятым и
+    другим знакам внутри них (части набираются до max_chars). Куски короче min_chars приклеиваются к
+    следующему, чтобы не обрывать интонацию на "Ох," или "Да.", а короткий
+    последний кусок ("Целую!") - к предыдущему.
+    """
+    text = " ".join(str(text).split())
+    if not text:
+        return []
+
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        # Длинное предложение: набираем части до запятых, пока влезают в max_chars
+        part = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if part and len(part) + 1 + len(clause) > max_chars:
+                pieces.append(part)
+                part = clause
+            else:
+                part = f"{part} {clause}" if part else clause
+        pieces.append(part)
+
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) < min_chars:
+            chunks[-1] += " " + piece
+        else:
+            chunks.append(piece)
+    if len(chunks) > 1 and len(chunks[-1]) < min_chars:
+        tail = chunks.pop()
+        chunks[-1] += " " + tail
+    return chunks
+
+
+def resolve_device(device):
+    """Возвращает device, если он доступен, иначе "cpu".
+
+    Для "cuda..." проверяется torch.cuda.is_available(); torch импортируется
+    только здесь, чтобы модуль сервиса оставался легким.
+    """
+    if not device or not str(device).startswith("cuda"):
+        return device or "cpu"
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return device
+        print(f"[TTS] {device} недоступен, использую CPU")
+    except ImportError:
+        print("[TTS] torch не найден, использую CPU")
+    return "cpu"
+
+
+def _create_rvc(model_path, index_path, device):
+    from tts_with_rvc import TTS_RVC
+    return TTS_RVC(model_path=model_path, index_path=index_path, device=device)
+
+
+def _read_file(path):
+    import soundfile as sf
+    return sf.read(path, dtype="float32")
+
+
+class TTSService:
+    """Один голосовой движок на весь процесс.
+
+    Модель RVC и индекс FAISS загружаются один раз и только при первой фразе
+    (или при явном warm_up). Фразы ставятся в очередь и озвучиваются по одной
+    в отдельном потоке, поэтому сервисом можно пользоваться из любого потока.
+    Если нужный device (обычно "cuda:0") недоступен или модель на нем не
+    загрузилась, движок загружается на CPU.
+
+    С cache (AudioCache) уже озвученные фразы воспроизводятся из кэша без
+    синтеза, а prewarm() заранее озвучивает частые ответы в фоне.
+
+    В потоковом режиме (streaming) ответ режется на предложения: кусок N
+    играет в постоянном потоке вывода (AudioOutput), пока синтезируется
+    кусок N+1, поэтому время до первого звука не зависит от длины ответа.
+
+    Движок может вернуть готовый буфер (samples float32, samplerate) - тогда
+    звук идет в поток вывода, не касаясь диска. Если он возвращает путь к
+    файлу (как TTS_RVC), файл сразу читается в float32 через reader.
+
+    backend_factory(model_path, index_path, device), reader(path) -> (samples,
+    samplerate) и output (AudioOutput) можно подменить - например,
+    заглушками для бенчмарка. player(samples, samplerate) вместо output
+    проигрывает каждый кусок блокирующим вызовом.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, index_path=DEFAULT_INDEX_PATH, device="cuda:0",
+                 pitch=12, index_rate=1.4, max_retries=3, retry_delay=2.0,
+                 backend_factory=None, reader=None, player=None, cache=None, streaming=True, output=None):
+        self.model_path = model_path
+        self.index_path = index_path
+        self.device = device
+        self.pitch = pitch
+        self.index_rate = index_rate
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.backend_factory = backend_factory or _create_rvc
+        self.reader = reader or _read_file
+        self.player = player
+        self.cache = cache
+        self.streaming = streaming
+        self.output = output
+
+        # Устройство, на котором модель реально загружена
+        self.active_device = None
+        self.load_time = None
+        self.spoken = 0
+        self.failed = 0
+        # Сколько раз и как долго читали аудиофайл движка (0 при синтезе в память)
+        self.file_reads = 0
+        self.file_read_seconds = 0.0
+        # Время от начала озвучки фразы до первого звука (только с output)
+        self.last_ttfa = None
+
+        self._backend = None
+        self._load_lock = threading.Lock()
+        # Движок синтеза не рассчитан на параллельные вызовы (озвучка + прогрев кэша)
+        self._synth_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._speaking = threading.Event()
+
+    @property
+    def is_loaded(self):
+        return self._backend is not None
+
+    @property
+    def is_speaking(self):
+        """Идет озвучка фразы (от синтеза до конца воспроизведения)"""
+        return self._speaking.is_set()
+
+    def _load(self):
+        """Загружает движок один раз (потокобезопасно)"""
+        if self._backend is not None:
+            return self._backend
+        with self._load_lock:
+            if self._backend is not None:
+                return self._backend
+
+            started = time.perf_counter()
+            device = resolve_device(self.device)
+            try:
+                backend = self.backend_factory(self.model_path, self.index_path, device)
+            except Exception as e:
+                if device == "cpu":
+                    raise
+                print(f"[TTS] Не удалось загрузить модель на {device}: {e}. Пробую CPU")
+                device = "cpu"
+                backend = self.backend_factory(self.model_path, self.index_path, device)
+
+            self.active_device = device
+            self.load_time = time.perf_counter() - started
+            self._backend = backend
+            print(f"[TTS] Голосовая модель загружена на {device} за {self.load_time:.1f} с")
+            return backend
+
+    def warm_up(self):
+        """Загружает модель заранее (например, в фоне при старте)"""
+        try:
+            self._load()
+            return True
+        except Exception as e:
+            print(f"[TTS] Ошибка загрузки голосовой модели: {e}")
+            return False
+
+    def synthesize(self, text):
+        """Синтезирует фразу: (samples, samplerate) или путь к аудиофайлу - как умеет движок"""
+        backend = self._load()
+        with self._synth_lock:
+            return backend(text=text, pitch=self.pitch, index_rate=self.index_rate)
+
+    def cache_key(self, text):
+        """Ключ фразы в кэше: текст + голос + параметры синтеза"""
+        return self.cache.make_key(text, model=os.path.basename(self.model_path),
+                                   pitch=self.pitch, index_rate=self.index_rate)
+
+    def render(self, text):
+        """PCM фразы (samples float32, samplerate): из кэша или синтезом"""
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = self.synthesize(text)
+        if isinstance(result, (str, os.PathLike)):
+            # Движок умеет только писать файл - читаем его сразу в float32
+            started = time.perf_counter()
+            samples, samplerate = self.reader(result)
+            self.file_reads += 1
+            self.file_read_seconds += time.perf_counter() - started
+        else:
+            # Движок отдал буфер - без записи и чтения WAV
+            import numpy as np
+            samples, samplerate = result
+            samples = np.asarray(samples, dtype=np.float32)
+        if key is not None:
+            return self.cache.put(key, samples, samplerate)
+        return samples, samplerate
+
+    def prewarm(self, phrases):
+        """Озвучивает частые фразы в кэш в фоновом потоке. Возвращает поток"""
+        def run():
+            if self.cache is None or not self.warm_up():
+                return
+            started = time.perf_counter()
+            rendered = 0
+            for phrase in phrases:
+                # В кэш попадают те же куски, на которые фраза режется при озвучке
+                for chunk in self._chunks(phrase):
+                    try:
+                        if self.cache_key(chunk) not in self.cache:
+                            self.render(chunk)
+                            rendered += 1
+                    except Exception as e:
+                        print(f"[TTS] Не удалось прогреть фразу '{chunk}': {e}")
+            print(f"[TTS] Кэш фраз прогрет: {rendered} новых кусков для {len(phrases)} фраз "
+                  f"за {time.perf_counter() - started:.1f} с")
+
+        thread = threading.Thread(target=run, name="tts-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def _ensure_worker(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="tts-service", daemon=True)
+            self._thread.start()
+
+    def submit(self, text, max_retries=None):
+        """Ставит фразу в очередь озвучки. Не блокирует, возвращает Future (True - озвучено).
+
+        max_retries - попыток синтеза на кусок (None - значение сервиса).
+        """
+        future = concurrent.futures.Future()
+        self._queue.put((text, future, max_retries))
+        self._ensure_worker()
+        return future
+
+    def speak(self, text, wait=True, max_retries=None):
+        """Озвучивает фразу. По умолчанию ждет окончания воспроизведения"""
+        future = self.submit(text, max_retries)
+        if not wait:
+            return future
+        return future.result()
+
+    def _run(self):
+        while True:
+            text, future, max_retries = self._queue.get()
+            if text is None:
+                future.set_result(False)
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._speaking.set()
+            try:
+                future.set_result(self._speak_now(text, max_retries))
+            finally:
+                self._speaking.clear()
+
+    def _chunks(self, text):
+        if self.streaming:
+            return split_phrases(text)
+        return [text]
+
+    def _get_output(self):
+        if self.output is None:
+            from .audio_output import AudioOutput
+            self.output = AudioOutput()
+        return self.output
+
+    def _render_with_retries(self, text, max_retries=None):
+        """PCM куска или None, если синтез так и не удался"""
+        if max_retries is None:
+            max_retries = self.max_retries
+        for attempt in range(max_retries):
+            try:
+                return self.render(text)
+            except Exception as e:
+                print(f"❌ Ошибка (попытка {attempt+1}): {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(self.retry_delay)
+        return None
+
+    def _speak_now(self, text, max_retries=None):
+        """Синтез и воспроизведение по кускам (в потоке сервиса).
+
+        play() потока вывода не блокирует, поэтому следующий кусок
+        синтезируется, пока звучит предыдущий. Возвращает управление
+        после того, как фраза доиграна.
+        """
+        started = time.perf_counter()
+        output = self._get_output() if self.player is None else None
+        played = 0
+        duration = 0.0
+        failed = False
+
+        if output is not None:
+            output.expect_more(True)
+        try:
+            for chunk in self._chunks(text):
+                audio = self._render_with_retries(chunk, max_retries)
+                if audio is None:
+                    failed = True
+                    continue
+                if not played:
+                    print("▶️ Воспроизведение...")
+                played += 1
+                duration += len(audio[0]) / audio[1]
+                if output is not None:
+                    output.play(*audio)
+                else:
+                    self.player(*audio)
+        finally:
+            if output is not None:
+                output.expect_more(False)
+                # С запасом на случай, если устройство перестало забирать звук
+                if not output.wait(timeout=duration + 5.0):
+                    print("[TTS] Поток вывода не доиграл фразу, сбрасываю")
+                    output.stop()
+                if played and output.first_audio is not None:
+                    self.last_ttfa = output.first_audio - started
+
+        if failed or not played:
+            self.failed += 1
+            return False
+        self.spoken += 1
+        return True
+
+    def pending(self):
+        """Количество фраз в очереди"""
+        return self._queue.qsize()
+
+    def shutdown(self, timeout=2.0):
+        """Останавливает поток озвучки после уже поставленных фраз"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put((None, concurrent.futures.Future(), None))
+            self._thread.join(timeout=timeout)
+        if self.output is not None:
+            self.output.close()
+
+
+# Единый голосовой движок на процесс
+_tts_service = None
+_tts_service_lock = threading.Lock()
+
+
+def get_tts_service():
+    """Получить глобальный экземпляр сервиса озвучки (модель загрузится при первой фразе)"""
+    global _tts_service
+    if _tts_service is None:
+        with _tts_service_lock:
+            if _tts_service is None:
+                try:
+                    from config.config import TTS_DEVICE
+                except ImportError:
+                    TTS_DEVICE = "cuda:0"
+                # numpy нужен только кэшу - импортируем вместе с сервисом, а не с пакетом
+                from .audio_cache import AudioCache
+                _tts_service = TTSService(device=TTS_DEVICE, cache=AudioCache())
+    return _tts_service
@@ -0,0 +1,5 @@
+"""
+Замеры производительности компонентов Gelya.
+
+Запуск из корня проекта: python -m benchmarks.<имя_модуля>
+"""
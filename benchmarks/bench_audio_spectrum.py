@@ -0,0 +1,99 @@
+# benchmarks/bench_audio_spectrum.py
+"""
+Стоимость аудио-колбэка светомузыки на синтетическом звуке.
+
+"До": среднее |x| по буферу + deque и list(...)[-10:] на каждый колбэк.
+"После": SpectrumAnalyzer - окно, БПФ, полосы, поиск ударов в заранее
+выделенных буферах. Синтетический сигнал - тон 880 Гц, шум и "бочка"
+60 Гц на 120 BPM, так что ожидается ~2 удара в секунду.
+
+Запуск: python -m benchmarks.bench_audio_spectrum [секунд_звука]
+"""
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from light.audio_spectrum import SpectrumAnalyzer
+
+SAMPLE_RATE = 44100
+FRAME_SIZE = 1024
+
+
+def make_audio(seconds, bpm=120):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    signal = 0.2 * np.sin(2 * np.pi * 880 * t) + 0.01 * rng.standard_normal(len(t))
+
+    kick_length = int(0.12 * SAMPLE_RATE)
+    k = np.arange(kick_length)
+    kick = 0.8 * np.sin(2 * np.pi * 60 * k / SAMPLE_RATE) * np.exp(-k / (0.03 * SAMPLE_RATE))
+    for beat in np.arange(0, seconds, 60.0 / bpm):
+        start = int(beat * SAMPLE_RATE)
+        end = min(start + kick_length, len(signal))
+        signal[start:end] += kick[:end - start]
+
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    return [pcm[i:i + FRAME_SIZE].tobytes() for i in range(0, len(pcm) - FRAME_SIZE + 1, FRAME_SIZE)]
+
+
+def old_callback_factory():
+    audio_data = deque(maxlen=100)
+
+    def callback(in_data):
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        audio_data.append(np.mean(np.abs(samples)))
+        if len(audio_data) > 10:
+            return np.mean(list(audio_data)[-10:])
+    return callback
+
+
+def measure(callback, buffers):
+    timings = np.empty(len(buffers))
+    for i, data in enumerate(buffers):
+        started = time.perf_counter()
+        callback(data)
+        timings[i] = time.perf_counter() - started
+    return timings * 1e6
+
+
+def peak_allocation(callback, buffers):
+    """Наибольший объем временной памяти, выделенной за один колбэк"""
+    tracemalloc.start()
+    peak = 0
+    for data in buffers:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        callback(data)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return peak
+
+
+def report(title, timings, allocated):
+    budget = FRAME_SIZE / SAMPLE_RATE * 1e6
+    print(f"{title}:")
+    print(f"  среднее {timings.mean():.1f} мкс, p95 {np.percentile(timings, 95):.1f} мкс, "
+          f"макс {timings.max():.1f} мкс ({timings.mean() / budget * 100:.2f}% бюджета буфера {budget / 1000:.1f} мс)")
+    print(f"  временные выделения: до {allocated} байт за колбэк")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    buffers = make_audio(seconds)
+    print(f"{len(buffers)} буферов по {FRAME_SIZE} сэмплов ({seconds:.0f} с звука)")
+
+    report("До (средняя громкость + deque)", measure(old_callback_factory(), buffers),
+           peak_allocation(old_callback_factory(), buffers))
+
+    analyzer = SpectrumAnalyzer(frame_size=FRAME_SIZE, sample_rate=SAMPLE_RATE)
+    timings = measure(analyzer.process, buffers)
+    report("После (SpectrumAnalyzer)", timings,
+           peak_allocation(SpectrumAnalyzer(frame_size=FRAME_SIZE, sample_rate=SAMPLE_RATE).process, buffers))
+    print(f"  найдено ударов: {analyzer.beats} (ожидалось ~{int(seconds * 2) - 2}, первая секунда - накопление истории)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_color_filter.py
+"""
+Сколько записей в порт в минуту делают умная подсветка и светомузыка.
+
+"До": каждый тик - новый цвет (линейное сглаживание 0.4 в sRGB, запись всегда).
+"После": ColorFilter - сглаживание в OKLab и отсев изменений меньше ΔE.
+
+Трассы цветов: синтетические (статичная сцена с шумом захвата, медленный
+закат, монтажные склейки видео, светомузыка) или записанная трасса из
+файла .npy (массив кадров T x 3 или T x N x 3, по тику на кадр).
+Кроме числа записей выводится отклик: через сколько тиков после склейки
+лента оказывается ближе ΔE 0.02 к новому цвету.
+
+Запуск: python -m benchmarks.bench_color_filter [трасса.npy] [тиков_в_секунду]
+"""
+import sys
+
+import numpy as np
+
+from light.color_filter import ColorFilter, srgb_to_oklab
+
+
+def static_scene(ticks, rng):
+    base = np.array([90, 110, 140], dtype=np.float64)
+    return base + rng.normal(0, 1.5, size=(ticks, 3))
+
+
+def sunset(ticks, rng):
+    start, end = np.array([255, 180, 90.0]), np.array([40, 30, 80.0])
+    t = np.linspace(0, 1, ticks)[:, None]
+    return start * (1 - t) + end * t + rng.normal(0, 1.0, size=(ticks, 3))
+
+
+def video_cuts(ticks, rng, shot=60):
+    colors = rng.integers(20, 230, size=(ticks // shot + 1, 3)).astype(np.float64)
+    trace = np.repeat(colors, shot, axis=0)[:ticks]
+    return trace + rng.normal(0, 2.0, size=(ticks, 3))
+
+
+def music(ticks, rng, fps=12.5, bpm=120):
+    t = np.arange(ticks) / fps
+    pulse = np.exp(-((t * bpm / 60) % 1.0) * 6)
+    level = 0.3 + 0.7 * pulse
+    return np.outer(level, [255, 60, 200]) + rng.normal(0, 1.0, size=(ticks, 3))
+
+
+def old_filter(trace):
+    """Старый цикл: сглаживание 0.4 в sRGB и запись каждый тик"""
+    last = np.array([50, 50, 50], dtype=np.float64)
+    writes = 0
+    for color in trace:
+        last = (last * 0.6 + color * 0.4).astype(int)
+        writes += 1
+    return writes
+
+
+def new_filter(trace):
+    color_filter = ColorFilter()
+    outputs = []
+    for color in trace:
+        outputs.append(color_filter.update(np.clip(color, 0, 255)))
+    return color_filter.emitted, outputs
+
+
+def response_ticks(trace, outputs, shot=60):
+    """Средняя задержка (в тиках) до выхода на новый цвет после склейки"""
+    delays = []
+    current = None
+    for cut in range(shot, len(trace), shot):
+        target = srgb_to_oklab(np.clip(trace[cut:cut + shot].mean(axis=0), 0, 255)[None])[0]
+        for i in range(cut, min(cut + shot, len(trace))):
+            if outputs[i] is not None:
+                current = srgb_to_oklab(outputs[i].reshape(-1, 3)[:1])[0]
+            if current is not None and np.linalg.norm(current - target) < 0.02:
+                delays.append(i - cut + 1)
+                break
+    return np.mean(delays) if delays else float("nan")
+
+
+def main():
+    args = sys.argv[1:]
+    path = next((arg for arg in args if arg.endswith(".npy")), None)
+    fps = next((float(arg) for arg in args if not arg.endswith(".npy")), 12.5)
+    ticks = int(fps * 60)
+    rng = np.random.default_rng(0)
+
+    if path:
+        recorded = np.load(path).astype(np.float64)
+        traces = {path: recorded.reshape(len(recorded), -1, 3)[:, 0]}
+        minutes = len(recorded) / fps / 60
+    else:
+        traces = {
+            "статичная сцена": static_scene(ticks, rng),
+            "закат (медленно)": sunset(ticks, rng),
+            "видео со склейками": video_cuts(ticks, rng),
+            "светомузыка 120 BPM": music(ticks, rng, fps),
+        }
+        minutes = 1.0
+
+    print(f"Тик {fps:g} Гц, записей в порт в минуту:")
+    print(f"  {'трасса':<22} {'до':>6} {'после':>6}")
+    for name, trace in traces.items():
+        before = old_filter(trace) / minutes
+        emitted, outputs = new_filter(trace)
+        line = f"  {name:<22} {before:>6.0f} {emitted / minutes:>6.0f}"
+        if name == "видео со склейками":
+            line += f"   отклик на склейку: {response_ticks(trace, outputs):.1f} тика"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_effects.py
+"""
+Скорость расчета кадров эффектов (без записи в порт).
+
+"До": цикл по светодиодам на Python с math.sin, как считались волна и дыхание.
+"После": EffectEngine - кадр целиком векторными операциями NumPy,
+таблица sin8, crossfade и одна таблица яркости/гаммы.
+
+Запуск: python -m benchmarks.bench_effects [кадров] [светодиодов]
+"""
+import math
+import sys
+import time
+
+from light.effects import EffectEngine, WaveEffect, BreathingEffect, SolidEffect
+
+PALETTE = [(150, 100, 200), (130, 80, 180), (110, 60, 160)]
+
+
+def python_sin8(x):
+    return int((math.sin((x % 256) / 255.0 * 2 * math.pi) + 1) * 127.5)
+
+
+def python_wave(t, num_leds, base, brightness):
+    frame = []
+    for i in range(num_leds):
+        wave = python_sin8(int(t * 5 / 0.03) + i * 15)
+        frame.append(tuple(int(c * wave / 255 * brightness / 100) for c in base))
+    return frame
+
+
+def python_breathing(t, num_leds, base, brightness):
+    factor = (math.sin(t * 2.0) + 1) / 2
+    color = tuple(int(c * factor * brightness / 100) for c in base)
+    return [color] * num_leds
+
+
+def measure(render, frames):
+    started = time.perf_counter()
+    for i in range(frames):
+        render(i / 60.0)
+    elapsed = time.perf_counter() - started
+    return frames / elapsed, elapsed / frames * 1e6
+
+
+def report(title, fps, frame_us):
+    print(f"  {title:<40} {fps:>10.0f} кадров/с  ({frame_us:.1f} мкс/кадр)")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_leds = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    base = PALETTE[0]
+
+    print(f"{num_leds} светодиодов, {frames} кадров")
+    print("До (Python, цикл по светодиодам):")
+    report("волна", *measure(lambda t: python_wave(t, num_leds, base, 80), frames))
+    report("дыхание", *measure(lambda t: python_breathing(t, num_leds, base, 80), frames))
+
+    engine = EffectEngine(num_leds, brightness=80, gamma=2.2)
+    engine.set_palette(PALETTE)
+
+    print("После (EffectEngine, NumPy + LUT):")
+    engine.set_effect(WaveEffect(num_leds))
+    report("волна (градиент палитры)", *measure(engine.render, frames))
+    engine.set_effect(BreathingEffect(num_leds))
+    report("дыхание", *measure(engine.render, frames))
+    engine.set_effect(SolidEffect())
+    report("статичный", *measure(engine.render, frames))
+
+    # Crossfade длиннее замера - все кадры считаются со смешиванием
+    engine.set_effect(BreathingEffect(num_leds))
+    engine.set_effect(WaveEffect(num_leds), fade=frames)
+    report("crossfade дыхание -> волна", *measure(engine.render, frames))
+
+
+if __name__ == "__main__":
+    main()
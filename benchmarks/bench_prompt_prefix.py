@@ -0,0 +1,60 @@
+# benchmarks/bench_prompt_prefix.py
+"""
+Сравнение стоимости оценки промпта в Ollama:
+- "до": текст пользователя вклеен в системный промпт (префикс каждый раз новый)
+- "после": неизменный системный промпт + отдельное сообщение пользователя
+
+Нужен запущенный Ollama. Запуск: python -m benchmarks.bench_prompt_prefix [модель]
+"""
+import sys
+
+from commands_checker.core.mixed_processor import MixedRequestProcessor
+from commands_checker.utils.ollama_client import get_ollama_client
+
+PHRASES = [
+    "как у тебя дела",
+    "включи что-нибудь повеселее",
+    "мне грустно, сделай свет потеплее",
+    "расскажи, что ты умеешь",
+    "сделай атмосферу для вечеринки",
+    "найди рецепт блинов",
+]
+
+
+def run(model, build_messages):
+    client = get_ollama_client()
+    tokens, durations = [], []
+    for phrase in PHRASES:
+        client.chat(model, build_messages(phrase), format="json", options={"temperature": 0.3, "num_predict": 1})
+        metrics = client.last_metrics
+        tokens.append(metrics.get("prompt_eval_count", 0))
+        durations.append(metrics.get("prompt_eval_duration", 0) / 1e6)
+    return tokens, durations
+
+
+def report(title, tokens, durations):
+    print(f"{title}:")
+    print(f"  токенов промпта на запрос: {tokens}")
+    print(f"  среднее: {sum(tokens) / len(tokens):.0f} токенов, {sum(durations) / len(durations):.0f} мс")
+
+
+def main():
+    model = sys.argv[1] if len(sys.argv) > 1 else "llama3"
+    processor = MixedRequestProcessor(model, use_fast_path=False, use_cache=False)
+    prompt = processor.get_mixed_prompt()
+
+    def glued(phrase):
+        return [{"role": "system", "content": prompt + f"\n\nЗапрос: {phrase}\nОтвет:"}]
+
+    def static_prefix(phrase):
+        return [{"role": "system", "content": prompt}, {"role": "user", "content": phrase}]
+
+    # Первый запрос загружает модель - в замер не входит
+    processor.warm_up()
+
+    report("До (пользовательский текст внутри системного промпта)", *run(model, glued))
+    report("После (статичный префикс + сообщение пользователя)", *run(model, static_prefix))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_screen_capture.py
+"""
+Время захвата и усреднения экрана для умной подсветки (на кадр).
+
+"До": снимок всего экрана, перевод в массив, среднее по центральной трети.
+"После": ScreenSampler - снимается только нужный регион, усредняется каждый
+step-й пиксель; отдельно - кадр ленты по краям экрана.
+
+По умолчанию используется синтетическая картинка 1920x1080 (регион
+копируется, как при настоящем захвате). С аргументом mss или pyautogui
+замеряется настоящий экран.
+
+Запуск: python -m benchmarks.bench_screen_capture [synthetic|mss|pyautogui] [кадров]
+"""
+import sys
+import time
+
+import numpy as np
+
+from light.screen_capture import ScreenSampler, SyntheticCapture, create_capture_backend
+
+
+def make_backend(name):
+    if name == "synthetic":
+        rng = np.random.default_rng(0)
+        return SyntheticCapture(rng.integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8))
+    return create_capture_backend(name)
+
+
+def old_center_color(backend):
+    width, height = backend.size
+    pixels = np.array(backend.grab((0, 0, width, height)))
+    h, w = pixels.shape[:2]
+    center = pixels[h // 3:2 * h // 3, w // 3:2 * w // 3]
+    return center.mean(axis=(0, 1))
+
+
+def measure(func, frames):
+    func()  # первый вызов создает бэкенд/буферы - в замер не входит
+    timings = np.empty(frames)
+    for i in range(frames):
+        started = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - started
+    return timings * 1000
+
+
+def report(title, timings):
+    print(f"  {title:<36} {timings.mean():7.2f} мс (p95 {np.percentile(timings, 95):.2f} мс)")
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else "synthetic"
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    backend = make_backend(name)
+    width, height = backend.size
+    print(f"Бэкенд {backend.name}, экран {width}x{height}, {frames} кадров")
+
+    report("До: весь экран + центр", measure(lambda: old_center_color(backend), frames))
+    for step in (1, 4, 8):
+        sampler = ScreenSampler(backend, step=step)
+        report(f"После: центр, шаг {step}", measure(sampler.center_color, frames))
+
+    sampler = ScreenSampler(backend, step=8)
+    frame = np.zeros((sampler.num_leds, 3), dtype=np.uint8)
+    report(f"После: края -> {sampler.num_leds} светодиодов", measure(lambda: sampler.edge_frame(frame), frames))
+
+
+if __name__ == "__main__":
+    main()
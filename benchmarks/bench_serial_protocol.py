@@ -0,0 +1,82 @@
+# benchmarks/bench_serial_protocol.py
+"""
+Частота кадров всей ленты: текстовый протокол против бинарного.
+
+Кадры отправляются через настоящий serial-порт на псевдотерминал (pty),
+на другой стороне которого FakeLedDevice разбирает их как прошивка.
+pty не ограничивает скорость, поэтому кроме измеренной частоты выводится
+предел для провода на заданном baudrate (10 бит на байт: старт + 8 + стоп).
+
+Только Linux/macOS. Запуск: python -m benchmarks.bench_serial_protocol [кадров] [baudrate]
+"""
+import sys
+import time
+
+import numpy as np
+import serial
+
+from light.fake_device import FakeLedDevice
+from light.serial_protocol import encode_frame, encode_ascii_frame
+
+NUM_LEDS = 60
+
+
+def make_frames(count):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(count, NUM_LEDS, 3), dtype=np.uint8)
+
+
+def run(protocol, encoder, frames, baudrate):
+    device = FakeLedDevice(NUM_LEDS, protocol=protocol)
+    port = serial.Serial(device.port, baudrate, timeout=0.1)
+    try:
+        started = time.perf_counter()
+        encode_time = 0.0
+        sent_bytes = 0
+        for frame in frames:
+            t0 = time.perf_counter()
+            packet = encoder(frame)
+            encode_time += time.perf_counter() - t0
+            port.write(packet)
+            sent_bytes += len(packet)
+        complete = device.wait_frames(len(frames), timeout=30.0)
+        elapsed = time.perf_counter() - started
+
+        frame_bytes = sent_bytes / len(frames)
+        return {
+            "frame_bytes": frame_bytes,
+            "encode_us": encode_time / len(frames) * 1e6,
+            "pty_fps": device.frames / elapsed,
+            "wire_fps": baudrate / 10 / frame_bytes,
+            "received": device.frames,
+            "complete": complete,
+            "last_frame_ok": bool((device.frame == frames[-1]).all()),
+            "checksum_errors": device.checksum_errors,
+        }
+    finally:
+        port.close()
+        device.close()
+
+
+def report(title, stats, total):
+    print(f"{title}:")
+    print(f"  байт на кадр:        {stats['frame_bytes']:.0f}")
+    print(f"  кодирование кадра:   {stats['encode_us']:.1f} мкс")
+    print(f"  через pty:           {stats['pty_fps']:.0f} кадров/с "
+          f"(получено {stats['received']}/{total}, последний кадр верен: {stats['last_frame_ok']})")
+    print(f"  предел провода:      {stats['wire_fps']:.1f} кадров/с")
+    if stats["checksum_errors"]:
+        print(f"  ошибок контрольной суммы: {stats['checksum_errors']}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    baudrate = int(sys.argv[2]) if len(sys.argv) > 2 else 115200
+    frames = make_frames(count)
+
+    report("ASCII \"r,g,b;...\\n\"", run("ascii", encode_ascii_frame, frames, baudrate), count)
+    report("Бинарный протокол", run("binary", encode_frame, frames, baudrate), count)
+
+
+if __name__ == "__main__":
+    main()
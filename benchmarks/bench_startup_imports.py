@@ -0,0 +1,78 @@
+# benchmarks/bench_startup_imports.py
+"""
+Отчет о стоимости импорта модулей ассистента (в духе python -X importtime).
+
+Каждый модуль импортируется в отдельном чистом процессе с -X importtime;
+модули, которые интерпретатор грузит и без него (site и т.п.), не учитываются.
+Печатается общее время импорта, самые дорогие модули (по собственному
+времени) и какие тяжелые зависимости оказались загружены при импорте -
+после переноса импортов в функции их здесь быть не должно.
+
+Запуск: python -m benchmarks.bench_startup_imports [модуль ...]
+"""
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "commands_checker",
+    "light",
+    "light.light_controller",
+    "Gelya_voice",
+    "player",
+]
+
+# Зависимости, которые должны грузиться только при первом использовании
+HEAVY_MODULES = ["numpy", "serial", "pyaudio", "pygame", "pyautogui", "mss", "tts_with_rvc",
+                 "torch", "sounddevice", "soundfile"]
+
+TOP = 10
+
+
+def import_times(statement):
+    """Выполняет statement в новом процессе. Возвращает ([(собств., накопл., имя)], ошибка)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+    entries = []
+    error = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            if line.strip():
+                error = line.strip()
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        entries.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+    return entries, error if result.returncode else None
+
+
+def report(module, baseline):
+    entries, error = import_times(f"import {module}")
+    entries = [entry for entry in entries if entry[2].strip() not in baseline]
+    names = {name.strip() for _, _, name in entries}
+    total = next((cumulative for _, cumulative, name in entries if name.strip() == module), None)
+
+    print(f"\n=== import {module} ===")
+    if error:
+        print(f"  ошибка импорта (время до нее): {error}")
+    if total is not None:
+        print(f"  всего: {total / 1000:.1f} мс, модулей загружено: {len(entries)}")
+
+    for self_us, cumulative_us, name in sorted(entries, reverse=True)[:TOP]:
+        print(f"  {self_us / 1000:8.1f} мс  (накопл. {cumulative_us / 1000:8.1f} мс)  {name.strip()}")
+
+    heavy = [name for name in HEAVY_MODULES if name in names]
+    print(f"  тяжелые зависимости: {', '.join(heavy) if heavy else 'нет'}")
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+    baseline = {name.strip() for _, _, name in import_times("pass")[0]}
+    for module in modules:
+        report(module, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_tts_cache.py
+"""
+Время до начала воспроизведения фразы с кэшем озвучки и без него.
+
+Синтез - заглушка: задержка растет с длиной текста (как у RVC), результат -
+PCM float32 40 кГц длительностью ~60 мс на символ. Сравниваются промах
+(синтез), попадание в память и попадание на диск (новый экземпляр кэша
+с пустой памятью - как после перезапуска), плюс фоновый прогрев.
+
+Запуск: python -m benchmarks.bench_tts_cache [мс_синтеза_на_символ]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from Gelya_voice.audio_cache import AudioCache
+from Gelya_voice.tts_service import TTSService
+
+SAMPLE_RATE = 40000
+PHRASES = ["хорошо", "сделано", "Извини, не поняла", "Ошибка", "Включаю волну, котик!",
+           "Привет! Я ангелина, твой голосовой помошник"]
+
+
+def make_service(cache, ms_per_char):
+    def synth(text, pitch, index_rate):
+        time.sleep(0.05 + len(text) * ms_per_char / 1000)
+        return text
+
+    def reader(text):
+        t = np.arange(int(SAMPLE_RATE * 0.06 * len(text))) / SAMPLE_RATE
+        return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), SAMPLE_RATE
+
+    return TTSService(backend_factory=lambda *args: synth, reader=reader, device="cpu",
+                      player=lambda samples, samplerate: None, cache=cache)
+
+
+def measure(service, phrases):
+    timings = []
+    for phrase in phrases:
+        started = time.perf_counter()
+        service.render(phrase)
+        timings.append((time.perf_counter() - started) * 1000)
+    return np.array(timings)
+
+
+def report(title, timings):
+    print(f"{title}: среднее {timings.mean():.2f} мс, макс {timings.max():.2f} мс")
+
+
+def main():
+    ms_per_char = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    with tempfile.TemporaryDirectory() as folder:
+        no_cache = make_service(None, ms_per_char)
+        no_cache.warm_up()
+        report("Без кэша (синтез каждой фразы)", measure(no_cache, PHRASES))
+
+        service = make_service(AudioCache(folder), ms_per_char)
+        service.warm_up()
+        report("Кэш, промах (синтез + запись)", measure(service, PHRASES))
+        report("Кэш, попадание в память", measure(service, PHRASES))
+
+        restarted = make_service(AudioCache(folder), ms_per_char)
+        report("Кэш, попадание на диск (после перезапуска)", measure(restarted, PHRASES))
+        print(f"  {restarted.cache.stats()}")
+
+        warm_folder = tempfile.mkdtemp(dir=folder)
+        prewarmed = make_service(AudioCache(warm_folder), ms_per_char)
+        prewarmed.prewarm(PHRASES).join()
+        report("После прогрева частых фраз", measure(prewarmed, PHRASES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/bench_tts_output_path.py
+"""
+Накладные расходы вывода озвучки на одну фразу: файл и открытие устройства.
+
+"До": движок пишет WAV во временную папку, фраза читается обратно
+(soundfile, если установлен, иначе wave), и под каждую фразу открывается
+новый поток вывода (как sd.play). "После": движок отдает буфер float32,
+и он уходит в один постоянный AudioOutput.
+
+Синтез - заглушка (тон 220 Гц, 40 кГц, ~2 с на фразу), сам синтез в
+замер не входит. Открытие устройства меряется на настоящем sounddevice,
+если он установлен и есть устройство вывода; иначе - только число открытий.
+
+Запуск: python -m benchmarks.bench_tts_output_path [фраз]
+"""
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from Gelya_voice.audio_output import AudioOutput
+from Gelya_voice.tts_service import TTSService
+
+SAMPLE_RATE = 40000
+SECONDS = 2.0
+
+
+def make_pcm():
+    t = np.arange(int(SAMPLE_RATE * SECONDS)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def write_wav(path, samples):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def read_wav(path):
+    try:
+        import soundfile as sf
+        return sf.read(path, dtype="float32")
+    except ImportError:
+        with wave.open(path, "rb") as f:
+            data = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+            return data.astype(np.float32) / 32768, f.getframerate()
+
+
+class NullStream:
+    """Поток, который ничего не играет - замеряется только путь до очереди"""
+
+    def __init__(self, *args):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def device_open_ms(count):
+    """Среднее время открытия+закрытия настоящего потока sounddevice или None"""
+    try:
+        import sounddevice as sd
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            stream = sd.OutputStream(samplerate=SAMPLE_RATE, channels=1, dtype="float32")
+            stream.start()
+            stream.stop()
+            stream.close()
+            timings.append((time.perf_counter() - started) * 1000)
+        return float(np.mean(timings))
+    except Exception as e:
+        print(f"sounddevice недоступен ({e}) - открытие устройства не замерено")
+        return None
+
+
+def run(service, phrases):
+    timings = []
+    for i in range(phrases):
+        started = time.perf_counter()
+        samples, samplerate = service.render(f"фраза {i}")
+        service.output.play(samples, samplerate)
+        timings.append((time.perf_counter() - started) * 1000)
+        service.output.stop()
+    return np.array(timings)
+
+
+def main():
+    phrases = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pcm = make_pcm()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tts_output.wav")
+
+        def file_backend(text, pitch, index_rate):
+            write_wav(path, pcm)
+            return path
+
+        def memory_backend(text, pitch, index_rate):
+            return pcm, SAMPLE_RATE
+
+        before = TTSService(backend_factory=lambda *args: file_backend, reader=read_wav, device="cpu",
+                            output=AudioOutput(stream_factory=NullStream))
+        after = TTSService(backend_factory=lambda *args: memory_backend, device="cpu",
+                           output=AudioOutput(stream_factory=NullStream))
+        before.warm_up()
+        after.warm_up()
+
+        # Запись WAV делает сам движок - меряем ее отдельно, чтение меряет сервис
+        started = time.perf_counter()
+        for _ in range(phrases):
+            write_wav(path, pcm)
+        write_ms = (time.perf_counter() - started) * 1000 / phrases
+
+        timings_before = run(before, phrases)
+        timings_after = run(after, phrases)
+
+    read_ms = before.file_read_seconds * 1000 / max(1, before.file_reads)
+    print(f"{phrases} фраз по {SECONDS:.0f} с ({pcm.nbytes // 1024} КБ float32 на фразу)")
+    print(f"До: запись WAV {write_ms:.2f} мс + чтение {read_ms:.2f} мс на фразу, "
+          f"от движка до очереди вывода {timings_before.mean():.2f} мс")
+    print(f"После: файлов прочитано {after.file_reads}, от движка до очереди вывода {timings_after.mean():.2f} мс")
+
+    open_ms = device_open_ms(min(phrases, 5))
+    opens_after = after.output.stats()["opens"]
+    if open_ms is not None:
+        print(f"Открытие устройства: {open_ms:.1f} мс; до - {phrases} открытий ({open_ms * phrases:.0f} мс), "
+              f"после - {opens_after} ({open_ms * opens_after:.0f} мс)")
+    else:
+        print(f"Открытий устройства: до - {phrases} (по одному на фразу), после - {opens_after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_tts_startup.py
+"""
+Время старта и память голосового движка с заглушкой вместо RVC.
+
+"До": GelyaSpeach() создавался при импорте в каждом модуле (command_handler,
+девять domains/*, main.py) - 11 загрузок модели. "После": все модули берут
+один TTSService, модель загружается один раз при первой фразе.
+Заглушка имитирует загрузку модели задержкой и выделением памяти
+(веса RVC + индекс FAISS), синтез - короткой задержкой.
+
+Запуск: python -m benchmarks.bench_tts_startup [мб_модели] [с_загрузки]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Gelya_voice.tts_service import TTSService
+
+CALL_SITES = 11
+
+
+class StubRVC:
+    def __init__(self, model_mb, load_seconds):
+        time.sleep(load_seconds)
+        # np.ones, а не np.empty - страницы памяти действительно заняты
+        self.weights = np.ones(int(model_mb * 1024 * 1024), dtype=np.uint8)
+
+    def __call__(self, text, pitch, index_rate):
+        time.sleep(0.01)
+        return "stub.wav"
+
+
+def measure(title, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{title}: {elapsed * 1000:.0f} мс, занято {current / 1024 / 1024:.1f} МБ")
+    return result
+
+
+def main():
+    model_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    load_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    print(f"Заглушка модели: {model_mb:.0f} МБ, загрузка {load_seconds:.1f} с, мест создания: {CALL_SITES}")
+
+    def factory(model_path, index_path, device):
+        return StubRVC(model_mb, load_seconds)
+
+    old = measure("До (движок в каждом модуле, старт)",
+                  lambda: [factory("model.pth", "model.index", "cpu") for _ in range(CALL_SITES)])
+    del old
+
+    service = measure("После (общий сервис, старт)",
+                      lambda: TTSService(backend_factory=factory, device="cpu",
+                                         reader=lambda path: (np.zeros(4000, dtype=np.float32), 40000),
+                                         player=lambda samples, samplerate: None))
+    measure("После (первая фраза, загрузка модели)", lambda: service.speak("Привет!"))
+
+    started = time.perf_counter()
+    futures = [service.submit(f"Фраза {i}") for i in range(10)]
+    ok = sum(future.result() for future in futures)
+    print(f"После (10 фраз через очередь): {(time.perf_counter() - started) * 1000:.0f} мс, "
+          f"озвучено {ok}, загрузок модели 1 (на {service.active_device})")
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_tts_streaming.py
+"""
+Время до первого звука (TTFA) в зависимости от длины ответа.
+
+"До": вся фраза синтезируется целиком и только потом играет.
+"После": фраза режется на предложения, кусок N+1 синтезируется, пока
+кусок N играет в постоянном потоке вывода.
+
+Синтез - заглушка с задержкой, пропорциональной длине текста; звук -
+~30 мс на символ. Устройство вывода имитируется потоком, который в
+реальном времени забирает блоки через колбэк AudioOutput. Кэш выключен.
+
+Запуск: python -m benchmarks.bench_tts_streaming [мс_синтеза_на_символ]
+"""
+import sys
+import threading
+import time
+
+import numpy as np
+
+from Gelya_voice.audio_output import AudioOutput
+from Gelya_voice.tts_service import TTSService, split_phrases
+
+SAMPLE_RATE = 16000
+AUDIO_SECONDS_PER_CHAR = 0.03
+
+SENTENCES = [
+    "Включаю волну, котик!",
+    "Сегодня вечером будет тепло и спокойно.",
+    "Могу поставить твой любимый плейлист, если захочешь.",
+    "А еще могу приглушить свет, чтобы было уютнее.",
+    "Только скажи, и я все сделаю, малыш.",
+]
+
+
+class FakeStream:
+    """Имитация устройства: забирает блоки через колбэк в реальном времени"""
+
+    def __init__(self, samplerate, channels, blocksize, callback):
+        self.interval = blocksize / samplerate
+        self.buffer = np.zeros((blocksize, channels), dtype=np.float32)
+        self.callback = callback
+        self.running = False
+        self.clicks = 0
+        self._previous = 0.0
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        next_time = time.perf_counter()
+        while self.running:
+            self.callback(self.buffer, len(self.buffer), None, None)
+            # Скачок между соседними сэмплами больше 0.2 - слышимый щелчок
+            samples = np.concatenate(([self._previous], self.buffer[:, 0]))
+            self.clicks += int(np.count_nonzero(np.abs(np.diff(samples)) > 0.2))
+            self._previous = samples[-1]
+            next_time += self.interval
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        pass
+
+
+def make_service(streaming, ms_per_char, streams):
+    def synth(text, pitch, index_rate):
+        time.sleep(0.03 + len(text) * ms_per_char / 1000)
+        return text
+
+    def reader(text):
+        t = np.arange(int(SAMPLE_RATE * AUDIO_SECONDS_PER_CHAR * len(text))) / SAMPLE_RATE
+        return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), SAMPLE_RATE
+
+    def stream_factory(*args):
+        stream = FakeStream(*args)
+        streams.append(stream)
+        return stream
+
+    output = AudioOutput(blocksize=256, stream_factory=stream_factory)
+    service = TTSService(backend_factory=lambda *args: synth, reader=reader, device="cpu",
+                         streaming=streaming, output=output)
+    service.warm_up()
+    return service
+
+
+def main():
+    ms_per_char = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    streams = []
+    whole = make_service(False, ms_per_char, streams)
+    pipelined = make_service(True, ms_per_char, streams)
+
+    print(f"{'предложений':>11} {'символов':>9} {'звук, с':>8} {'TTFA до, мс':>12} {'TTFA после, мс':>15} {'кусков':>7}")
+    for count in range(1, len(SENTENCES) + 1):
+        text = " ".join(SENTENCES[:count])
+        whole.speak(text)
+        pipelined.speak(text)
+        print(f"{count:>11} {len(text):>9} {len(text) * AUDIO_SECONDS_PER_CHAR:>8.1f} "
+              f"{whole.last_ttfa * 1000:>12.0f} {pipelined.last_ttfa * 1000:>15.0f} {len(split_phrases(text)):>7}")
+
+    stats = pipelined.output.stats()
+    print(f"Потоковый режим: открытий устройства {stats['opens']}, кусков {stats['chunks']}, "
+          f"разрывов {stats['gaps']}, щелчков {sum(stream.clicks for stream in streams)}")
+    whole.shutdown()
+    pipelined.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_vad.py
+"""
+Распознавание записанных WAV (16 кГц, 16 бит, моно) с VAD и без него:
+процессорное время и точность.
+
+Рядом с файлом можно положить эталонную расшифровку с тем же именем и
+расширением .txt - тогда считается WER, иначе результаты с VAD сравниваются
+с результатами без него.
+
+Запуск: python -m benchmarks.bench_vad путь/к/модели файл1.wav [файл2.wav ...]
+"""
+import os
+import sys
+import time
+
+from vosk import Model, KaldiRecognizer, SetLogLevel
+
+from voice_input import SpeechPipeline, WavFileSource, VADGate
+
+
+def word_error_rate(reference, hypothesis):
+    """WER по словам (расстояние Левенштейна / длина эталона)"""
+    ref, hyp = reference.split(), hypothesis.split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def recognize(model, path, use_vad):
+    source = WavFileSource(path)
+    vad = VADGate(sample_rate=16000, chunk_frames=4000) if use_vad else None
+    pipeline = SpeechPipeline(source, lambda rate: KaldiRecognizer(model, rate), chunk_frames=4000, vad=vad)
+
+    started = time.process_time()
+    pipeline.start()
+    text = " ".join(pipeline.results())
+    cpu = time.process_time() - started
+    return text, cpu, pipeline.stats()
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return
+
+    SetLogLevel(-1)
+    model = Model(sys.argv[1])
+    totals = {False: [0.0, 0.0], True: [0.0, 0.0]}
+
+    for path in sys.argv[2:]:
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding="utf-8") as f:
+                reference = f.read().strip().lower()
+
+        plain_text, plain_cpu, _ = recognize(model, path, use_vad=False)
+        gated_text, gated_cpu, stats = recognize(model, path, use_vad=True)
+        reference = reference if reference is not None else plain_text
+
+        print(f"{os.path.basename(path)}:")
+        for title, text, cpu, use_vad in (("без VAD", plain_text, plain_cpu, False),
+                                          ("с VAD  ", gated_text, gated_cpu, True)):
+            wer = word_error_rate(reference, text)
+            totals[use_vad][0] += cpu
+            totals[use_vad][1] += wer
+            print(f"  {title}: CPU {cpu:.2f} с, WER {wer:.2%} - '{text}'")
+        print(f"  VAD пропустил {stats['vad']['pass_ratio']:.0%} звука")
+
+    count = len(sys.argv) - 2
+    print(f"Итого CPU: без VAD {totals[False][0]:.2f} с, с VAD {totals[True][0]:.2f} с")
+    print(f"Средний WER: без VAD {totals[False][1] / count:.2%}, с VAD {totals[True][1] / count:.2%}")
+
+
+if __name__ == "__main__":
+    main()
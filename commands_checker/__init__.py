@@ -1,5 +1,5 @@
 # commands_checker/__init__.py
-from .core import SmartCommandHandler, OllamaIntentAnalyzer
+from .core import SmartCommandHandler, OllamaIntentAnalyzer, BackgroundStartup
 from .domains.music import MusicPlayback, MusicVolume, MusicPlaylists
 from .domains.system import SystemBrowser, SystemSearch, SystemPower
 from .domains.light import LightColorControl, LightBrightnessControl, LightEffectControl, LightPaletteControl
@@ -9,7 +9,7 @@ from .utils import with_gelya_response
 CommandHandler = SmartCommandHandler
 
 __all__ = [
-    'SmartCommandHandler', 'CommandHandler', 'OllamaIntentAnalyzer',
+    'SmartCommandHandler', 'CommandHandler', 'OllamaIntentAnalyzer', 'BackgroundStartup',
     'MusicPlayback', 'MusicVolume', 'MusicPlaylists',
     'SystemBrowser', 'SystemSearch', 'SystemPower', 
     'LightColorControl', 'LightBrightnessControl', 'LightEffectControl', 'LightPaletteControl',
@@ -1,5 +1,7 @@
 # commands_checker/core/__init__.py
 from .command_handler import SmartCommandHandler
 from .intent_analyzer import OllamaIntentAnalyzer
+from .command_pipeline import CommandPipeline
+from .startup import BackgroundStartup
 
-__all__ = ['SmartCommandHandler', 'OllamaIntentAnalyzer']
\ No newline at end of file
+__all__ = ['SmartCommandHandler', 'OllamaIntentAnalyzer', 'CommandPipeline', 'BackgroundStartup']
\ No newline at end of file
@@ -1,6 +1,7 @@
 # commands_checker/core/command_handler.py
-import threading
 from .mixed_processor import MixedRequestProcessor
+from .command_pipeline import CommandPipeline
+from .fast_matcher import MUSIC_COMMANDS, SYSTEM_COMMANDS
 from ..domains.music.playback import MusicPlayback
 from ..domains.music.volume import MusicVolume
 from ..domains.music.playlists import MusicPlaylists
@@ -11,13 +12,28 @@ from ..domains.light.color_control import LightColorControl
 from ..domains.light.brightness_control import LightBrightnessControl
 from ..domains.light.effect_control import LightEffectControl
 from ..domains.light.palette_control import LightPaletteControl
+from ..domains.light.scene_control import LightSceneControl
 from ..utils.voice_response import with_gelya_response
-from Gelya_voice import GelyaSpeach
-
-gelya = GelyaSpeach()
+from Gelya_voice import get_tts_service
 
 class SmartCommandHandler:
-    def __init__(self, ollama_model="llama3"):
+    # Команды, которым для выполнения нужны parameters из ответа модели
+    PARAMETER_COMMANDS = {"set_volume", "set_brightness", "search", "switch_playlist", "create_playlist"}
+    
+    # Новая команда из той же группы отменяет еще не выполненную предыдущую
+    SUPERSEDE_GROUPS = {
+        "set_volume": "set_volume",
+        "set_brightness": "set_brightness",
+        "light_on": "light_power", "light_off": "light_power",
+        "play": "playback", "pause": "playback", "resume": "playback",
+        "music_mode": "light_mode", "wave_effect": "light_mode", "breathing_effect": "light_mode",
+        "monitor_mode": "light_mode", "static_mode": "light_mode",
+    }
+    
+    # Домен команд -> подсистема фоновой инициализации (BackgroundStartup)
+    STARTUP_GATES = {"light": "light", "music": "player", "voice": "tts"}
+    
+    def __init__(self, ollama_model="llama3", streaming=True, warm_up_llm=True, startup=None):
         # Инициализация доменов
         self.music_playback = MusicPlayback()
         self.music_volume = MusicVolume()
@@ -29,14 +45,36 @@ class SmartCommandHandler:
         self.light_brightness = LightBrightnessControl()
         self.light_effects = LightEffectControl()
         self.light_palettes = LightPaletteControl()
+        self.light_scenes = LightSceneControl()
         
-        # Умный процессор
-        self.mixed_processor = MixedRequestProcessor(ollama_model)
+        # Умный процессор (с быстрым локальным распознаванием команд)
+        self.mixed_processor = MixedRequestProcessor(
+            ollama_model,
+            supported_commands=self._get_command_map({}).keys(),
+            warm_up=warm_up_llm
+        )
+        
+        # Очереди выполнения команд и озвучки
+        self.pipeline = CommandPipeline()
+        
+        # Пока подсистема грузится в фоне, ее команды ждут в очереди своего домена
+        if startup is not None:
+            for domain, name in self.STARTUP_GATES.items():
+                future = startup.future(name)
+                if future is not None:
+                    self.pipeline.set_gate(domain, future)
+        
+        # Потоковый режим: команды выполняются, пока модель дописывает ответ
+        self.streaming = streaming
         
         self.last_processed = ""
         
-    def process_command(self, my_say):
-        """Обрабатывает любые фразы"""
+    def process_command(self, my_say, dispatched=()):
+        """Обрабатывает любые фразы.
+
+        dispatched - команды, уже выполненные для этой фразы (например, по
+        промежуточной гипотезе распознавания): повторно они не запускаются.
+        """
         my_say = my_say.lower().strip()
         
         # Защита от повторов
@@ -47,28 +85,60 @@ class SmartCommandHandler:
         print(f"[USER INPUT] '{my_say}'")
         
         try:
+            # Команды, уже запущенные во время потоковой генерации
+            dispatched = list(dispatched)
+            fields = {}
+            
+            def on_field(key, value):
+                fields[key] = value
+                self._dispatch_ready_commands(fields, dispatched)
+            
             # Анализируем запрос
-            result = self.mixed_processor.process_mixed_request(my_say)
+            result = self.mixed_processor.process_mixed_request(
+                my_say, on_field=on_field if self.streaming else None
+            )
             print(f"[MIXED RESULT] {result}")
             
-            # Выполняем команды если есть
-            if result.get("commands"):
-                for command in result["commands"]:
-                    self._execute_simple_command(command, result.get("parameters", {}))
-            
-            # Озвучиваем ответ
-            if result.get("response"):
-                self._speak_with_gelya_response(result["response"])
+            self.execute_result(result, dispatched)
                 
         except Exception as e:
             print(f"[ОШИБКА] {e}")
     
-    def _execute_simple_command(self, command_key, parameters=None):
-        """Выполняет команду с параметрами"""
-        if parameters is None:
-            parameters = {}
+    def match_fast(self, text):
+        """Быстрое локальное распознавание команды без LLM (None - если не уверены)"""
+        return self.mixed_processor.try_fast_path(text.lower().strip())
+    
+    def execute_result(self, result, dispatched=()):
+        """Выполняет команды результата (кроме уже запущенных) и озвучивает ответ"""
+        # Выполняем команды если есть (кроме уже запущенных)
+        if result.get("commands"):
+            for command in result["commands"]:
+                if command not in dispatched:
+                    self._execute_simple_command(command, result.get("parameters", {}))
+        
+        # Озвучиваем ответ
+        if result.get("response"):
+            self._speak_with_gelya_response(result["response"])
+    
+    def _dispatch_ready_commands(self, fields, dispatched):
+        """Запускает команды, как только для них получены все нужные поля"""
+        commands = fields.get("commands")
+        if not isinstance(commands, list):
+            return
         
-        command_map = {
+        parameters = fields.get("parameters")
+        for command in commands:
+            if not isinstance(command, str) or command in dispatched:
+                continue
+            # Командам с параметрами ждем поле parameters
+            if command in self.PARAMETER_COMMANDS and not isinstance(parameters, dict):
+                continue
+            dispatched.append(command)
+            self._execute_simple_command(command, parameters if isinstance(parameters, dict) else {})
+    
+    def _get_command_map(self, parameters):
+        """Сопоставление command_key → обработчик с подставленными параметрами"""
+        return {
             # Музыка
             "play": self.music_playback.play_music,
             "pause": self.music_playback.pause_music,
@@ -115,6 +185,15 @@ class SmartCommandHandler:
             "set_palette_minty": lambda: self.light_palettes.set_palette_direct("мятная"),
             "set_palette_velvet": lambda: self.light_palettes.set_palette_direct("бархатная"),
             
+            # Свет - сцены (все состояние ленты одной командой)
+            "scene_evening": lambda: self.light_scenes.apply_scene_direct("вечер"),
+            "scene_movie": lambda: self.light_scenes.apply_scene_direct("кино"),
+            "scene_work": lambda: self.light_scenes.apply_scene_direct("работа"),
+            "scene_party": lambda: self.light_scenes.apply_scene_direct("вечеринка"),
+            "scene_night": lambda: self.light_scenes.apply_scene_direct("ночь"),
+            "scene_custom": self.light_scenes.apply_custom_scene,
+            "save_scene": self.light_scenes.save_custom_scene,
+            
             # Система
             "browser": self.system_browser.open_browser,
             "search": lambda: self.system_search.search(parameters.get("search_query", "")),
@@ -124,21 +203,50 @@ class SmartCommandHandler:
             "switch_playlist": lambda: self.music_playlists.switch_playlist(parameters.get("playlist_name", "")),
             "create_playlist": lambda: self.music_playlists.create_playlist(parameters.get("playlist_name", "")),
         }
+    
+    def _execute_simple_command(self, command_key, parameters=None):
+        """Выполняет команду с параметрами"""
+        if parameters is None:
+            parameters = {}
+        
+        command_map = self._get_command_map(parameters)
         
         if command_key in command_map:
             print(f"[COMMAND] Выполняю: {command_key} с параметрами: {parameters}")
-            threading.Thread(target=command_map[command_key]).start()
+            return self.pipeline.submit(
+                self._command_domain(command_key),
+                command_map[command_key],
+                name=command_key,
+                supersede_key=self._supersede_key(command_key)
+            )
         else:
             print(f"[WARNING] Неизвестная команда: {command_key}")
+            return None
+    
+    def _command_domain(self, command_key):
+        """Определяет домен команды"""
+        if command_key in MUSIC_COMMANDS:
+            return "music"
+        if command_key in SYSTEM_COMMANDS:
+            return "system"
+        return "light"
+    
+    def _supersede_key(self, command_key):
+        """Группа вытеснения: цвет и палитра вытесняют друг друга, сцена - предыдущую сцену"""
+        if command_key.startswith("set_color_") or command_key.startswith("set_palette_"):
+            return "light_color"
+        if command_key.startswith("scene_"):
+            return "light_scene"
+        return self.SUPERSEDE_GROUPS.get(command_key)
     
     def _speak_with_gelya_response(self, response_text):
-        """Озвучивает ответ через with_gelya_response"""
+        """Озвучивает ответ через with_gelya_response (в очереди голоса, не блокируя прослушивание)"""
         from ..utils.voice_response import with_gelya_response
         
         def speak():
             try:
-                gelya.speach(response_text)
+                get_tts_service().speak(response_text)
             except Exception as e:
                 print(f"❌ Ошибка TTS: {e}")
         
-        with_gelya_response(speak)()
\ No newline at end of file
+        return self.pipeline.submit("voice", with_gelya_response(speak), name="speak")
\ No newline at end of file
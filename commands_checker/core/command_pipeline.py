@@ -0,0 +1,164 @@
+# commands_checker/core/command_pipeline.py
+import asyncio
+import concurrent.futures
+import threading
+
+
+class _PipelineItem:
+    """Одна команда в очереди конвейера"""
+
+    __slots__ = ("name", "func", "domain", "supersede_key", "future")
+
+    def __init__(self, name, func, domain, supersede_key):
+        self.name = name
+        self.func = func
+        self.domain = domain
+        self.supersede_key = supersede_key
+        self.future = concurrent.futures.Future()
+
+
+class CommandPipeline:
+    """Конвейер выполнения команд на asyncio.
+
+    Вместо отдельного потока на каждую команду - собственный event loop в
+    фоновом потоке и по одной ограниченной очереди на домен (свет, музыка,
+    система, голос). Команды одного домена выполняются строго по очереди,
+    разные домены - параллельно. Новая команда с тем же supersede_key
+    отменяет еще не начатую предыдущую (например, повторная установка
+    громкости). Вызывающий код получает concurrent.futures.Future с
+    результатом или ошибкой.
+
+    Домену можно назначить "ворота" (set_gate) - Future фоновой
+    инициализации подсистемы. Пока она не завершена, команды домена
+    копятся в очереди и выполняются сразу после готовности.
+    """
+
+    def __init__(self, domains=("light", "music", "system", "voice"), queue_size=16):
+        self.domains = tuple(domains)
+        self.queue_size = queue_size
+
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0}
+
+        self._queues = {}
+        self._executors = {}
+        self._workers = []
+        self._pending = {}
+        self._gates = {}
+        self._ready = threading.Event()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="command-pipeline", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        for domain in self.domains:
+            self._queues[domain] = asyncio.Queue(maxsize=self.queue_size)
+            # Один поток на домен: блокирующие обработчики не останавливают event loop
+            self._executors[domain] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"cmd-{domain}"
+            )
+            self._workers.append(self._loop.create_task(self._worker(domain)))
+        self._ready.set()
+        self._loop.run_forever()
+
+    def submit(self, domain, func, name=None, supersede_key=None):
+        """Ставит команду в очередь домена. Потокобезопасно, не блокирует.
+
+        Возвращает concurrent.futures.Future с результатом выполнения.
+        """
+        if domain not in self.domains:
+            raise ValueError(f"Неизвестный домен команд: {domain}")
+
+        item = _PipelineItem(name or getattr(func, "__name__", "command"), func, domain, supersede_key)
+        self._loop.call_soon_threadsafe(self._enqueue, item)
+        return item.future
+
+    def set_gate(self, domain, future):
+        """Команды домена ждут завершения future (подсистема еще загружается)"""
+        if domain not in self.domains:
+            raise ValueError(f"Неизвестный домен команд: {domain}")
+        self._gates[domain] = future
+
+    async def _wait_gate(self, domain, item):
+        gate = self._gates.get(domain)
+        if gate is None or gate.done():
+            return
+        print(f"[PIPELINE] Команда '{item.name}' ждет готовности домена '{domain}'")
+        try:
+            await asyncio.wrap_future(gate, loop=self._loop)
+        except Exception as e:
+            # Инициализация не удалась - команда попробует сама и сообщит об ошибке
+            print(f"[PIPELINE] Домен '{domain}' не инициализирован: {e}")
+        finally:
+            if self._gates.get(domain) is gate:
+                del self._gates[domain]
+
+    def _enqueue(self, item):
+        """Добавляет команду в очередь (выполняется в потоке event loop)"""
+        self.stats["submitted"] += 1
+
+        if item.supersede_key is not None:
+            previous = self._pending.get(item.supersede_key)
+            if previous is not None and previous.future.cancel():
+                self.stats["cancelled"] += 1
+                print(f"[PIPELINE] Команда '{previous.name}' отменена новой '{item.name}'")
+            self._pending[item.supersede_key] = item
+
+        try:
+            self._queues[item.domain].put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            if self._pending.get(item.supersede_key) is item:
+                del self._pending[item.supersede_key]
+            item.future.set_exception(RuntimeError(f"Очередь домена '{item.domain}' переполнена"))
+            print(f"[PIPELINE] Очередь '{item.domain}' переполнена, команда '{item.name}' отброшена")
+
+    async def _worker(self, domain):
+        """Последовательно выполняет команды одного домена"""
+        queue = self._queues[domain]
+        executor = self._executors[domain]
+
+        while True:
+            item = await queue.get()
+            try:
+                # Пока ждем, новая команда той же группы еще может вытеснить эту
+                await self._wait_gate(domain, item)
+
+                if self._pending.get(item.supersede_key) is item:
+                    del self._pending[item.supersede_key]
+
+                # Отмененные (вытесненные) команды просто пропускаем
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    result = await self._loop.run_in_executor(executor, item.func)
+                    item.future.set_result(result)
+                    self.stats["completed"] += 1
+                except Exception as e:
+                    print(f"[PIPELINE] Ошибка команды '{item.name}': {e}")
+                    item.future.set_exception(e)
+                    self.stats["failed"] += 1
+            finally:
+                queue.task_done()
+
+    def pending_count(self):
+        """Количество команд, ожидающих выполнения, по доменам"""
+        return {domain: queue.qsize() for domain, queue in self._queues.items()}
+
+    def shutdown(self, wait=True):
+        """Останавливает конвейер"""
+        async def stop():
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._loop.stop()
+
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(stop(), self._loop)
+            if wait:
+                self._thread.join(timeout=2.0)
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
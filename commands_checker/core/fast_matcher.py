@@ -0,0 +1,223 @@
+# commands_checker/core/fast_matcher.py
+import json
+import os
+import time
+
+from ..utils.text_utils import tokenize, parse_number_at
+
+# Домены команд: команды одного домена выполняются последовательно
+# (общие для быстрого распознавания и SmartCommandHandler)
+MUSIC_COMMANDS = frozenset({
+    "play", "pause", "resume", "next", "previous", "repeat",
+    "volume_up", "volume_down", "set_volume", "switch_playlist", "create_playlist",
+})
+SYSTEM_COMMANDS = frozenset({"browser", "search", "shutdown", "set_alarm", "stop_alarm", "set_timer"})
+
+
+class FastIntentMatcher:
+    """Быстрое локальное распознавание команд без обращения к Ollama.
+
+    По словарю commands_dict.json строится префиксное дерево по словам
+    (direct_commands, action_patterns, parameter_commands, colors, palettes,
+    scenes).
+    Фраза разбирается за один проход: на каждой позиции ищется самое длинное
+    совпадение. Если фраза целиком покрыта командами, числами и служебными
+    словами - результат считается надежным, иначе запрос уходит в LLM.
+    """
+
+    # Слова, которые не несут смысла для команды и не мешают распознаванию
+    FILLER_WORDS = {
+        "геля", "ангелина", "пожалуйста", "плиз", "давай", "ка", "и", "а", "еще",
+        "на", "до", "в", "процентов", "процента", "процент",
+        "включи", "поставь", "сделай", "установи", "сделать", "поставить",
+    }
+
+    # Слова, называющие предмет команды. Без совпавшей команды того же домена
+    # ("включи свет и музыку" -> музыка не распознана) фраза уходит в LLM
+    DOMAIN_WORDS = {
+        "свет": "light", "цвет": "light", "цвета": "light", "подсветку": "light",
+        "палитру": "light", "палитра": "light", "палитры": "light",
+        "режим": "light", "эффект": "light",
+        "трек": "music", "песню": "music", "песня": "music", "музыку": "music",
+        "сцену": "scene", "сцена": "scene",
+    }
+
+    # Команды, которым обязательно нужно числовое значение
+    VALUE_COMMANDS = {"set_volume", "set_brightness"}
+
+    # Команды, которые могут принимать числовое значение (изменить на X)
+    OPTIONAL_VALUE_COMMANDS = {"volume_up", "volume_down", "brightness_up", "brightness_down"}
+
+    # Команды, забирающие остаток фразы как текстовый параметр
+    TEXT_COMMANDS = {
+        "search": "search_query",
+        "switch_playlist": "playlist_name",
+        "create_playlist": "playlist_name",
+    }
+
+    # Взаимоисключающие команды - если во фразе их несколько, это неоднозначность
+    CONFLICT_GROUPS = {
+        "volume_up": "volume", "volume_down": "volume", "set_volume": "volume",
+        "brightness_up": "brightness", "brightness_down": "brightness", "set_brightness": "brightness",
+        "light_on": "power", "light_off": "power",
+        "play": "playback", "pause": "playback", "resume": "playback",
+        "next": "track", "previous": "track",
+        "music_mode": "light_mode", "wave_effect": "light_mode", "breathing_effect": "light_mode",
+        "monitor_mode": "light_mode", "static_mode": "light_mode",
+        "scene_evening": "scene", "scene_movie": "scene", "scene_work": "scene",
+        "scene_party": "scene", "scene_night": "scene", "scene_custom": "scene",
+    }
+
+    def __init__(self, commands_data=None, supported_commands=None, min_confidence=0.75):
+        self.commands_data = commands_data if commands_data is not None else self._load_commands_data()
+        self.supported_commands = set(supported_commands) if supported_commands else None
+        self.min_confidence = min_confidence
+        self._trie = self._build_trie()
+
+    def _load_commands_data(self):
+        """Загружает команды из JSON"""
+        try:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            config_path = os.path.join(current_dir, "..", "config", "commands_dict.json")
+            with open(os.path.abspath(config_path), encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[ОШИБКА] Чтение commands_dict.json: {e}")
+            return {}
+
+    def _build_trie(self):
+        """Строит префиксное дерево по словам всех фраз-команд"""
+        trie = {}
+
+        def add(phrase, command_key):
+            node = trie
+            for word in tokenize(phrase):
+                node = node.setdefault(word, {})
+            node[None] = command_key
+
+        # Порядок важен: более конкретные разделы перезаписывают общие
+        for section in ("parameter_commands", "direct_commands", "colors", "palettes", "scenes"):
+            for phrase, command_key in self.commands_data.get(section, {}).items():
+                add(phrase, command_key)
+
+        for action, objects in self.commands_data.get("action_patterns", {}).items():
+            for obj, command_key in objects.items():
+                add(f"{action} {obj}", command_key)
+
+        return trie
+
+    def _longest_match(self, tokens, start):
+        """Ищет самую длинную фразу-команду, начинающуюся с позиции start"""
+        node = self._trie
+        best_key, best_end = None, start
+        position = start
+        while position < len(tokens):
+            node = node.get(tokens[position])
+            if node is None:
+                break
+            position += 1
+            if None in node:
+                best_key, best_end = node[None], position
+        return best_key, best_end
+
+    def _command_domains(self, command_key):
+        """Домены, к которым относится команда (сцена - это тоже свет)"""
+        if command_key in MUSIC_COMMANDS:
+            return {"music"}
+        if command_key in SYSTEM_COMMANDS:
+            return {"system"}
+        if command_key.startswith("scene_") or command_key == "save_scene":
+            return {"scene", "light"}
+        return {"light"}
+
+    def match(self, text):
+        """Разбирает фразу. Возвращает dict с commands/parameters/confidence или None"""
+        started = time.perf_counter()
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+
+        commands = []
+        parameters = {}
+        numbers = 0
+        covered = 0
+        position = 0
+        # Домены из нераспознанных слов-предметов ("музыку", "свет")
+        leftover_domains = set()
+
+        while position < len(tokens):
+            command_key, end = self._longest_match(tokens, position)
+
+            if command_key is None:
+                value, length = parse_number_at(tokens, position)
+                if length:
+                    parameters["value"] = value
+                    numbers += 1
+                    covered += length
+                    position += length
+                    continue
+                if tokens[position] in self.FILLER_WORDS:
+                    covered += 1
+                elif tokens[position] in self.DOMAIN_WORDS:
+                    leftover_domains.add(self.DOMAIN_WORDS[tokens[position]])
+                    covered += 1
+                position += 1
+                continue
+
+            if self.supported_commands is not None and command_key not in self.supported_commands:
+                return None
+
+            covered += end - position
+            position = end
+
+            if command_key in self.TEXT_COMMANDS:
+                # Остаток фразы - это запрос или название плейлиста
+                rest = tokens[position:]
+                if not rest:
+                    return None
+                parameters[self.TEXT_COMMANDS[command_key]] = " ".join(rest)
+                covered += len(rest)
+                position = len(tokens)
+
+            if command_key not in commands:
+                commands.append(command_key)
+
+        if not commands:
+            return None
+
+        # Слово-предмет без команды своего домена - во фразе есть нераспознанная команда
+        matched_domains = set()
+        for command_key in commands:
+            matched_domains |= self._command_domains(command_key)
+        if leftover_domains - matched_domains:
+            return None
+
+        # Проверяем, что команды не противоречат друг другу
+        groups = [self.CONFLICT_GROUPS[c] for c in commands if c in self.CONFLICT_GROUPS]
+        if len(groups) != len(set(groups)):
+            return None
+
+        # Числа нужны только командам, которые умеют их принимать. Значение одно на
+        # фразу, поэтому "яркость 30 и громкость 70" (два числа или две команды со
+        # значением) разбирает LLM - иначе обе команды получили бы одно число
+        value_commands = [c for c in commands if c in self.VALUE_COMMANDS or c in self.OPTIONAL_VALUE_COMMANDS]
+        if numbers > 1 or sum(c in self.VALUE_COMMANDS for c in commands) > 1:
+            return None
+        if "value" in parameters:
+            if len(value_commands) != 1:
+                return None
+        elif any(c in self.VALUE_COMMANDS for c in commands):
+            return None
+
+        confidence = covered / len(tokens)
+        if confidence < self.min_confidence:
+            return None
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"[FAST MATCH] {commands} {parameters} (уверенность: {confidence:.2f}, {elapsed_ms:.2f} мс)")
+
+        return {
+            "commands": commands,
+            "parameters": parameters,
+            "confidence": confidence,
+        }
@@ -3,13 +3,21 @@ import json
 import requests
 import re
 import os
+from ..utils.ollama_client import OllamaClient, get_ollama_client
+from ..utils.response_cache import get_response_cache
 
 class OllamaIntentAnalyzer:
-    def __init__(self, model_name="llama3", base_url="http://localhost:11434"):
+    def __init__(self, model_name="llama3", base_url="http://localhost:11434", use_cache=True, client=None):
         self.model_name = model_name
         self.base_url = base_url
+        if client is None:
+            client = get_ollama_client()
+            if client.base_url != base_url.rstrip("/"):
+                client = OllamaClient(base_url)
+        self.client = client
         self.commands_data = self._load_commands_data()
         self.system_prompt = self._generate_system_prompt()
+        self.cache = get_response_cache() if use_cache else None
     
     def _load_commands_data(self):
         """Загружает данные команд из JSON"""
@@ -38,7 +46,8 @@ class OllamaIntentAnalyzer:
             "direct_commands": "ПРЯМЫЕ КОМАНДЫ", 
             "parameter_commands": "КОМАНДЫ С ПАРАМЕТРАМИ",
             "colors": "ЦВЕТА",
-            "palettes": "ПАЛИТРЫ"
+            "palettes": "ПАЛИТРЫ",
+            "scenes": "СЦЕНЫ"
         }
         
         for section_key, section_name in sections.items():
@@ -113,7 +122,7 @@ class OllamaIntentAnalyzer:
     def analyze_command(self, user_input):
         """Анализирует команду через Ollama"""
         try:
-            response = self._call_ollama(user_input)
+            response = self._cached_call_ollama(user_input)
             
             if response and response.get("command_key"):
                 print(f"[OLLAMA ANALYSIS] Найдена команда: {response['command_key']} (уверенность: {response.get('confidence', 0)})")
@@ -127,29 +136,41 @@ class OllamaIntentAnalyzer:
             print(f"[OLLAMA ERROR] {e}")
             return self._fallback_analysis(user_input)
     
+    def _cached_call_ollama(self, user_input):
+        """Вызов Ollama через кэш: повторная фраза не уходит на сервер"""
+        if self.cache is None:
+            return self._call_ollama(user_input)
+        
+        cache_key = self.cache.make_key(user_input, self.system_prompt, self.model_name)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"[CACHE] Анализ из кэша для '{user_input}'")
+            return cached
+        
+        response = self._call_ollama(user_input)
+        if isinstance(response, dict):
+            self.cache.put(cache_key, response)
+        return response
+    
+    def get_cache_stats(self):
+        """Статистика кэша ответов LLM"""
+        return self.cache.stats() if self.cache is not None else {}
+    
     def _call_ollama(self, user_input):
         """Вызов Ollama API"""
         try:
-            url = f"{self.base_url}/api/chat"
-            
-            payload = {
-                "model": self.model_name,
-                "messages": [
+            result = self.client.chat(
+                self.model_name,
+                [
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": user_input}
                 ],
-                "stream": False,
-                "format": "json",
-                "options": {
+                format="json",
+                options={
                     "temperature": 0.1,
                     "top_p": 0.9,
                 }
-            }
-            
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
+            )
             message_content = result["message"]["content"]
             
             # Парсим JSON ответ
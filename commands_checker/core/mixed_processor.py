@@ -1,28 +1,90 @@
 # commands_checker/core/mixed_processor.py
+import hashlib
 import json
 import os
-import requests
+import random
 import re
+import threading
+import time
+from .fast_matcher import FastIntentMatcher
+from ..utils.ollama_client import get_ollama_client
+from ..utils.response_cache import get_response_cache
+from ..utils.stream_json import IncrementalJSONParser
 
 class MixedRequestProcessor:
-    def __init__(self, model_name="llama3"):
+    def __init__(self, model_name="llama3", supported_commands=None, use_fast_path=True, use_cache=True,
+                 client=None, warm_up=False):
         self.model_name = model_name
+        self.client = client or get_ollama_client()
+        
+        # Промпт собирается один раз на версию commands_dict.json и не меняется
+        # между запросами - Ollama переиспользует KV-кэш общего префикса
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.commands_path = os.path.abspath(os.path.join(current_dir, "..", "config", "commands_dict.json"))
+        self._commands_mtime = None
+        self._commands_version = None
+        self._prompt = None
         self.commands_data = self._load_commands_data()
         
+        # Быстрый путь: простые команды распознаются локально, без LLM
+        self.use_fast_path = use_fast_path
+        self.supported_commands = set(supported_commands) if supported_commands else None
+        self.fast_matcher = FastIntentMatcher(self.commands_data, self.supported_commands)
+        
+        # Кэш ответов LLM: повторяющиеся фразы не отправляются в Ollama
+        self.cache = get_response_cache() if use_cache else None
+        try:
+            with open('responses.json', 'r', encoding='utf-8') as f:
+                self.responses = json.load(f)
+        except FileNotFoundError:
+            self.responses = {"positive_responses": ["хорошо", "сделано"]}
+        
+        if warm_up:
+            threading.Thread(target=self.warm_up, daemon=True).start()
+        
     def _load_commands_data(self):
-        """Загружает команды из JSON"""
+        """Загружает команды из JSON и запоминает версию файла"""
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(current_dir, "..", "config", "commands_dict.json")
-            abs_path = os.path.abspath(config_path)
-            
-            with open(abs_path, encoding="utf-8") as f:
-                return json.load(f)
+            self._commands_mtime = os.stat(self.commands_path).st_mtime_ns
+            with open(self.commands_path, "rb") as f:
+                raw = f.read()
+            self._commands_version = hashlib.sha256(raw).hexdigest()
+            return json.loads(raw.decode("utf-8"))
         except Exception as e:
             print(f"[ОШИБКА] Чтение commands_dict.json: {e}")
             return {}
     
+    def _refresh_commands(self):
+        """Перечитывает commands_dict.json, только если файл изменился"""
+        try:
+            mtime = os.stat(self.commands_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._commands_mtime:
+            return
+        
+        old_version = self._commands_version
+        commands_data = self._load_commands_data()
+        if self._commands_version != old_version:
+            print("[MIXED PROCESSOR] commands_dict.json изменился, пересобираю промпт")
+            self.commands_data = commands_data
+            self.fast_matcher = FastIntentMatcher(self.commands_data, self.supported_commands)
+            self._prompt = None
+    
     def get_mixed_prompt(self):
+        """Системный промпт - один и тот же байт в байт для всех запросов"""
+        self._refresh_commands()
+        if self._prompt is None:
+            self._prompt = self._build_mixed_prompt()
+        return self._prompt
+    
+    def warm_up(self):
+        """Прогревает модель: загружает ее в память и вычисляет KV-кэш системного промпта"""
+        started = time.perf_counter()
+        if self.client.warm_up(self.model_name, self.get_mixed_prompt()):
+            print(f"[MIXED PROCESSOR] Модель прогрета за {time.perf_counter() - started:.1f} с")
+    
+    def _build_mixed_prompt(self):
         """Простой промпт с характером"""
         # Получаем все команды из JSON
         all_commands = self._get_all_commands()
@@ -51,6 +113,8 @@ class MixedRequestProcessor:
 - "пауза", "стоп" → pause
 - "красный", "красный свет" → set_color_red
 - "синий", "синий свет" → set_color_blue
+- "вечерний свет", "сцена кино", "режим работы" → scene_evening, scene_movie, scene_work
+- "запомни свет", "сохрани сцену" → save_scene
 - "громче" → volume_up
 - "тише" → volume_down
 - и т.д.
@@ -62,15 +126,15 @@ class MixedRequestProcessor:
 - "найди котиков" → search с search_query: "котики"
 - "включи плейлист рок" → switch_playlist с playlist_name: "рок"
 
-ФОРМАТ ОТВЕТА (JSON):
+ФОРМАТ ОТВЕТА (JSON, поля строго в этом порядке):
 {{
     "commands": ["command_name"],
-    "response": "Твой ответ в характере",
     "parameters": {{
         "value": 50,           // число для громкости/яркости/если есть/попросил
         "search_query": "текст", // поисковый запрос/если есть/попросил
         "playlist_name": "название" // название плейлиста/если/попросил
-    }}
+    }},
+    "response": "Твой ответ в характере"
 }}
 
 ПРИМЕРЫ ОТВЕТОВ:
@@ -78,9 +142,9 @@ class MixedRequestProcessor:
 - "Ох, красный цвет... страстно!"  
 - "Выключаю свет... идеально для шалостей!"
 - "Включаю музыку, зайка!"
-- "громкость 5" → {{"commands": ["set_volume"], "response": "Ставлю громкость на 5%, котик! ", "parameters": {{"value": 5}}}}
-- "яркость 100" → {{"commands": ["set_brightness"], "response": "Максимальная яркость, зайка! ", "parameters": {{"value": 100}}}}
-- "найди рецепт пасты" → {{"commands": ["search"], "response": "Ищу рецепт пасты! ", "parameters": {{"search_query": "рецепт пасты"}}}}
+- "громкость 5" → {{"commands": ["set_volume"], "parameters": {{"value": 5}}, "response": "Ставлю громкость на 5%, котик! "}}
+- "яркость 100" → {{"commands": ["set_brightness"], "parameters": {{"value": 100}}, "response": "Максимальная яркость, зайка! "}}
+- "найди рецепт пасты" → {{"commands": ["search"], "parameters": {{"search_query": "рецепт пасты"}}, "response": "Ищу рецепт пасты! "}}
 
 ПРАВИЛО ДЛЯ ОТВЕТ:
 -НИКОГДА НЕ ИСПОЛЬЗУЙ СМАЙЛИКИ/ЭМОДЗИ И Т.П
@@ -94,7 +158,7 @@ class MixedRequestProcessor:
         """Получает список всех команд из JSON"""
         all_commands = set()
         
-        sections = ["action_patterns", "direct_commands", "parameter_commands", "colors", "palettes"]
+        sections = ["action_patterns", "direct_commands", "parameter_commands", "colors", "palettes", "scenes"]
         for section in sections:
             if section in self.commands_data:
                 if section == "action_patterns":
@@ -107,34 +171,99 @@ class MixedRequestProcessor:
         
         return sorted(list(all_commands))
     
-    def process_mixed_request(self, user_input):
-        """Обрабатывает запрос"""
+    def _get_random_response(self):
+        responses = self.responses.get("positive_responses", ["хорошо"])
+        return random.choice(responses)
+    
+    def try_fast_path(self, user_input):
+        """Пытается распознать команду локально. Возвращает результат или None"""
+        if not self.use_fast_path:
+            return None
+        
+        match = self.fast_matcher.match(user_input)
+        if match is None:
+            return None
+        
+        return {
+            "commands": match["commands"],
+            "parameters": match["parameters"],
+            "response": self._get_random_response(),
+            "source": "fast_path"
+        }
+    
+    def process_mixed_request(self, user_input, on_field=None):
+        """Обрабатывает запрос.
+        
+        Если передан on_field, ответ модели читается потоком и on_field(ключ, значение)
+        вызывается для каждого поля JSON сразу после его получения - так команды
+        можно выполнять, пока модель еще генерирует текст ответа.
+        """
+        fast_result = self.try_fast_path(user_input)
+        if fast_result is not None:
+            return fast_result
+        
         try:
-            full_prompt = self.get_mixed_prompt() + f"\n\nЗапрос: {user_input}\nОтвет:"
+            prompt = self.get_mixed_prompt()
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(user_input, prompt, self.model_name)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    print(f"[CACHE] Ответ из кэша для '{user_input}'")
+                    return cached
             
-            payload = {
-                "model": self.model_name,
-                "messages": [{"role": "system", "content": full_prompt}],
-                "stream": False,
-                "format": "json",
-                "options": {"temperature": 0.3, "top_p": 0.9}
-            }
+            # Текст пользователя - отдельным сообщением, чтобы префикс оставался неизменным
+            messages = [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_input}
+            ]
+            options = {"temperature": 0.3, "top_p": 0.9}
             
-            response = requests.post("http://localhost:11434/api/chat", json=payload, timeout=15)
-            response.raise_for_status()
+            if on_field is not None:
+                response_text = self._stream_response(messages, options, on_field)
+            else:
+                result = self.client.chat(self.model_name, messages, format="json", options=options, timeout=15)
+                response_text = result["message"]["content"]
             
-            result = response.json()
-            response_text = result["message"]["content"]
+            parsed = self._parse_response(response_text)
+            if parsed is None:
+                return {"commands": [], "response": "Извини, не поняла"}
             
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    return {"commands": [], "response": "Извини, не поняла"}
+            if cache_key is not None and isinstance(parsed, dict):
+                self.cache.put(cache_key, parsed)
+            return parsed
             
         except Exception as e:
             print(f"[MIXED PROCESSOR ERROR] {e}")
-            return {"commands": [], "response": "Ошибка"}
\ No newline at end of file
+            return {"commands": [], "response": "Ошибка"}
+    
+    def _stream_response(self, messages, options, on_field):
+        """Читает ответ модели потоком и сообщает о каждом готовом поле"""
+        parser = IncrementalJSONParser()
+        parts = []
+        started = time.perf_counter()
+        
+        for piece in self.client.chat_stream(self.model_name, messages, format="json", options=options, timeout=15):
+            parts.append(piece)
+            for key, value in parser.feed(piece):
+                print(f"[STREAM] Поле '{key}' готово через {(time.perf_counter() - started) * 1000:.0f} мс")
+                try:
+                    on_field(key, value)
+                except Exception as e:
+                    print(f"[STREAM] Ошибка обработки поля '{key}': {e}")
+        
+        return "".join(parts)
+    
+    def _parse_response(self, response_text):
+        """Разбирает JSON из ответа модели (в том числе обернутый в текст)"""
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
+            return None
+    
+    def get_cache_stats(self):
+        """Статистика кэша ответов LLM"""
+        return self.cache.stats() if self.cache is not None else {}
\ No newline at end of file
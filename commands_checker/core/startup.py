@@ -0,0 +1,77 @@
+# commands_checker/core/startup.py
+import concurrent.futures
+import threading
+import time
+
+
+class BackgroundStartup:
+    """Фоновая инициализация тяжелых подсистем (свет, голос, плеер).
+
+    Каждая подсистема загружается в своем потоке параллельно с остальными,
+    а прослушивание микрофона стартует сразу. future(name) отдает
+    concurrent.futures.Future задачи - его можно передать в
+    CommandPipeline.set_gate, чтобы команды подсистемы ждали ее готовности
+    в очереди. Время загрузки каждой подсистемы попадает в report().
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.errors = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, func):
+        """Запускает инициализацию подсистемы в фоне. Возвращает Future"""
+        with self._lock:
+            if name in self._futures:
+                return self._futures[name]
+            future = concurrent.futures.Future()
+            self._futures[name] = future
+
+        thread = threading.Thread(target=self._run, args=(name, func, future),
+                                  name=f"startup-{name}", daemon=True)
+        thread.start()
+        return future
+
+    def _run(self, name, func, future):
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            self.timings[name] = time.perf_counter() - started
+            self.errors[name] = e
+            print(f"[STARTUP] {name}: ошибка инициализации за {self.timings[name]:.2f} с: {e}")
+            future.set_exception(e)
+            return
+
+        self.timings[name] = time.perf_counter() - started
+        print(f"[STARTUP] {name} готов за {self.timings[name]:.2f} с "
+              f"({time.perf_counter() - self.started:.2f} с от старта)")
+        future.set_result(result)
+
+    def future(self, name):
+        """Future инициализации подсистемы или None, если она не запускалась"""
+        return self._futures.get(name)
+
+    def is_ready(self, name):
+        future = self._futures.get(name)
+        return future is not None and future.done() and future.exception() is None
+
+    def wait(self, timeout=None):
+        """Ждет завершения всех задач. True - все завершились (успешно или нет)"""
+        done, not_done = concurrent.futures.wait(list(self._futures.values()), timeout=timeout)
+        return not not_done
+
+    def report(self):
+        """Отчет о старте: сколько грузилась каждая подсистема"""
+        lines = [f"[STARTUP] С момента старта: {time.perf_counter() - self.started:.2f} с"]
+        for name in self._futures:
+            if name in self.errors:
+                state = f"ошибка: {self.errors[name]}"
+            elif name in self.timings:
+                state = f"{self.timings[name]:.2f} с"
+            else:
+                state = "загружается..."
+            lines.append(f"  {name}: {state}")
+        return "\n".join(lines)
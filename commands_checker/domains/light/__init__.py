@@ -1,23 +1,33 @@
-from light.light_controller import LightController
+import atexit
+import threading
 
 # Создаем единый экземпляр контроллера света
 _light_controller = None
+_light_controller_lock = threading.Lock()
 
 def get_light_controller():
-    """Получить глобальный экземпляр контроллера света"""
+    """Получить глобальный экземпляр контроллера света (создается при первом вызове)"""
     global _light_controller
     if _light_controller is None:
-        _light_controller = LightController()
-        print("[LIGHT] Контроллер инициализирован (единый экземпляр)")
+        with _light_controller_lock:
+            if _light_controller is None:
+                # numpy, serial и остальное грузятся здесь, а не при импорте commands_checker
+                from light.light_controller import LightController
+                _light_controller = LightController()
+                # При выходе: дописать состояние сцен и последний кадр в порт
+                atexit.register(_light_controller.close_connection)
+                print("[LIGHT] Контроллер инициализирован (единый экземпляр)")
     return _light_controller
 
 from .color_control import LightColorControl
 from .brightness_control import LightBrightnessControl
 from .effect_control import LightEffectControl
 from .palette_control import LightPaletteControl
+from .scene_control import LightSceneControl
 
 __all__ = [
     'LightColorControl', 'LightBrightnessControl', 
     'LightEffectControl', 'LightPaletteControl',
+    'LightSceneControl',
     'get_light_controller'
 ]
\ No newline at end of file
@@ -1,21 +1,21 @@
 # commands_checker/domains/light/brightness_control.py
 import json
 import re
-from Gelya_voice import GelyaSpeach
 from commands_checker.utils.voice_response import with_gelya_response
 from . import get_light_controller
 
-gelya = GelyaSpeach()
-
 class LightBrightnessControl:
     def __init__(self):
-        self.light_controller = get_light_controller()  # Используем единый экземпляр
         try:
             with open('responses.json', 'r', encoding='utf-8') as f:
                 self.responses = json.load(f)
         except FileNotFoundError:
             self.responses = {"positive_responses": ["хорошо", "сделано"]}
     
+    @property
+    def light_controller(self):
+        return get_light_controller()  # Используем единый экземпляр
+    
     def _get_random_response(self):
         import random
         responses = self.responses.get("positive_responses", ["хорошо"])
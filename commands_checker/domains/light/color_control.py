@@ -2,8 +2,9 @@
 from . import get_light_controller
 
 class LightColorControl:
-    def __init__(self):
-        self.light_controller = get_light_controller()  # Используем общий экземпляр
+    @property
+    def light_controller(self):
+        return get_light_controller()  # Используем общий экземпляр
     
     def set_color_direct(self, color_name):
         """Прямая установка цвета"""
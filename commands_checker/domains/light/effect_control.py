@@ -1,13 +1,11 @@
 # commands_checker/domains/light/effect_control.py
 from commands_checker.utils.voice_response import with_gelya_response
-from Gelya_voice import GelyaSpeach
 from . import get_light_controller
 
-gelya = GelyaSpeach()
-
 class LightEffectControl:
-    def __init__(self):
-        self.light_controller = get_light_controller()
+    @property
+    def light_controller(self):
+        return get_light_controller()
     
     @with_gelya_response
     def start_music_mode(self):
@@ -32,6 +30,4 @@ class LightEffectControl:
     @with_gelya_response
     def set_static_mode(self):
         """Вернуться к статичному свету"""
-        self.light_controller.stop_music_mode()
-        self.light_controller.stop_monitor_checker()
-        self.light_controller.current_mode = "static"
\ No newline at end of file
+        self.light_controller.set_static_mode()
\ No newline at end of file
@@ -1,19 +1,19 @@
 # commands_checker/domains/light/palette_control.py
 import json
-from Gelya_voice import GelyaSpeach
 from . import get_light_controller
 
-gelya = GelyaSpeach()
-
 class LightPaletteControl:
     def __init__(self):
-        self.light_controller = get_light_controller()  # Используем единый экземпляр
         try:
             with open('responses.json', 'r', encoding='utf-8') as f:
                 self.responses = json.load(f)
         except FileNotFoundError:
             self.responses = {"positive_responses": ["хорошо", "сделано"]}
     
+    @property
+    def light_controller(self):
+        return get_light_controller()  # Используем единый экземпляр
+    
     def _get_random_response(self):
         import random
         responses = self.responses.get("positive_responses", ["хорошо"])
@@ -0,0 +1,22 @@
+# commands_checker/domains/light/scene_control.py
+from . import get_light_controller
+
+# Имя сцены, которую пользователь сохраняет голосом
+CUSTOM_SCENE = "моя"
+
+class LightSceneControl:
+    @property
+    def light_controller(self):
+        return get_light_controller()  # Используем единый экземпляр
+    
+    def apply_scene_direct(self, scene_name):
+        """Применить сцену целиком (одним кадром)"""
+        return self.light_controller.apply_scene(scene_name)
+    
+    def save_custom_scene(self):
+        """Запомнить текущий свет как свою сцену"""
+        return self.light_controller.save_scene(CUSTOM_SCENE)
+    
+    def apply_custom_scene(self):
+        """Вернуть сохраненную свою сцену"""
+        return self.apply_scene_direct(CUSTOM_SCENE)
@@ -1,10 +1,7 @@
 # commands_checker/domains/music/playback.py
 import json
-from Gelya_voice import GelyaSpeach
 from player import MusicPlayer
 
-gelya = GelyaSpeach()
-
 class MusicPlayback:
     def __init__(self):
         try:
@@ -2,12 +2,9 @@
 import json
 import os
 from fuzzywuzzy import fuzz
-from Gelya_voice import GelyaSpeach
 from player import MusicPlayer
 from config.config import PLAYLISTS_PATH
 
-gelya = GelyaSpeach()
-
 class MusicPlaylists:
     def __init__(self):
         try:
@@ -1,11 +1,8 @@
 # commands_checker/domains/music/volume.py
 import json
 import re
-from Gelya_voice import GelyaSpeach
 from player import MusicPlayer
 
-gelya = GelyaSpeach()
-
 class MusicVolume:
     def __init__(self):
         try:
@@ -1,9 +1,6 @@
 # commands_checker/domains/system/browser.py
 import webbrowser
 import json
-from Gelya_voice import GelyaSpeach
-
-gelya = GelyaSpeach()
 
 class SystemBrowser:
     def __init__(self):
@@ -1,9 +1,6 @@
 # commands_checker/domains/system/power.py
 import os
 import json
-from Gelya_voice import GelyaSpeach
-
-gelya = GelyaSpeach()
 
 class SystemPower:
     def __init__(self):
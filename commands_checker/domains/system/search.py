@@ -1,11 +1,8 @@
 # commands_checker/domains/system/search.py
 import webbrowser
 import json
-from Gelya_voice import GelyaSpeach
 
 
-gelya = GelyaSpeach()
-
 class SystemSearch:
     def __init__(self):
         try:
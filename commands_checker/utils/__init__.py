@@ -1,5 +1,6 @@
 # commands_checker/utils/__init__.py
 from .voice_response import with_gelya_response
 from .ollama_client import OllamaClient
+from .response_cache import ResponseCache, get_response_cache
 
-__all__ = ['with_gelya_response', 'OllamaClient']
\ No newline at end of file
+__all__ = ['with_gelya_response', 'OllamaClient', 'ResponseCache', 'get_response_cache']
\ No newline at end of file
@@ -1,60 +1,185 @@
 # commands_checker/utils/ollama_client.py
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class OllamaClient:
-    """Универсальный клиент для работы с Ollama API"""
-    
-    def __init__(self, base_url="http://localhost:11434"):
-        self.base_url = base_url
-    
+    """Универсальный клиент для работы с Ollama API.
+
+    Держит одну requests.Session с пулом keep-alive соединений, поэтому
+    запросы не открывают новое TCP-соединение. Ошибки соединения и ответы
+    502/503/504 повторяются ограниченное число раз с экспоненциальной
+    задержкой. Таймаут чтения не повторяется: POST к модели не идемпотентен,
+    и медленная генерация должна сразу уходить в запасной вариант, а не
+    ждать read_timeout несколько раз. Параметр keep_alive не дает Ollama
+    выгружать модель из памяти.
+    """
+
+    METRIC_FIELDS = ("prompt_eval_count", "prompt_eval_duration", "eval_count",
+                     "eval_duration", "load_duration", "total_duration")
+
+    def __init__(self, base_url="http://localhost:11434", connect_timeout=3.0, read_timeout=30.0,
+                 max_retries=2, backoff_factor=0.3, keep_alive="30m", pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.session = self._create_session(max_retries, backoff_factor, pool_size)
+        # Метрики последнего запроса (prompt_eval_count, eval_count, длительности)
+        self.last_metrics = {}
+
+    def _create_session(self, max_retries, backoff_factor, pool_size):
+        """Создает сессию с пулом соединений и политикой повторов"""
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _remember_metrics(self, data):
+        self.last_metrics = {key: data[key] for key in self.METRIC_FIELDS if key in data}
+
+    def _timeout(self, read_timeout=None):
+        return (self.connect_timeout, read_timeout if read_timeout is not None else self.read_timeout)
+
+    def chat(self, model, messages, format="json", options=None, timeout=None):
+        """Запрос к /api/chat. Возвращает полный JSON ответа сервера.
+
+        Исключения requests пробрасываются вызывающему коду.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "options": options or {},
+        }
+        if format:
+            payload["format"] = format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        response = self.session.post(f"{self.base_url}/api/chat", json=payload, timeout=self._timeout(timeout))
+        response.raise_for_status()
+        result = response.json()
+        self._remember_metrics(result)
+        return result
+
+    def chat_stream(self, model, messages, format="json", options=None, timeout=None):
+        """Потоковый запрос к /api/chat. Отдает куски текста ответа по мере генерации.
+
+        Ollama присылает NDJSON: одна JSON-строка на каждый сгенерированный фрагмент,
+        последняя строка содержит "done": true.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            "options": options or {},
+        }
+        if format:
+            payload["format"] = format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        with self.session.post(f"{self.base_url}/api/chat", json=payload,
+                               timeout=self._timeout(timeout), stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+
+                content = data.get("message", {}).get("content", "")
+                if content:
+                    yield content
+                if data.get("done"):
+                    self._remember_metrics(data)
+                    break
+
+    def warm_up(self, model, system_prompt):
+        """Загружает модель и прогоняет системный промпт, чтобы его KV-кэш был готов"""
+        try:
+            self.chat(
+                model,
+                [{"role": "system", "content": system_prompt}],
+                format=None,
+                options={"num_predict": 1},
+                timeout=120
+            )
+            print(f"[OLLAMA] Прогрев: {self.last_metrics.get('prompt_eval_count', '?')} токенов промпта")
+            return True
+        except Exception as e:
+            print(f"[OLLAMA] Не удалось прогреть модель: {e}")
+            return False
+
     def generate_response(self, model, system_prompt, user_input, temperature=0.1, format="json"):
         """Генерация ответа через Ollama"""
         try:
-            url = f"{self.base_url}/api/chat"
-            
-            payload = {
-                "model": model,
-                "messages": [
+            result = self.chat(
+                model,
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_input}
                 ],
-                "stream": False,
-                "format": format,
-                "options": {
+                format=format,
+                options={
                     "temperature": temperature,
                     "top_p": 0.9,
                 }
-            }
-            
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
+            )
             return result["message"]["content"]
-            
+
         except requests.exceptions.ConnectionError:
             print("[OLLAMA] Сервер недоступен")
             return None
         except Exception as e:
             print(f"[OLLAMA CLIENT ERROR] {e}")
             return None
-    
+
     def is_server_running(self):
         """Проверка доступности сервера Ollama"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self._timeout(5))
             return response.status_code == 200
         except:
             return False
-    
+
     def get_available_models(self):
         """Получение списка доступных моделей"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self._timeout(10))
             if response.status_code == 200:
                 data = response.json()
                 return [model["name"] for model in data.get("models", [])]
         except:
             pass
-        return []
\ No newline at end of file
+        return []
+
+    def close(self):
+        """Закрывает все соединения пула"""
+        self.session.close()
+
+
+# Единый клиент на процесс - все обращения к Ollama идут через один пул
+_ollama_client = None
+
+def get_ollama_client():
+    """Получить глобальный экземпляр клиента Ollama"""
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = OllamaClient()
+    return _ollama_client
@@ -0,0 +1,177 @@
+# commands_checker/utils/response_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .text_utils import normalize_text
+
+# Кэш лежит в cache/ корня проекта, а не текущей папки процесса
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache", "intent_cache.sqlite3"
+)
+
+
+class ResponseCache:
+    """Дисковый кэш разобранных ответов LLM.
+
+    Ключ - нормализованная фраза + хэш промпта + имя модели, поэтому при
+    изменении промпта или модели старые записи просто перестают совпадать.
+    Хранится в SQLite, вытеснение по времени жизни (TTL) и по давности
+    последнего обращения (LRU). clock - источник времени (подменяется в тестах).
+    """
+
+    def __init__(self, path=None, max_entries=2000, ttl=7 * 24 * 3600, clock=time.time):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._prompt_hashes = {}
+        self._db = self._open()
+
+    def _open(self):
+        """Открывает (или создает) базу кэша"""
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            db.commit()
+            return db
+        except Exception as e:
+            print(f"[CACHE] Не удалось открыть кэш {self.path}: {e}")
+            return None
+
+    def _prompt_hash(self, prompt):
+        """Хэш промпта (запоминается, чтобы не пересчитывать для того же текста)"""
+        prompt_hash = self._prompt_hashes.get(prompt)
+        if prompt_hash is None:
+            prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+            if len(self._prompt_hashes) > 16:
+                self._prompt_hashes.clear()
+            self._prompt_hashes[prompt] = prompt_hash
+        return prompt_hash
+
+    def make_key(self, user_input, prompt, model):
+        """Строит ключ кэша для фразы, промпта и модели"""
+        raw = f"{normalize_text(user_input)}\0{self._prompt_hash(prompt)}\0{model}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Возвращает сохраненный результат или None"""
+        if self._db is None:
+            self.misses += 1
+            return None
+
+        now = self.clock()
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                value, created = row
+                if self.ttl and now - created > self.ttl:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.evictions += 1
+                    self.misses += 1
+                    return None
+
+                self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self.hits += 1
+                return json.loads(value)
+            except Exception as e:
+                print(f"[CACHE] Ошибка чтения: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key, value):
+        """Сохраняет результат и вытесняет лишние записи"""
+        if self._db is None:
+            return
+
+        now = self.clock()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self.stores += 1
+
+                if self.ttl:
+                    expired = self._db.execute(
+                        "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+                    ).rowcount
+                    self.evictions += max(0, expired)
+
+                count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if count > self.max_entries:
+                    removed = self._db.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                        (count - self.max_entries,)
+                    ).rowcount
+                    self.evictions += max(0, removed)
+
+                self._db.commit()
+            except Exception as e:
+                print(f"[CACHE] Ошибка записи: {e}")
+
+    def clear(self):
+        """Полностью очищает кэш"""
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self):
+        """Счетчики попаданий/промахов - сколько запросов к LLM удалось избежать"""
+        size = 0
+        if self._db is not None:
+            with self._lock:
+                size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size": size,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Единый экземпляр кэша на процесс
+_response_cache = None
+
+
+def get_response_cache():
+    """Получить глобальный экземпляр кэша ответов"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,121 @@
+# commands_checker/utils/stream_json.py
+import json
+
+
+class IncrementalJSONParser:
+    """Инкрементальный разбор JSON-объекта, приходящего по кусочкам.
+
+    Ollama в режиме stream отдает ответ модели частями. Парсер следит только
+    за полями верхнего уровня и отдает пару (ключ, значение), как только
+    значение поля полностью получено - не дожидаясь конца всего объекта.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = None
+        self._key = None
+        # Начало текущего ключа/значения в текущем куске и его части из прошлых кусков
+        self._start = None
+        self._parts = []
+        self.fields = {}
+        self.done = False
+
+    def feed(self, chunk):
+        """Добавляет кусок текста. Возвращает список завершенных полей [(ключ, значение)]
+
+        Просматривается только новый кусок; от прошлых кусков хранится лишь
+        начало незаконченного ключа или значения.
+        """
+        events = []
+
+        for i, c in enumerate(chunk):
+            if self.done:
+                break
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._expect == "key_string":
+                            self._key = self._loads(self._token(chunk, i + 1))
+                            self._expect = "colon"
+                        elif self._expect == "value_string":
+                            self._emit(events, self._token(chunk, i + 1))
+                            self._expect = "comma"
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect == "key":
+                        self._start = i
+                        self._expect = "key_string"
+                    elif self._expect == "value":
+                        self._start = i
+                        self._expect = "value_string"
+                continue
+
+            if c in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect = "key"
+                elif self._depth == 2 and self._expect == "value":
+                    self._start = i
+                    self._expect = "value_nested"
+                continue
+
+            if c in "}]":
+                if self._depth == 1 and self._expect == "value_primitive":
+                    self._emit(events, self._token(chunk, i))
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "value_nested":
+                    self._emit(events, self._token(chunk, i + 1))
+                    self._expect = "comma"
+                elif self._depth <= 0:
+                    self.done = True
+                continue
+
+            if self._depth == 1:
+                if c == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif c == ",":
+                    if self._expect == "value_primitive":
+                        self._emit(events, self._token(chunk, i))
+                    self._expect = "key"
+                elif not c.isspace() and self._expect == "value":
+                    self._start = i
+                    self._expect = "value_primitive"
+
+        if self._start is not None:
+            # Ключ или значение продолжится в следующем куске
+            self._parts.append(chunk[self._start:])
+            self._start = 0
+        return events
+
+    def _token(self, chunk, end):
+        """Текст текущего ключа/значения до end (с частями из прошлых кусков)"""
+        raw = "".join(self._parts) + chunk[self._start:end]
+        self._parts = []
+        self._start = None
+        return raw
+
+    def _loads(self, raw):
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    def _emit(self, events, raw):
+        """Разбирает значение поля и добавляет событие"""
+        try:
+            value = json.loads(raw.strip())
+        except (json.JSONDecodeError, ValueError):
+            return
+        self.fields[self._key] = value
+        events.append((self._key, value))
@@ -0,0 +1,51 @@
+# commands_checker/utils/text_utils.py
+import re
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_SPACES_RE = re.compile(r"\s+")
+
+NUMBER_WORDS = {
+    "ноль": 0, "один": 1, "одна": 1, "два": 2, "две": 2, "три": 3, "четыре": 4,
+    "пять": 5, "шесть": 6, "семь": 7, "восемь": 8, "девять": 9,
+    "десять": 10, "одиннадцать": 11, "двенадцать": 12,
+    "тринадцать": 13, "четырнадцать": 14, "пятнадцать": 15,
+    "шестнадцать": 16, "семнадцать": 17, "восемнадцать": 18,
+    "девятнадцать": 19, "двадцать": 20, "тридцать": 30,
+    "сорок": 40, "пятьдесят": 50, "шестьдесят": 60,
+    "семьдесят": 70, "восемьдесят": 80, "девяносто": 90, "сто": 100
+}
+
+
+def normalize_text(text):
+    """Приводит фразу к каноничному виду: нижний регистр, ё→е, без пунктуации"""
+    text = (text or "").lower().replace("ё", "е")
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+def tokenize(text):
+    """Разбивает нормализованную фразу на слова"""
+    return normalize_text(text).split()
+
+
+def parse_number_at(tokens, start):
+    """Читает число (цифрами или словами) начиная с позиции start.
+
+    Возвращает (значение, количество_слов) или (None, 0)
+    """
+    if start >= len(tokens):
+        return None, 0
+
+    token = tokens[start]
+    if token.isdigit():
+        return int(token), 1
+
+    total = 0
+    count = 0
+    while start + count < len(tokens) and tokens[start + count] in NUMBER_WORDS:
+        total += NUMBER_WORDS[tokens[start + count]]
+        count += 1
+
+    if count == 0:
+        return None, 0
+    return total, count
@@ -1,5 +1,6 @@
 BOT_TOKEN ='your token'
 PLAYLISTS_PATH = "треки"  # Базовая папка где лежат все плейлисты
+TTS_DEVICE = "cuda:0"  # Устройство голосовой модели (без CUDA - автоматически CPU)
 print(f"DEBUG: BOT_TOKEN loaded: {BOT_TOKEN is not None}")
 
 
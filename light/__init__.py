@@ -1,4 +1,11 @@
-from .light_controller import LightController
-from .monitor_checker import get_stable_color  # если нужно экспортировать
+# Тяжелые модули (numpy, serial, захват экрана) загружаются при первом обращении
+def __getattr__(name):
+    if name == "LightController":
+        from .light_controller import LightController
+        return LightController
+    if name == "get_stable_color":
+        from .monitor_checker import get_stable_color  # если нужно экспортировать
+        return get_stable_color
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ['LightController', 'get_stable_color']
\ No newline at end of file
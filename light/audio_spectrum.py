@@ -0,0 +1,175 @@
+import numpy as np
+
+# np.fft.rfft принимает out= начиная с NumPy 2.0
+try:
+    np.fft.rfft(np.zeros(8), out=np.empty(5, dtype=np.complex128))
+    _RFFT_HAS_OUT = True
+except TypeError:
+    _RFFT_HAS_OUT = False
+
+
+class SpectrumAnalyzer:
+    """Спектральный анализ звука для светомузыки.
+
+    На каждый буфер PCM (int16): окно Ханна, вещественное БПФ, мощность
+    в логарифмически расположенных полосах (одно умножение на матрицу
+    полос), перевод в дБ с плавающим пиком и сглаживанием, поиск ударов
+    по спектральному потоку в басовых полосах. Полосы растягиваются по
+    светодиодам: слева басы, справа высокие. Все массивы выделяются
+    в конструкторе - в process() новых буферов не создается.
+    """
+
+    def __init__(self, frame_size=1024, sample_rate=44100, num_leds=60, num_bands=16,
+                 min_freq=40.0, max_freq=16000.0, dynamic_range=40.0, min_peak_db=0.0,
+                 band_spread_db=24.0, peak_decay_db=0.05, attack=0.6, decay=0.12, beat_sensitivity=1.5,
+                 beat_history=43, beat_min_interval=8):
+        self.frame_size = frame_size
+        self.sample_rate = sample_rate
+        self.num_leds = num_leds
+        self.num_bands = num_bands
+        self.dynamic_range = dynamic_range
+        self.min_peak_db = min_peak_db
+        self.band_spread_db = band_spread_db
+        self.peak_decay_db = peak_decay_db
+        self.attack = attack
+        self.decay = decay
+        self.beat_sensitivity = beat_sensitivity
+        self.beat_min_interval = beat_min_interval
+
+        bins = frame_size // 2 + 1
+        # Окно сразу с нормировкой int16 -> [-1, 1]
+        self._window = np.hanning(frame_size) / 32768.0
+        self._samples = np.zeros(frame_size, dtype=np.float64)
+        self._spectrum = np.zeros(bins, dtype=np.complex128)
+        self._power = np.zeros(bins, dtype=np.float64)
+        self._band_matrix = self._build_band_matrix(bins, min_freq, max_freq)
+
+        self._bands = np.zeros(num_bands, dtype=np.float64)
+        self._bands_db = np.zeros(num_bands, dtype=np.float64)
+        self._previous_db = np.zeros(num_bands, dtype=np.float64)
+        self._flux_work = np.zeros(num_bands, dtype=np.float64)
+        self._peak_db = np.full(num_bands, min_peak_db, dtype=np.float64)
+        self._target = np.zeros(num_bands, dtype=np.float64)
+        self._smooth = np.zeros(num_bands, dtype=np.float64)
+        self._delta = np.zeros(num_bands, dtype=np.float64)
+        self._rise = np.zeros(num_bands, dtype=np.float64)
+
+        # Басовые полосы (примерно до 150 Гц) - по ним ищем удары
+        self._bass_bands = max(1, int(np.searchsorted(self._band_edges, 150.0)))
+        self._flux_history = np.zeros(beat_history, dtype=np.float64)
+        self._flux_index = 0
+        self._frames_since_beat = beat_min_interval
+
+        # Какой полосе соответствует каждый светодиод
+        self._led_bands = np.minimum(np.arange(num_leds) * num_bands // num_leds, num_bands - 1)
+        self.levels = np.zeros(num_leds, dtype=np.float32)
+        self._gain = np.zeros(num_leds, dtype=np.float32)
+        self._frame = np.zeros((num_leds, 3), dtype=np.float32)
+
+        self.level = 0.0
+        self.beat = False
+        self.beat_level = 0.0
+        self.beats = 0
+        self.frames = 0
+
+    def _build_band_matrix(self, bins, min_freq, max_freq):
+        """Матрица num_bands x bins: среднее мощности по бинам каждой полосы"""
+        max_freq = min(max_freq, self.sample_rate / 2)
+        self._band_edges = np.geomspace(min_freq, max_freq, self.num_bands + 1)
+        frequencies = np.arange(bins) * self.sample_rate / self.frame_size
+
+        matrix = np.zeros((self.num_bands, bins), dtype=np.float64)
+        for band in range(self.num_bands):
+            low, high = self._band_edges[band], self._band_edges[band + 1]
+            mask = (frequencies >= low) & (frequencies < high)
+            if not mask.any():
+                # Узкая низкая полоса уже одного бина - берем ближайший
+                mask[np.argmin(np.abs(frequencies - (low + high) / 2))] = True
+            matrix[band, mask] = 1.0 / mask.sum()
+        return matrix
+
+    def process(self, data):
+        """Обрабатывает буфер PCM int16 (bytes). Вызывается из аудио-колбэка"""
+        pcm = np.frombuffer(data, dtype=np.int16)
+        count = min(len(pcm), self.frame_size)
+        self._samples[:count] = pcm[:count]
+        self._samples[count:] = 0.0
+        np.multiply(self._samples, self._window, out=self._samples)
+
+        if _RFFT_HAS_OUT:
+            np.fft.rfft(self._samples, out=self._spectrum)
+        else:
+            self._spectrum[:] = np.fft.rfft(self._samples)
+        np.abs(self._spectrum, out=self._power)
+        np.multiply(self._power, self._power, out=self._power)
+
+        # Мощность полос одним умножением на матрицу, затем дБ
+        np.dot(self._band_matrix, self._power, out=self._bands)
+        self._bands += 1e-12
+        np.log10(self._bands, out=self._bands_db)
+        self._bands_db *= 10.0
+
+        self._detect_beat()
+
+        # Плавающий пик полосы: быстро растет, медленно опускается. Не ниже
+        # min_peak_db и не дальше band_spread_db от самой громкой полосы,
+        # чтобы тихие полосы (шум) не растягивались на всю яркость
+        self._peak_db -= self.peak_decay_db
+        np.maximum(self._peak_db, self._bands_db, out=self._peak_db)
+        floor = max(self.min_peak_db, float(self._peak_db.max()) - self.band_spread_db)
+        np.maximum(self._peak_db, floor, out=self._peak_db)
+
+        # Уровень 0..1 в окне dynamic_range дБ под пиком
+        np.subtract(self._bands_db, self._peak_db, out=self._target)
+        self._target += self.dynamic_range
+        self._target /= self.dynamic_range
+        np.clip(self._target, 0.0, 1.0, out=self._target)
+
+        # Сглаживание: быстрая атака, медленный спад
+        np.subtract(self._target, self._smooth, out=self._delta)
+        np.maximum(self._delta, 0.0, out=self._rise)
+        np.minimum(self._delta, 0.0, out=self._delta)
+        self._rise *= self.attack
+        self._delta *= self.decay
+        self._smooth += self._rise
+        self._smooth += self._delta
+
+        np.take(self._smooth, self._led_bands, out=self.levels)
+        self.level = float(self._smooth.mean())
+        self.frames += 1
+
+    def _detect_beat(self):
+        """Удар - всплеск спектрального потока в басах над средним за ~1 с"""
+        bass = self._bass_bands
+        np.subtract(self._bands_db[:bass], self._previous_db[:bass], out=self._flux_work[:bass])
+        np.maximum(self._flux_work[:bass], 0.0, out=self._flux_work[:bass])
+        flux = float(self._flux_work[:bass].sum())
+        self._previous_db[:] = self._bands_db
+
+        history = self._flux_history
+        threshold = history.mean() + self.beat_sensitivity * history.std()
+        history[self._flux_index] = flux
+        self._flux_index = (self._flux_index + 1) % len(history)
+
+        self._frames_since_beat += 1
+        self.beat = (flux > threshold and flux > 1.0
+                     and self._frames_since_beat >= self.beat_min_interval
+                     and self.frames >= len(history))
+        if self.beat:
+            self._frames_since_beat = 0
+            self.beats += 1
+            self.beat_level = 1.0
+        else:
+            self.beat_level *= 0.85
+
+    def render(self, base, out, beat_mix=0.35):
+        """Кадр ленты: базовые цвета (N x 3 uint8), умноженные на уровни полос и вспышку удара"""
+        np.multiply(self.levels, 1.0 - beat_mix, out=self._gain)
+        self._gain += self.beat_level * beat_mix
+        np.multiply(base, self._gain[:, None], out=self._frame)
+        np.copyto(out, self._frame, casting="unsafe")
+        return out
+
+    def overall_gain(self, beat_mix=0.35):
+        """Общий уровень 0..1 (для ленты, принимающей только один цвет)"""
+        return self.level * (1.0 - beat_mix) + self.beat_level * beat_mix
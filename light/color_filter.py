@@ -0,0 +1,107 @@
+import numpy as np
+
+# Матрицы перехода линейный sRGB -> OKLab (Björn Ottosson, 2020)
+_RGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+], dtype=np.float32)
+_LMS_TO_LAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+], dtype=np.float32)
+_LAB_TO_LMS = np.linalg.inv(_LMS_TO_LAB).astype(np.float32)
+_LMS_TO_RGB = np.linalg.inv(_RGB_TO_LMS).astype(np.float32)
+
+# sRGB (0-255) -> линейная яркость: таблица на 256 значений
+_levels = np.arange(256, dtype=np.float64) / 255.0
+_SRGB_TO_LINEAR = np.where(_levels <= 0.04045, _levels / 12.92, ((_levels + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+
+def srgb_to_oklab(rgb):
+    """Цвета sRGB (N x 3, 0-255) -> OKLab (N x 3 float32, L в диапазоне 0..1)"""
+    linear = _SRGB_TO_LINEAR[np.asarray(rgb, dtype=np.uint8)]
+    lms = linear @ _RGB_TO_LMS.T
+    return np.cbrt(lms) @ _LMS_TO_LAB.T
+
+
+def oklab_to_srgb(lab):
+    """OKLab (N x 3) -> sRGB (N x 3 uint8)"""
+    lms = (np.asarray(lab, dtype=np.float32) @ _LAB_TO_LMS.T) ** 3
+    linear = np.clip(lms @ _LMS_TO_RGB.T, 0.0, 1.0)
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * np.power(linear, 1 / 2.4) - 0.055)
+    return np.rint(srgb * 255.0).astype(np.uint8)
+
+
+class ColorFilter:
+    """Сглаживание цвета во времени и отсев незаметных изменений.
+
+    Цвета переводятся в OKLab, где расстояние примерно соответствует
+    видимой разнице (ΔE ≈ 0.02 - едва заметно). Каждый светодиод
+    экспоненциально сглаживается; чем сильнее цвет отличается от текущего,
+    тем быстрее он подтягивается (резкая смена сцены не "плывет").
+    Новый кадр выдается, только если хоть один светодиод ушел от последнего
+    отправленного дальше threshold - иначе update() возвращает None и
+    в порт ничего не пишется. Число светодиодов берется из первого кадра
+    (один цвет на всю ленту - это кадр из одного светодиода).
+    """
+
+    def __init__(self, smoothing=0.4, threshold=0.02, fast_delta=0.2):
+        self.smoothing = smoothing
+        self.threshold = threshold
+        self.fast_delta = fast_delta
+
+        self._state = None
+        self._sent = None
+        self._alpha = None
+        self._distance = None
+
+        self.updates = 0
+        self.emitted = 0
+
+    def reset(self):
+        """Забывает состояние - следующий кадр будет выдан сразу"""
+        self._state = None
+        self._sent = None
+
+    def _delta_e(self, a, b, out):
+        """Расстояние OKLab для каждого светодиода"""
+        np.sqrt(np.square(a - b).sum(axis=1), out=out)
+        return out
+
+    def update(self, colors):
+        """Новый целевой кадр (N x 3 sRGB). Возвращает кадр для отправки или None"""
+        self.updates += 1
+        target = srgb_to_oklab(np.asarray(colors).reshape(-1, 3))
+
+        if self._state is None or len(self._state) != len(target):
+            self._state = target
+            self._sent = None
+            self._alpha = np.empty((len(target), 1), dtype=np.float32)
+            self._distance = np.empty(len(target), dtype=np.float32)
+        else:
+            # Коэффициент сглаживания растет с расстоянием до цели
+            distance = self._delta_e(target, self._state, self._distance)
+            np.divide(distance, self.fast_delta, out=self._alpha[:, 0])
+            self._alpha += 1.0
+            self._alpha *= self.smoothing
+            np.clip(self._alpha, self.smoothing, 1.0, out=self._alpha)
+            self._state += (target - self._state) * self._alpha
+
+        if self._sent is not None:
+            if self._delta_e(self._state, self._sent, self._distance).max() < self.threshold:
+                return None
+
+        self._sent = self._state.copy()
+        self.emitted += 1
+        return oklab_to_srgb(self._state)
+
+    def stats(self):
+        """Сколько кадров пришло и сколько из них ушло в порт"""
+        return {
+            "updates": self.updates,
+            "emitted": self.emitted,
+            "suppressed": self.updates - self.emitted,
+            "emit_ratio": self.emitted / self.updates if self.updates else 0.0,
+        }
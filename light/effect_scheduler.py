@@ -0,0 +1,156 @@
+import threading
+import time
+
+
+class EffectScheduler:
+    """Один цикл с фиксированной частотой для всех эффектов подсветки.
+
+    Вместо отдельного потока на каждый эффект - один поток, который раз в
+    1/fps секунды вызывает tick(now) активного эффекта. Смена эффекта -
+    просто замена ссылки, она действует со следующего кадра, без join.
+    Если кадр не уложился в период, пропущенные кадры не догоняются
+    (считаются как overrun). Часы можно подменить: step(now) выполняет
+    один кадр синхронно, а run_frame(scheduled) - кадр вместе с учетом
+    jitter/overrun, что позволяет проверять эффекты без потоков.
+    """
+
+    def __init__(self, fps=60, clock=time.monotonic):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.clock = clock
+
+        self._effect = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        self._jitter_total = 0.0
+        self._jitter_max = 0.0
+        self._work_total = 0.0
+        self._work_max = 0.0
+
+    @property
+    def active(self):
+        """Имя активного эффекта или None"""
+        effect = self._effect
+        return effect[0] if effect else None
+
+    def set_effect(self, name, tick, interval=None):
+        """Делает эффект активным со следующего кадра.
+
+        tick(now) - функция кадра, interval - вызывать не чаще раза в interval
+        секунд (для медленных эффектов вроде захвата экрана).
+        """
+        with self._lock:
+            # [имя, функция, интервал, время последнего вызова]
+            self._effect = [name, tick, interval, None]
+        self._wakeup.set()
+
+    def clear_effect(self, name=None):
+        """Останавливает эффект (только если активен именно name, когда он задан)"""
+        with self._lock:
+            if name is None or (self._effect and self._effect[0] == name):
+                self._effect = None
+
+    def step(self, now=None):
+        """Выполняет один кадр активного эффекта. Возвращает True, если эффект вызван"""
+        effect = self._effect
+        if effect is None:
+            return False
+
+        now = self.clock() if now is None else now
+        name, tick, interval, last = effect
+        if interval and last is not None and now - last < interval:
+            return False
+        effect[3] = now
+
+        try:
+            tick(now)
+        except Exception as e:
+            self.errors += 1
+            print(f"[EFFECTS] Ошибка в эффекте {name}: {e}")
+        return True
+
+    def start(self):
+        """Запускает поток планировщика"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="light-effects", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        next_time = self.clock()
+        while self._running:
+            if self._effect is None:
+                # Нет эффекта - спим до set_effect, а не крутим пустые кадры
+                self._wakeup.clear()
+                if self._effect is None:
+                    self._wakeup.wait()
+                next_time = self.clock()
+                continue
+
+            now = self.clock()
+            if now < next_time:
+                self._wakeup.clear()
+                self._wakeup.wait(next_time - now)
+                continue
+
+            next_time = self.run_frame(next_time, now)
+
+    def run_frame(self, scheduled, now=None):
+        """Кадр, запланированный на момент scheduled, с учетом метрик.
+
+        Считает опоздание (jitter), время работы и overrun так же, как
+        поток планировщика. Возвращает время следующего кадра.
+        """
+        now = self.clock() if now is None else now
+        self._record_jitter(now - scheduled)
+        self.step(now)
+        finished = self.clock()
+        self._record_work(finished - now)
+
+        next_time = scheduled + self.period
+        if finished > next_time:
+            # Кадр не уложился в период - не догоняем, а сдвигаем расписание
+            missed = int((finished - next_time) / self.period) + 1
+            self.overruns += 1
+            self.skipped += missed
+            next_time += missed * self.period
+        return next_time
+
+    def _record_jitter(self, lateness):
+        self.ticks += 1
+        self._jitter_total += lateness
+        self._jitter_max = max(self._jitter_max, lateness)
+
+    def _record_work(self, duration):
+        self._work_total += duration
+        self._work_max = max(self._work_max, duration)
+
+    def stats(self):
+        """Метрики цикла: кадры, опоздания (jitter), превышения периода (overrun)"""
+        ticks = self.ticks
+        return {
+            "effect": self.active,
+            "ticks": ticks,
+            "overruns": self.overruns,
+            "skipped_frames": self.skipped,
+            "errors": self.errors,
+            "jitter_avg_ms": self._jitter_total / ticks * 1000 if ticks else 0.0,
+            "jitter_max_ms": self._jitter_max * 1000,
+            "tick_avg_ms": self._work_total / ticks * 1000 if ticks else 0.0,
+            "tick_max_ms": self._work_max * 1000,
+        }
+
+    def stop(self, timeout=1.0):
+        """Останавливает поток планировщика"""
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
@@ -0,0 +1,184 @@
+import numpy as np
+
+# Таблица синуса как sin8 в FastLED: аргумент 0-255 - полный период, значение 0-255
+# (те же значения, что давала прежняя формула через math.sin)
+SIN8_TABLE = ((np.sin(np.arange(256) / 255.0 * 2 * np.pi) + 1) * 127.5).astype(np.uint8)
+_SIN8_WIDE = SIN8_TABLE.astype(np.uint16)
+
+
+def sin8(x):
+    """sin8 из FastLED для числа или массива (табличный, без math.sin)"""
+    return SIN8_TABLE[np.asarray(x, dtype=np.int64) & 0xFF]
+
+
+def palette_gradient(colors, num_leds):
+    """Плавный градиент палитры вдоль ленты: массив num_leds x 3 uint8"""
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+    if len(colors) == 1:
+        return np.repeat(colors.astype(np.uint8), num_leds, axis=0)
+
+    stops = np.linspace(0, num_leds - 1, len(colors))
+    positions = np.arange(num_leds)
+    gradient = np.empty((num_leds, 3), dtype=np.float32)
+    for channel in range(3):
+        gradient[:, channel] = np.interp(positions, stops, colors[:, channel])
+    return np.rint(gradient).astype(np.uint8)
+
+
+def build_output_lut(brightness=100, gamma=1.0):
+    """Таблица 256 значений: гамма-коррекция и яркость (0-100%) за один проход.
+
+    Сначала гамма переводит цвет в уровень ШИМ, затем яркость масштабирует
+    его линейно. В обратном порядке гамма 2.2 при яркости 1-5% превращала
+    даже 255 в 0 - лента гасла вместо тусклого света.
+    """
+    levels = np.arange(256, dtype=np.float64) / 255.0
+    if gamma != 1.0:
+        levels = levels ** gamma
+    levels *= max(0, min(100, brightness)) / 100.0
+    return np.clip(np.rint(levels * 255.0), 0, 255).astype(np.uint8)
+
+
+class Effect:
+    """Базовый эффект: по времени t (секунды) и базовым цветам рисует кадр ленты"""
+
+    name = "effect"
+
+    def render(self, t, base, out):
+        """base - цвета светодиодов (N x 3 uint8), out - буфер кадра (N x 3 uint8)"""
+        raise NotImplementedError
+
+
+class SolidEffect(Effect):
+    """Статичный свет: базовые цвета без изменений"""
+
+    name = "static"
+
+    def render(self, t, base, out):
+        np.copyto(out, base)
+        return out
+
+
+class WaveEffect(Effect):
+    """Бегущая волна - тот же расчет, что делала прошивка по команде WAVE:
+
+    wave = sin8(t + i * length), цвет = base * wave / 255.
+    speed - шагов sin8 в секунду (5 шагов каждые 30 мс в старом цикле).
+    """
+
+    name = "wave"
+
+    def __init__(self, num_leds, speed=5 / 0.03, length=15):
+        self.speed = speed
+        self.length = length
+        self._offsets = np.arange(num_leds, dtype=np.int64) * length
+        self._wave = np.empty(num_leds, dtype=np.uint16)
+        self._work = np.empty((num_leds, 3), dtype=np.uint16)
+
+    def render(self, t, base, out):
+        phase = int(t * self.speed)
+        np.take(_SIN8_WIDE, (self._offsets + phase) & 0xFF, out=self._wave)
+        np.multiply(base, self._wave[:, None], out=self._work)
+        self._work //= 255
+        np.copyto(out, self._work, casting="unsafe")
+        return out
+
+
+class BreathingEffect(Effect):
+    """Дыхание: вся лента плавно меняет яркость по синусу.
+
+    rate - радиан в секунду (шаг 0.1 каждые 50 мс в старом цикле).
+    """
+
+    name = "breathing"
+
+    def __init__(self, num_leds, rate=0.1 / 0.05):
+        self.rate = rate
+        self._work = np.empty((num_leds, 3), dtype=np.uint16)
+
+    def render(self, t, base, out):
+        level = int((np.sin(t * self.rate) + 1) * 127.5)
+        np.multiply(base, np.uint16(level), out=self._work)
+        self._work //= 255
+        np.copyto(out, self._work, casting="unsafe")
+        return out
+
+
+class EffectEngine:
+    """Движок эффектов: на каждый тик выдает готовый кадр ленты N x 3 uint8.
+
+    Базовые цвета - один цвет или градиент палитры. Активный эффект рисует
+    кадр целиком векторными операциями NumPy; при смене эффекта старый и
+    новый кадры плавно смешиваются (crossfade). В конце кадр проходит через
+    одну таблицу яркости/гаммы. Все буферы выделяются заранее.
+    """
+
+    def __init__(self, num_leds=60, brightness=100, gamma=1.0):
+        self.num_leds = num_leds
+        self.gamma = gamma
+        self.brightness = brightness
+        self.base = np.zeros((num_leds, 3), dtype=np.uint8)
+        self.lut = build_output_lut(brightness, gamma)
+
+        self.effect = SolidEffect()
+        self._previous = None
+        self._fade_duration = 0.0
+        self._fade_start = None
+
+        self._frame = np.empty((num_leds, 3), dtype=np.uint8)
+        self._previous_frame = np.empty((num_leds, 3), dtype=np.uint8)
+        self._mix = np.empty((num_leds, 3), dtype=np.uint16)
+        self._mix_new = np.empty((num_leds, 3), dtype=np.uint16)
+        self._output = np.empty((num_leds, 3), dtype=np.uint8)
+
+    def set_color(self, color):
+        """Один цвет на всю ленту"""
+        self.base[:] = color
+
+    def set_palette(self, colors):
+        """Градиент палитры вдоль ленты"""
+        self.base[:] = palette_gradient(colors, self.num_leds)
+
+    def set_brightness(self, brightness, gamma=None):
+        """Пересчитывает таблицу яркости/гаммы"""
+        self.brightness = brightness
+        if gamma is not None:
+            self.gamma = gamma
+        self.lut = build_output_lut(self.brightness, self.gamma)
+
+    def set_effect(self, effect, fade=0.0):
+        """Меняет эффект; fade - длительность плавного перехода в секундах"""
+        if fade > 0:
+            self._previous = self.effect
+            self._fade_duration = fade
+            self._fade_start = None  # Отсчет начнется с ближайшего кадра
+        else:
+            self._previous = None
+        self.effect = effect
+
+    @property
+    def fading(self):
+        return self._previous is not None
+
+    def render(self, t):
+        """Кадр для момента t (секунды). Возвращает внутренний буфер - не изменять"""
+        frame = self.effect.render(t, self.base, self._frame)
+
+        if self._previous is not None:
+            if self._fade_start is None:
+                self._fade_start = t
+            progress = (t - self._fade_start) / self._fade_duration
+            if progress >= 1.0:
+                self._previous = None
+            else:
+                alpha = int(max(0.0, progress) * 256)
+                previous = self._previous.render(t, self.base, self._previous_frame)
+                # mix = (previous * (256 - alpha) + frame * alpha) >> 8
+                np.multiply(previous, np.uint16(256 - alpha), out=self._mix)
+                np.multiply(frame, np.uint16(alpha), out=self._mix_new)
+                self._mix += self._mix_new
+                self._mix >>= 8
+                np.copyto(frame, self._mix, casting="unsafe")
+
+        np.take(self.lut, frame, out=self._output)
+        return self._output
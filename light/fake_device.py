@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+import tty
+
+import numpy as np
+
+from .serial_protocol import FrameDecoder, FRAME_FILL
+
+
+class FakeLedDevice:
+    """Имитация Arduino с лентой на псевдотерминале (pty).
+
+    Порт self.port открывается как обычный serial-порт, а устройство
+    разбирает приходящие команды так же, как прошивка: бинарные пакеты
+    через FrameDecoder или текстовые строки "r,g,b\\n". Последний кадр
+    и счетчики доступны для проверок и бенчмарков. Только для POSIX.
+    """
+
+    def __init__(self, num_leds=60, protocol="binary"):
+        self.num_leds = num_leds
+        self.protocol = protocol
+        self.frame = np.zeros((num_leds, 3), dtype=np.uint8)
+        self.frames = 0
+        self.bytes_received = 0
+
+        self._decoder = FrameDecoder()
+        self._line = bytearray()
+        self._frame_event = threading.Condition()
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="fake-led-device", daemon=True)
+        self._thread.start()
+
+    @property
+    def checksum_errors(self):
+        return self._decoder.checksum_errors
+
+    def _read_loop(self):
+        while self._running:
+            try:
+                data = os.read(self._master, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            self.bytes_received += len(data)
+            if self.protocol == "binary":
+                self._handle_binary(data)
+            else:
+                self._handle_ascii(data)
+
+    def _handle_binary(self, data):
+        for frame_type, leds in self._decoder.feed(data):
+            if frame_type == FRAME_FILL:
+                self._show(np.broadcast_to(leds[0], self.frame.shape))
+            else:
+                self._show(leds[:self.num_leds])
+
+    def _handle_ascii(self, data):
+        self._line += data
+        while True:
+            end = self._line.find(b"\n")
+            if end < 0:
+                return
+            line = self._line[:end].decode(errors="ignore").strip()
+            del self._line[:end + 1]
+            try:
+                leds = [[int(v) for v in part.split(",")] for part in line.split(";") if part]
+            except ValueError:
+                continue
+            if len(leds) == 1:
+                self._show(np.broadcast_to(np.array(leds[0], dtype=np.uint8), self.frame.shape))
+            elif leds:
+                self._show(np.array(leds[:self.num_leds], dtype=np.uint8))
+
+    def _show(self, leds):
+        with self._frame_event:
+            self.frame[:len(leds)] = leds
+            self.frames += 1
+            self._frame_event.notify_all()
+
+    def wait_frames(self, count, timeout=5.0):
+        """Ждет, пока устройство получит count кадров. True - дождались"""
+        deadline = time.monotonic() + timeout
+        with self._frame_event:
+            while self.frames < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._frame_event.wait(remaining)
+        return True
+
+    def close(self):
+        self._running = False
+        # Закрытие slave будит чтение на master (EIO). Master закрываем только
+        # после остановки потока, иначе номер дескриптора может достаться
+        # новому pty, и старый поток начнет читать чужие данные
+        try:
+            os.close(self._slave)
+        except OSError:
+            pass
+        self._thread.join(timeout=1.0)
+        try:
+            os.close(self._master)
+        except OSError:
+            pass
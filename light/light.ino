@@ -6,8 +6,17 @@
 
 CRGB leds[NUM_LEDS];
 
+// Бинарный протокол: AA 55 | тип | N (uint16 LE) | RGB * N | сумма
+#define FRAME_MAGIC_1  0xAA
+#define FRAME_MAGIC_2  0x55
+#define FRAME_LEDS     0x01
+#define FRAME_FILL     0x02
+
+uint8_t frameBuffer[NUM_LEDS * 3];
+
 void setup() {
   Serial.begin(115200);
+  Serial.setTimeout(50);
   FastLED.addLeds<WS2812, LED_PIN, GRB>(leds, NUM_LEDS);
   FastLED.setBrightness(BRIGHTNESS);
   
@@ -62,7 +71,59 @@ void processWaveCommand(String command) {
   }
 }
 
+void skipBytes(uint16_t count) {
+  uint8_t dummy;
+  while (count-- > 0 && Serial.readBytes(&dummy, 1) == 1) {}
+}
+
+void processBinaryFrame() {
+  // Заголовок: AA 55 тип N_low N_high
+  uint8_t header[5];
+  if (Serial.readBytes(header, 5) != 5 || header[1] != FRAME_MAGIC_2) {
+    return;
+  }
+  
+  uint8_t type = header[2];
+  uint16_t count = header[3] | (header[4] << 8);
+  uint8_t sum = type + header[3] + header[4];
+  
+  if (type == FRAME_FILL && count == 1) {
+    uint8_t rgb[4];
+    if (Serial.readBytes(rgb, 4) != 4) return;
+    sum += rgb[0] + rgb[1] + rgb[2];
+    if (sum != rgb[3]) return;
+    
+    fill_solid(leds, NUM_LEDS, CRGB(rgb[0], rgb[1], rgb[2]));
+    FastLED.show();
+  } else if (type == FRAME_LEDS && count <= NUM_LEDS) {
+    size_t size = count * 3;
+    uint8_t checksum;
+    if (Serial.readBytes(frameBuffer, size) != size) return;
+    if (Serial.readBytes(&checksum, 1) != 1) return;
+    
+    for (size_t i = 0; i < size; i++) {
+      sum += frameBuffer[i];
+    }
+    if (sum != checksum) return;
+    
+    // Кадр применяется только целиком и после проверки суммы
+    for (uint16_t i = 0; i < count; i++) {
+      leds[i] = CRGB(frameBuffer[i * 3], frameBuffer[i * 3 + 1], frameBuffer[i * 3 + 2]);
+    }
+    FastLED.show();
+  } else if (type == FRAME_LEDS) {
+    // Кадр длиннее ленты - пропускаем его целиком
+    skipBytes(count * 3 + 1);
+  }
+}
+
 void loop() {
+  if (Serial.available() > 0 && Serial.peek() == FRAME_MAGIC_1) {
+    // Бинарный пакет - без задержки, чтобы держать частоту кадров
+    processBinaryFrame();
+    return;
+  }
+  
   if (Serial.available() > 0) {
     String command = Serial.readStringUntil('\n');
     command.trim();
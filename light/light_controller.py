@@ -1,40 +1,61 @@
-import serial
 import time
-import threading
 import json
 import numpy as np
-import pyaudio
-from collections import deque
-import math
+
+from .serial_protocol import encode_fill, encode_frame, encode_ascii_frame
+from .serial_writer import SerialWriter
+from .serial_connection import SerialConnection
+from .effects import EffectEngine, WaveEffect, BreathingEffect, SolidEffect
+from .effect_scheduler import EffectScheduler
+from .audio_spectrum import SpectrumAnalyzer
+from .color_filter import ColorFilter
+from .scenes import SceneStore, normalize_scene
 
 class LightController:
-    def __init__(self, port='COM11', baudrate=115200):
+    # Частота кадров эффектов и длительность плавного перехода между ними
+    EFFECT_FPS = 50
+    EFFECT_FADE = 0.5
+
+    def __init__(self, port='COM11', baudrate=115200, protocol="ascii", gamma=2.2,
+                 scenes_path="cache/light_scenes.json", restore_state=True):
         self.port = port
         self.baudrate = baudrate
-        self.arduino = None
+        # "ascii" - текстовые команды "r,g,b\n" (старая прошивка),
+        # "binary" - бинарные пакеты из serial_protocol (кадр ленты за ~186 байт)
+        if protocol not in ("ascii", "binary"):
+            raise ValueError(f"Неизвестный протокол ленты: {protocol}")
+        self.protocol = protocol
         self.current_mode = "static"
         self.current_color = (255, 255, 255)
         self.brightness = 100
+        # Гамма-коррекция вывода (1.0 - без коррекции, как раньше)
+        self.gamma = gamma
         self.palette = "white"
         self.is_on = False
         
-        # Флаги для управления потоками эффектов
-        self._wave_thread = None
-        self._wave_running = False
-        self._breathing_thread = None
-        self._breathing_running = False
-        self._monitor_thread = None
-        self._monitor_running = False
-        
         # Для светомузыки
         self.audio_interface = None
         self.audio_stream = None
         self.is_music_mode = False
-        self.audio_data = deque(maxlen=100)
         
         # Параметры ленты
         self.NUM_LEDS = 60  # Количество светодиодов
         
+        # Спектр звука: буфер 1024 сэмпла при 44100 Гц, полосы растянуты по ленте
+        self.spectrum = SpectrumAnalyzer(frame_size=1024, sample_rate=44100, num_leds=self.NUM_LEDS)
+        self._music_frame = np.zeros((self.NUM_LEDS, 3), dtype=np.uint8)
+        
+        # Сглаживание в OKLab и отсев незаметных изменений: в устоявшейся сцене
+        # умная подсветка и светомузыка не пишут в порт каждый кадр
+        self._monitor_filter = ColorFilter(smoothing=0.4)
+        self._music_filter = ColorFilter(smoothing=1.0)  # спектр уже сглажен
+        
+        # Все эффекты считаются движком кадров и вызываются одним планировщиком
+        # Таблица яркости/гаммы движка (effects.lut) применяется ко всему выводу
+        self.effects = EffectEngine(self.NUM_LEDS, brightness=self.brightness, gamma=self.gamma)
+        self._scheduler = EffectScheduler(fps=self.EFFECT_FPS)
+        self._scheduler.start()
+        
         # Палитры цветов
         self.palettes = {
             "холодная": [(200, 230, 255), (170, 210, 255), (140, 190, 255)],
@@ -60,33 +81,40 @@ class LightController:
             "лавандовый": (230, 230, 250)
         }
         
-        # СРАЗУ ПОДКЛЮЧАЕМСЯ И ВЫКЛЮЧАЕМ СВЕТ ПРИ ЗАПУСКЕ
+        # Все записи в порт идут через один поток с почтовым ящиком на один кадр,
+        # порт открывается и переоткрывается в фоне - команды никогда не ждут подключения
+        self._writer = SerialWriter(max_fps=60)
+        self._closed = False
+        self._connection = SerialConnection(port, baudrate, self._writer, on_connect=self._on_connected)
+        
+        # Сцены и последнее состояние ленты на диске
+        self.scenes = SceneStore(scenes_path)
+        self._applying_scene = False
+        
+        last_state = self.scenes.last if restore_state else None
+        if last_state:
+            # Восстанавливаем последнее состояние: в почтовый ящик сразу кладется
+            # нужный кадр, и он станет первым после открытия порта - без выключения
+            self.apply_scene(last_state, remember=False)
+            self._connection.start()
+            print(f"[LIGHT] Контроллер инициализирован (восстановлено состояние: {self.current_mode})")
+            return
+        
+        # СРАЗУ ВЫКЛЮЧАЕМ СВЕТ ПРИ ЗАПУСКЕ (команда уйдет, как только откроется порт)
         self._force_turn_off()
+        self._connection.start()
         
         print("[LIGHT] Контроллер инициализирован (свет выключен)")
     
+    @property
+    def is_connected(self):
+        """Открыт ли порт Arduino"""
+        return self._connection.is_connected
+    
     def _force_turn_off(self):
         """Принудительно выключает свет при инициализации"""
-        try:
-            print("[LIGHT] Принудительно выключаю свет...")
-            self.arduino = serial.Serial(self.port, self.baudrate, timeout=0.1)
-            time.sleep(2)
-            
-            # Отправляем команду выключения несколько раз для надежности
-            for _ in range(3):
-                self.arduino.write(b"0,0,0\n")
-                time.sleep(0.1)
-            
-            self.is_on = False
-            print("[LIGHT] Свет принудительно выключен")
-            
-            # Закрываем соединение - подключимся позже при командах
-            self.arduino.close()
-            self.arduino = None
-            
-        except Exception as e:
-            print(f"[LIGHT] Ошибка принудительного выключения: {e}")
-            self.arduino = None
+        self.is_on = False
+        self._writer.submit(self._encode_color(0, 0, 0))
     
     def __del__(self):
         """Деструктор - закрывает соединение при удалении объекта"""
@@ -94,463 +122,126 @@ class LightController:
     
     def close_connection(self):
         """Закрывает соединение с Arduino"""
-        if self.arduino:
-            try:
+        scenes = getattr(self, "scenes", None)
+        if scenes is not None:
+            # Отложенная запись последнего состояния - до выхода
+            scenes.flush()
+        
+        connection = getattr(self, "_connection", None)
+        # Повторный вызов (atexit, затем деструктор) ничего не делает
+        if connection is None or self._closed:
+            return
+        self._closed = True
+        try:
+            # Эффекты больше не кладут кадры в почтовый ящик
+            self._scheduler.stop()
+            connected = connection.is_connected
+            if connected:
                 # Выключаем свет перед закрытием
-                self.arduino.write(b"0,0,0\n")
-                time.sleep(0.1)
-                self.arduino.close()
+                self._writer.submit(self._encode_color(0, 0, 0))
+            # Поток записи дописывает последний кадр и останавливается до закрытия порта,
+            # иначе кадр выключения пропал бы вместе с daemon-потоком
+            self._writer.close()
+            connection.close()
+            if connected:
                 print("[LIGHT] Соединение с Arduino закрыто, свет выключен")
-            except Exception as e:
-                print(f"[LIGHT] Ошибка закрытия соединения: {e}")
-            self.arduino = None
-    
-    def _connect_arduino(self):
-        """Подключение к Arduino"""
-        if self.arduino:
-            return True
-            
-        try:
-            print(f"[LIGHT] Подключаюсь к Arduino на {self.port}...")
-            self.arduino = serial.Serial(self.port, self.baudrate, timeout=0.1)
-            time.sleep(2)
-            
-            # Убеждаемся, что свет выключен при подключении
-            self.arduino.write(b"0,0,0\n")
-            time.sleep(0.1)
-            
-            print(f"[LIGHT] Успешно подключено к Arduino на {self.port}")
-            return True
         except Exception as e:
-            print(f"[LIGHT] Ошибка подключения к Arduino: {e}")
-            self.arduino = None
-            return False
-
-    def _stop_all_effects(self):
-        """Останавливает все эффекты"""
-        print("[LIGHT] Останавливаю все эффекты...")
-        
-        # Останавливаем волну
-        self._wave_running = False
-        if self._wave_thread and self._wave_thread.is_alive():
-            self._wave_thread.join(timeout=1.0)
-        
-        # Останавливаем дыхание
-        self._breathing_running = False
-        if self._breathing_thread and self._breathing_thread.is_alive():
-            self._breathing_thread.join(timeout=1.0)
-        
-        # Останавливаем монитор
-        self._monitor_running = False
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=1.0)
-        
-        # Останавливаем светомузыку (с проверкой атрибутов)
-        self.stop_music_mode()
-
-    def _apply_brightness(self, color):
-        """Применяет яркость к цвету"""
-        r, g, b = color
-        brightness_factor = self.brightness / 100.0
-        return (
-            int(r * brightness_factor),
-            int(g * brightness_factor), 
-            int(b * brightness_factor)
-        )
+            print(f"[LIGHT] Ошибка закрытия соединения: {e}")
     
-    def send_color(self, r, g, b):
-        """Отправка одного цвета на всю ленту"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
-        if not self.is_on:
-            return
-        
-        try:
-            # Применяем яркость
-            r, g, b = self._apply_brightness((r, g, b))
-            
-            # Ограничиваем значения
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            command = f"{r},{g},{b}\n"
-            self.arduino.write(command.encode())
-            
-        except Exception as e:
-            print(f"[LIGHT] Ошибка отправки цвета: {e}")
-            self.arduino = None
-
-    def send_led_strip_data(self, led_colors):
-        """Отправляет данные для каждого светодиода отдельно"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
-        if not self.is_on:
+    def _on_connected(self, first):
+        """Порт открыт (поток подключения). После обрыва восстанавливаем состояние ленты"""
+        if first:
             return
-        
-        try:
-            # Формируем команду для всех светодиодов
-            # Формат: "LED:r1,g1,b1;r2,g2,b2;...;rN,gN,bN\n"
-            command_parts = []
-            for r, g, b in led_colors:
-                # Применяем яркость к каждому светодиоду
-                r_adj, g_adj, b_adj = self._apply_brightness((r, g, b))
-                r_adj = max(0, min(255, r_adj))
-                g_adj = max(0, min(255, g_adj))
-                b_adj = max(0, min(255, b_adj))
-                command_parts.append(f"{r_adj},{g_adj},{b_adj}")
-            
-            command = "LED:" + ";".join(command_parts) + "\n"
-            self.arduino.write(command.encode())
-            
-        except Exception as e:
-            print(f"[LIGHT] Ошибка отправки данных ленты: {e}")
-            self.arduino = None
-    
-    def turn_on(self):
-        """Включить свет"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
-        self.is_on = True
-        self.send_color(*self.current_color)
-        print("[LIGHT] Свет включен")
-    
-    def turn_off(self):
-        """Выключить свет"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
-        self.is_on = False
-        # Отправляем черный цвет для выключения
-        try:
-            self.arduino.write(b"0,0,0\n")
-            time.sleep(0.1)
-        except Exception as e:
-            print(f"[LIGHT] Ошибка выключения света: {e}")
-        print("[LIGHT] Свет выключен")
-    
-    def set_brightness(self, percent):
-        """Установить яркость"""
-        self.brightness = max(0, min(100, percent))
-        if self.is_on and self.arduino:
+        # Arduino после переподключения сбрасывается и гаснет - следующий кадр
+        # умной подсветки/светомузыки должен уйти, даже если картинка не менялась
+        self._reset_output_filters()
+        if self.is_on and self.current_mode == "static":
             self.send_color(*self.current_color)
-        print(f"[LIGHT] Яркость установлена: {self.brightness}%")
-    
-    def increase_brightness(self, step=10):
-        """Увеличить яркость"""
-        self.set_brightness(self.brightness + step)
-    
-    def decrease_brightness(self, step=10):
-        """Уменьшить яркость"""
-        self.set_brightness(self.brightness - step)
-    
-    def set_color(self, color_name):
-        """Установить цвет по имени (работает даже в режимах эффектов)"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return False
-                
-        color_name = color_name.lower()
-        print(f"[LIGHT] Пытаюсь установить цвет: {color_name}")
-        
-        # Поиск в базовых цветах
-        if color_name in self.colors:
-            new_color = self.colors[color_name]
-            self.current_color = new_color
-            self.palette = color_name
-            
-            # Если свет включен, сразу применяем новый цвет
-            if self.is_on:
-                if self.current_mode == "static":
-                    # Просто устанавливаем цвет
-                    self.send_color(*new_color)
-                else:
-                    # В режимах эффектов цвет применится в следующем цикле эффекта
-                    print(f"[LIGHT] Цвет изменен на {color_name} (активен режим: {self.current_mode})")
-            
-            print(f"[LIGHT] Установлен цвет: {color_name}")
-            return True
-        
-        # Поиск в палитрах
-        if color_name in self.palettes:
-            new_color = self.palettes[color_name][0]
-            self.current_color = new_color
-            self.palette = color_name
-            
-            if self.is_on:
-                if self.current_mode == "static":
-                    self.send_color(*new_color)
-                else:
-                    print(f"[LIGHT] Палитра изменена на {color_name} (активен режим: {self.current_mode})")
-            
-            print(f"[LIGHT] Установлена палитра: {color_name}")
-            return True
-        
-        print(f"[LIGHT] Цвет не найден: {color_name}")
-        return False
-    
-    def set_palette(self, palette_name):
-        """Установить палитру (работает даже в режимах эффектов)"""
-        if palette_name in self.palettes:
-            new_color = self.palettes[palette_name][0]
-            self.current_color = new_color
-            self.palette = palette_name
-            
-            if self.is_on:
-                if self.current_mode == "static":
-                    self.send_color(*new_color)
-                else:
-                    print(f"[LIGHT] Палитра изменена на {palette_name} (активен режим: {self.current_mode})")
-            
-            print(f"[LIGHT] Установлена палитра: {palette_name}")
-            return True
-        return False
-    
-    
-    #эффекты
-import serial
-import time
-import threading
-import json
-import numpy as np
-import pyaudio
-from collections import deque
-import math
+        elif not self.is_on:
+            self._writer.submit(self._encode_color(0, 0, 0))
 
-class LightController:
-    def __init__(self, port='COM11', baudrate=115200):
-        self.port = port
-        self.baudrate = baudrate
-        self.arduino = None
-        self.current_mode = "static"
-        self.current_color = (255, 255, 255)
-        self.brightness = 100
-        self.palette = "white"
-        self.is_on = False
-        
-        # Флаги для управления потоками эффектов
-        self._wave_thread = None
-        self._wave_running = False
-        self._breathing_thread = None
-        self._breathing_running = False
-        self._monitor_thread = None
-        self._monitor_running = False
-        
-        # Для светомузыки
-        self.audio_interface = None
-        self.audio_stream = None
-        self.is_music_mode = False
-        self.audio_data = deque(maxlen=100)
-        
-        # Параметры ленты
-        self.NUM_LEDS = 60  # Количество светодиодов
-        
-        # Палитры цветов
-        self.palettes = {
-            "холодная": [(200, 230, 255), (170, 210, 255), (140, 190, 255)],
-            "ламповая": [(255, 200, 150), (255, 180, 120), (255, 160, 100)],
-            "теплые": [(255, 220, 180), (255, 200, 150), (255, 180, 120)],
-            "мятная": [(200, 255, 230), (180, 240, 220), (160, 230, 210)],
-            "бархатная": [(150, 100, 200), (130, 80, 180), (110, 60, 160)]
-        }
-        
-        # Цвета по названиям
-        self.colors = {
-            "белый": (255, 255, 255),
-            "красный": (255, 0, 0),
-            "зеленый": (0, 255, 0),
-            "синий": (0, 0, 255),
-            "желтый": (255, 255, 0),
-            "фиолетовый": (255, 0, 255),
-            "голубой": (0, 255, 255),
-            "оранжевый": (255, 165, 0),
-            "розовый": (255, 192, 203),
-            "мятный": (170, 240, 210),
-            "бирюзовый": (64, 224, 208),
-            "лавандовый": (230, 230, 250)
-        }
-        
-        # СРАЗУ ПОДКЛЮЧАЕМСЯ И ВЫКЛЮЧАЕМ СВЕТ ПРИ ЗАПУСКЕ
-        self._force_turn_off()
-        
-        print("[LIGHT] Контроллер инициализирован (свет выключен)")
-    
-    def _force_turn_off(self):
-        """Принудительно выключает свет при инициализации"""
-        try:
-            print("[LIGHT] Принудительно выключаю свет...")
-            self.arduino = serial.Serial(self.port, self.baudrate, timeout=0.1)
-            time.sleep(2)
-            
-            # Отправляем команду выключения несколько раз для надежности
-            for _ in range(3):
-                self.arduino.write(b"0,0,0\n")
-                time.sleep(0.1)
-            
-            self.is_on = False
-            print("[LIGHT] Свет принудительно выключен")
-            
-            # Закрываем соединение - подключимся позже при командах
-            self.arduino.close()
-            self.arduino = None
-            
-        except Exception as e:
-            print(f"[LIGHT] Ошибка принудительного выключения: {e}")
-            self.arduino = None
-    
-    def __del__(self):
-        """Деструктор - закрывает соединение при удалении объекта"""
-        self.close_connection()
-    
-    def close_connection(self):
-        """Закрывает соединение с Arduino"""
-        if self.arduino:
-            try:
-                # Выключаем свет перед закрытием
-                self.arduino.write(b"0,0,0\n")
-                time.sleep(0.1)
-                self.arduino.close()
-                print("[LIGHT] Соединение с Arduino закрыто, свет выключен")
-            except Exception as e:
-                print(f"[LIGHT] Ошибка закрытия соединения: {e}")
-            self.arduino = None
-    
-    def _connect_arduino(self):
-        """Подключение к Arduino"""
-        if self.arduino:
-            return True
-            
-        try:
-            print(f"[LIGHT] Подключаюсь к Arduino на {self.port}...")
-            self.arduino = serial.Serial(self.port, self.baudrate, timeout=0.1)
-            time.sleep(2)
-            
-            # Убеждаемся, что свет выключен при подключении
-            self.arduino.write(b"0,0,0\n")
-            time.sleep(0.1)
-            
-            print(f"[LIGHT] Успешно подключено к Arduino на {self.port}")
-            return True
-        except Exception as e:
-            print(f"[LIGHT] Ошибка подключения к Arduino: {e}")
-            self.arduino = None
-            return False
+    def get_serial_stats(self):
+        """Статистика записи в порт: кадры, отброшенные кадры, задержка"""
+        return self._writer.stats()
 
     def _stop_all_effects(self):
         """Останавливает все эффекты"""
         print("[LIGHT] Останавливаю все эффекты...")
         
-        # Останавливаем волну
-        self._wave_running = False
-        if self._wave_thread and self._wave_thread.is_alive():
-            self._wave_thread.join(timeout=1.0)
-        
-        # Останавливаем дыхание
-        self._breathing_running = False
-        if self._breathing_thread and self._breathing_thread.is_alive():
-            self._breathing_thread.join(timeout=1.0)
-        
-        # Останавливаем монитор
-        self._monitor_running = False
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=1.0)
+        # Эффект перестает вызываться со следующего кадра - ждать потоки не нужно
+        self._scheduler.clear_effect()
         
-        # Останавливаем светомузыку (с проверкой атрибутов)
+        # Останавливаем захват звука светомузыки
         self.stop_music_mode()
 
     def _apply_brightness(self, color):
-        """Применяет яркость к цвету"""
-        r, g, b = color
-        brightness_factor = self.brightness / 100.0
-        return (
-            int(r * brightness_factor),
-            int(g * brightness_factor), 
-            int(b * brightness_factor)
-        )
+        """Применяет яркость и гамму к цвету по таблице (значения вне 0-255 обрезаются)"""
+        r, g, b = self.effects.lut[np.clip(color, 0, 255).astype(np.uint8)].tolist()
+        return r, g, b
     
+    def _encode_color(self, r, g, b):
+        """Команда одного цвета на всю ленту в выбранном протоколе"""
+        if self.protocol == "binary":
+            return encode_fill(r, g, b)
+        return f"{r},{g},{b}\n".encode()
+
     def send_color(self, r, g, b):
         """Отправка одного цвета на всю ленту"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
         if not self.is_on:
             return
         
         try:
-            # Применяем яркость
+            # Яркость, гамма и ограничение 0-255 - одной таблицей
             r, g, b = self._apply_brightness((r, g, b))
             
-            # Ограничиваем значения
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            command = f"{r},{g},{b}\n"
-            self.arduino.write(command.encode())
+            self._writer.submit(self._encode_color(r, g, b))
             
         except Exception as e:
             print(f"[LIGHT] Ошибка отправки цвета: {e}")
-            self.arduino = None
 
     def send_wave_command(self, base_r, base_g, base_b, t, speed, length):
         """Отправляет команду для волны на Arduino"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
         if not self.is_on:
             return
         
         try:
-            # Применяем яркость к базовому цвету
+            # Применяем яркость и гамму к базовому цвету
             base_r, base_g, base_b = self._apply_brightness((base_r, base_g, base_b))
             
             # Формируем команду для волны
             command = f"WAVE:{base_r},{base_g},{base_b},{t},{speed},{length}\n"
-            self.arduino.write(command.encode())
+            self._writer.submit(command.encode())
             
         except Exception as e:
             print(f"[LIGHT] Ошибка отправки волны: {e}")
-            self.arduino = None
     
     def turn_on(self):
         """Включить свет"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
         self.is_on = True
+        self._reset_output_filters()
         self.send_color(*self.current_color)
+        self._remember_state()
         print("[LIGHT] Свет включен")
     
     def turn_off(self):
         """Выключить свет"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
-                
         self.is_on = False
-        # Отправляем черный цвет для выключения
-        try:
-            self.arduino.write(b"0,0,0\n")
-            time.sleep(0.1)
-        except Exception as e:
-            print(f"[LIGHT] Ошибка выключения света: {e}")
+        # Отправляем черный цвет для выключения. Он вытесняет из почтового ящика
+        # еще не отправленный кадр эффекта, а если порт закрыт - уйдет после подключения
+        self._writer.submit(self._encode_color(0, 0, 0))
+        self._remember_state()
         print("[LIGHT] Свет выключен")
     
     def set_brightness(self, percent):
         """Установить яркость"""
         self.brightness = max(0, min(100, percent))
-        if self.is_on and self.arduino:
+        # Таблица яркости/гаммы пересчитывается только здесь;
+        # эффекты подхватят ее со следующего кадра
+        self.effects.set_brightness(self.brightness)
+        self._reset_output_filters()
+        if self.is_on and self.current_mode == "static":
             self.send_color(*self.current_color)
+        self._remember_state()
         print(f"[LIGHT] Яркость установлена: {self.brightness}%")
     
     def increase_brightness(self, step=10):
@@ -563,10 +254,6 @@ class LightController:
     
     def set_color(self, color_name):
         """Установить цвет по имени (работает даже в режимах эффектов)"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return False
-                
         color_name = color_name.lower()
         print(f"[LIGHT] Пытаюсь установить цвет: {color_name}")
         
@@ -575,6 +262,7 @@ class LightController:
             new_color = self.colors[color_name]
             self.current_color = new_color
             self.palette = color_name
+            self._update_effect_colors()
             
             # Если свет включен, сразу применяем новый цвет
             if self.is_on:
@@ -585,6 +273,7 @@ class LightController:
                     # В режимах эффектов цвет применится в следующем цикле эффекта
                     print(f"[LIGHT] Цвет изменен на {color_name} (активен режим: {self.current_mode})")
             
+            self._remember_state()
             print(f"[LIGHT] Установлен цвет: {color_name}")
             return True
         
@@ -593,6 +282,7 @@ class LightController:
             new_color = self.palettes[color_name][0]
             self.current_color = new_color
             self.palette = color_name
+            self._update_effect_colors()
             
             if self.is_on:
                 if self.current_mode == "static":
@@ -600,6 +290,7 @@ class LightController:
                 else:
                     print(f"[LIGHT] Палитра изменена на {color_name} (активен режим: {self.current_mode})")
             
+            self._remember_state()
             print(f"[LIGHT] Установлена палитра: {color_name}")
             return True
         
@@ -612,6 +303,7 @@ class LightController:
             new_color = self.palettes[palette_name][0]
             self.current_color = new_color
             self.palette = palette_name
+            self._update_effect_colors()
             
             if self.is_on:
                 if self.current_mode == "static":
@@ -619,11 +311,54 @@ class LightController:
                 else:
                     print(f"[LIGHT] Палитра изменена на {palette_name} (активен режим: {self.current_mode})")
             
+            self._remember_state()
             print(f"[LIGHT] Установлена палитра: {palette_name}")
             return True
         return False
 
     # Режимы эффектов
+    def _run_engine_effect(self, effect):
+        """Запускает кадровый эффект движка с плавным переходом от текущего"""
+        self._update_effect_colors()
+        self.effects.set_effect(effect, fade=self.EFFECT_FADE)
+        self._scheduler.set_effect(effect.name, self._tick_engine)
+
+    def _update_effect_colors(self):
+        """Базовые цвета эффектов: градиент палитры или один цвет"""
+        if self.palette in self.palettes:
+            self.effects.set_palette(self.palettes[self.palette])
+        else:
+            self.effects.set_color(self.current_color)
+
+    def _tick_engine(self, now):
+        """Кадр волны/дыхания (вызывается планировщиком)"""
+        if not self.is_on:
+            return
+        
+        frame = self.effects.render(now)
+        effect = self.effects.effect
+        
+        if self.protocol == "binary":
+            self._writer.submit(encode_frame(frame))
+        elif effect.name == "wave" and not self.effects.fading:
+            # Старая прошивка не принимает кадры, но умеет рисовать волну сама
+            base_r, base_g, base_b = self.current_color
+            phase = int(now * effect.speed) % 256
+            self.send_wave_command(base_r, base_g, base_b, phase, 5, effect.length)
+        else:
+            # Дыхание одинаково по всей ленте - достаточно одного цвета
+            r, g, b = frame[0]
+            self._writer.submit(self._encode_color(int(r), int(g), int(b)))
+
+    def _reset_output_filters(self):
+        """Следующий кадр умной подсветки/светомузыки будет отправлен без отсева"""
+        self._monitor_filter.reset()
+        self._music_filter.reset()
+
+    def get_effect_stats(self):
+        """Метрики планировщика эффектов: кадры, jitter, overrun"""
+        return self._scheduler.stats()
+
     def start_wave_effect(self):
         """Запуск эффекта бегущей волны"""
         if self.current_mode == "wave":
@@ -631,69 +366,36 @@ class LightController:
         
         self._stop_all_effects()
         self.current_mode = "wave"
-        self._wave_running = True
-        self._wave_thread = threading.Thread(target=self._running_wave_effect, daemon=True)
-        self._wave_thread.start()
+        self._run_engine_effect(WaveEffect(self.NUM_LEDS))
+        self._remember_state()
         print("[LIGHT] Бегущая волна запущена")
 
-    def _running_wave_effect(self):
-        """Волна, бегущая по ленте (точный аналог Arduino кода)"""
-        t = 0
-        WAVE_SPEED = 5
-        WAVE_LENGTH = 15
-        last_color = self.current_color
-        
-        print(f"[WAVE] Бегущая волна по {self.NUM_LEDS} светодиодам")
-        
-        while self._wave_running and self.is_on and self.current_mode == "wave":
-            try:
-                # Проверяем, не изменился ли цвет
-                if self.current_color != last_color:
-                    last_color = self.current_color
-                    print(f"[WAVE] Базовый цвет изменен на: {last_color}")
-                
-                # Отправляем команду волны на Arduino
-                base_r, base_g, base_b = last_color
-                self.send_wave_command(base_r, base_g, base_b, t, WAVE_SPEED, WAVE_LENGTH)
-                
-                t += WAVE_SPEED
-                time.sleep(0.03)  # Задержка 30ms как в Arduino
-                
-            except Exception as e:
-                print(f"[WAVE] Ошибка в бегущей волне: {e}")
-                break
-        
-        print("[LIGHT] Бегущая волна остановлена")
-
-    # Остальные методы остаются без изменений...
-
-    def _sin8(self, x):
-        """Аналог sin8 из FastLED - возвращает значение 0-255"""
-        import math
-        # Нормализуем входное значение
-        normalized = (x % 256) / 255.0 * 2 * math.pi
-        # Синус от -1 до 1 преобразуем в 0-255
-        return int((math.sin(normalized) + 1) * 127.5)
+    def send_frame(self, frame):
+        """Отправляет кадр ленты - свой цвет для каждого светодиода.
 
-    def _send_led_strip_data(self, led_colors):
-        """Отправляет данные для всей ленты светодиодов"""
-        if not self.arduino:
-            if not self._connect_arduino():
-                return
+        frame - массив NUM_LEDS x 3 (или список кортежей r, g, b).
+        Яркость и гамма применяются ко всему кадру одной таблицей (effects.lut).
+        """
+        if not self.is_on:
+            return
         
         try:
-            # Формируем команду для всех светодиодов
-            # Формат: "r1,g1,b1;r2,g2,b2;...;rN,gN,bN\n"
-            command_parts = []
-            for r, g, b in led_colors:
-                command_parts.append(f"{r},{g},{b}")
+            frame = np.clip(np.asarray(frame).reshape(-1, 3), 0, 255).astype(np.uint8)
+            frame = np.take(self.effects.lut, frame)
             
-            command = ";".join(command_parts) + "\n"
-            self.arduino.write(command.encode())
+            if self.protocol == "binary":
+                self._writer.submit(encode_frame(frame))
+            else:
+                # Формат: "r1,g1,b1;r2,g2,b2;...;rN,gN,bN\n"
+                self._writer.submit(encode_ascii_frame(frame))
             
         except Exception as e:
             print(f"[LIGHT] Ошибка отправки данных ленты: {e}")
 
+    def _send_led_strip_data(self, led_colors):
+        """Отправляет данные для всей ленты светодиодов"""
+        self.send_frame(led_colors)
+
     def start_breathing_effect(self):
         """Запуск эффекта дыхания"""
         if self.current_mode == "breathing":
@@ -701,46 +403,10 @@ class LightController:
         
         self._stop_all_effects()
         self.current_mode = "breathing"
-        self._breathing_running = True
-        self._breathing_thread = threading.Thread(target=self._breathing_effect, daemon=True)
-        self._breathing_thread.start()
+        self._run_engine_effect(BreathingEffect(self.NUM_LEDS))
+        self._remember_state()
         print("[LIGHT] Эффект дыхания запущен")
 
-    def _breathing_effect(self):
-        """Эффект дыхания"""
-        base_color = self.palettes.get(self.palette, [self.current_color])[0]
-        step = 0
-        last_color = self.current_color
-        
-        print(f"[BREATHING] Эффект дыхания с базовым цветом: {last_color}")
-        
-        while self._breathing_running and self.is_on and self.current_mode == "breathing":
-            try:
-                # Проверяем, не изменился ли цвет
-                if self.current_color != last_color:
-                    last_color = self.current_color
-                    base_color = self.palettes.get(self.palette, [self.current_color])[0]
-                    print(f"[BREATHING] Базовый цвет изменен на: {last_color}")
-                
-                # Синусоидальное изменение яркости
-                brightness_factor = (math.sin(step) + 1) / 2  # от 0 до 1
-                
-                r = int(base_color[0] * brightness_factor)
-                g = int(base_color[1] * brightness_factor)
-                b = int(base_color[2] * brightness_factor)
-                
-                self.send_color(r, g, b)
-                
-                step += 0.1
-                time.sleep(0.05)
-            except Exception as e:
-                print(f"[BREATHING] Ошибка в эффекте дыхания: {e}")
-                break
-        
-        print("[LIGHT] Эффект дыхания остановлен")
-
-    # Остальные методы остаются без изменений...
-
     def start_music_mode(self):
         """Запуск светомузыки"""
         if self.current_mode == "music":
@@ -749,22 +415,19 @@ class LightController:
         self._stop_all_effects()
         self.current_mode = "music"
         self.is_music_mode = True
-        
-        # Инициализируем атрибуты если их нет
-        if not hasattr(self, 'audio_interface'):
-            self.audio_interface = None
-        if not hasattr(self, 'audio_stream'):
-            self.audio_stream = None
+        self._music_filter.reset()
             
         self._start_audio_processing()
+        self._scheduler.set_effect("music", self._tick_music)
+        self._remember_state()
         print("[LIGHT] Режим светомузыки запущен")
 
     def stop_music_mode(self):
         """Остановка светомузыки"""
         self.is_music_mode = False
+        self._scheduler.clear_effect("music")
         
-        # Проверяем существование атрибутов перед использованием
-        if hasattr(self, 'audio_stream') and self.audio_stream:
+        if self.audio_stream:
             try:
                 self.audio_stream.stop_stream()
                 self.audio_stream.close()
@@ -772,7 +435,7 @@ class LightController:
             except Exception as e:
                 print(f"[LIGHT] Ошибка остановки audio stream: {e}")
         
-        if hasattr(self, 'audio_interface') and self.audio_interface:
+        if self.audio_interface:
             try:
                 self.audio_interface.terminate()
                 self.audio_interface = None
@@ -784,18 +447,15 @@ class LightController:
     def _start_audio_processing(self):
         """Запуск обработки аудио для светомузыки"""
         try:
+            # pyaudio нужен только светомузыке - не грузим его при старте
+            import pyaudio
+            
             self.audio_interface = pyaudio.PyAudio()
             
             def audio_callback(in_data, frame_count, time_info, status):
                 if self.is_music_mode:
-                    # Конвертируем аудиоданные в numpy array
-                    audio_data = np.frombuffer(in_data, dtype=np.int16)
-                    self.audio_data.append(np.mean(np.abs(audio_data)))
-                    
-                    # Анализ громкости и частот
-                    if len(self.audio_data) > 10:
-                        volume = np.mean(list(self.audio_data)[-10:])
-                        self._process_music_volume(volume)
+                    # Только спектр и удары - кадр считает планировщик эффектов
+                    self.spectrum.process(in_data)
                 
                 return (in_data, pyaudio.paContinue)
             
@@ -813,78 +473,168 @@ class LightController:
         except Exception as e:
             print(f"[LIGHT] Ошибка инициализации аудио: {e}")
 
-    def _process_music_volume(self, volume):
-        """Обработка громкости для светомузыки"""
-        # Нормализуем громкость
-        normalized_vol = min(1.0, volume / 10000.0)
-        
-        # Гамма-коррекция
-        gamma = 2.2
-        corrected_vol = normalized_vol ** (1/gamma)
-        
-        # Преобразуем в RGB на основе громкости и текущего цвета
-        base_r, base_g, base_b = self.current_color
-        
-        r = int(base_r * corrected_vol)
-        g = int(base_g * corrected_vol)
-        b = int(base_b * corrected_vol)
+    def _tick_music(self, now):
+        """Кадр светомузыки (вызывается планировщиком)"""
+        if not self.is_on or not self.spectrum.frames:
+            return
         
-        self.send_color(r, g, b)
+        if self.protocol == "binary":
+            # Каждый светодиод - своя полоса спектра: слева басы, справа высокие
+            frame = self.spectrum.render(self.effects.base, self._music_frame)
+            frame = self._music_filter.update(frame)
+            if frame is not None:
+                np.take(self.effects.lut, frame, out=frame)
+                self._writer.submit(encode_frame(frame))
+        else:
+            # Старая прошивка принимает один цвет - общий уровень и вспышки ударов
+            gain = self.spectrum.overall_gain()
+            base_r, base_g, base_b = self.current_color
+            color = self._music_filter.update((base_r * gain, base_g * gain, base_b * gain))
+            if color is not None:
+                r, g, b = color[0]
+                self.send_color(int(r), int(g), int(b))
 
     def start_monitor_checker(self):
         """Запуск умной подсветки на основе монитора"""
         if self.current_mode == "monitor":
             return
         
+        try:
+            from .monitor_checker import get_stable_color, get_edge_frame
+        except ImportError:
+            print("[LIGHT] Модуль monitor_checker не найден")
+            return
+        
         self._stop_all_effects()
         self.current_mode = "monitor"
-        self._monitor_running = True
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._monitor_thread.start()
+        self._get_screen_color = get_stable_color
+        self._get_edge_frame = get_edge_frame
+        self._monitor_filter.reset()
+        # Снимок экрана медленный - не чаще раза в 80 мс, как раньше
+        self._scheduler.set_effect("monitor", self._tick_monitor, interval=0.08)
+        self._remember_state()
         print("[LIGHT] Умная подсветка запущена")
 
-    def _monitor_loop(self):
-        """Цикл умной подсветки"""
-        try:
-            from .monitor_checker import get_stable_color
-            
-            last_r, last_g, last_b = 50, 50, 50
-            
-            while self._monitor_running and self.is_on and self.current_mode == "monitor":
-                try:
-                    r, g, b = get_stable_color()
-                    
-                    # Плавный переход
-                    smooth = 0.4
-                    r = int(last_r * (1-smooth) + r * smooth)
-                    g = int(last_g * (1-smooth) + g * smooth)
-                    b = int(last_b * (1-smooth) + b * smooth)
-                    
-                    last_r, last_g, last_b = r, g, b
-                    self.send_color(r, g, b)
-                    
-                    time.sleep(0.08)
-                    
-                except Exception as e:
-                    print(f"[MONITOR] Ошибка: {e}")
-                    time.sleep(1)
-            
-            print("[LIGHT] Умная подсветка остановлена")
-            
-        except ImportError:
-            print("[LIGHT] Модуль monitor_checker не найден")
+    def _tick_monitor(self, now):
+        """Кадр умной подсветки (вызывается планировщиком)"""
+        if not self.is_on:
+            return
+        
+        if self.protocol == "binary":
+            # Каждый светодиод повторяет цвет своего участка края экрана
+            edges = self._get_edge_frame()
+            if edges is not None and len(edges) == self.NUM_LEDS:
+                # Плавный переход для всей ленты сразу; None - изменение незаметно
+                frame = self._monitor_filter.update(edges)
+                if frame is not None:
+                    self.send_frame(frame)
+                return
+        
+        # Плавный переход
+        color = self._monitor_filter.update(self._get_screen_color())
+        if color is not None:
+            r, g, b = color[0]
+            self.send_color(int(r), int(g), int(b))
 
     def stop_monitor_checker(self):
         """Остановка умной подсветки"""
-        self._monitor_running = False
         if self.current_mode == "monitor":
+            self._scheduler.clear_effect("monitor")
             self.current_mode = "static"
+            self._remember_state()
             print("[LIGHT] Умная подсветка остановлена")
 
     def set_static_mode(self):
         """Вернуться к статичному свету"""
         self._stop_all_effects()
         self.current_mode = "static"
+        self.effects.set_effect(SolidEffect())
         if self.is_on:
             self.send_color(*self.current_color)
-        print("[LIGHT] Переключен в статичный режим")
\ No newline at end of file
+        self._remember_state()
+
+    # Сцены
+    def snapshot(self):
+        """Снимок состояния ленты (словарь, который можно сохранить в JSON)"""
+        return normalize_scene({
+            "is_on": self.is_on,
+            "mode": self.current_mode,
+            "palette": self.palette,
+            "color": self.current_color,
+            "brightness": self.brightness,
+        })
+
+    def _remember_state(self):
+        """Сохраняет текущее состояние как последнее (файл пишется отложенно, в фоне)"""
+        if self._applying_scene:
+            return
+        try:
+            self.scenes.remember(self.snapshot())
+        except Exception as e:
+            print(f"[LIGHT] Ошибка сохранения состояния: {e}")
+
+    def _scene_color(self, scene):
+        """Базовый цвет сцены: по имени цвета/палитры, иначе из поля color"""
+        palette = scene["palette"]
+        if palette in self.colors:
+            return self.colors[palette]
+        if palette in self.palettes:
+            return self.palettes[palette][0]
+        return scene["color"]
+
+    def apply_scene(self, scene, remember=True):
+        """Применяет сцену целиком.
+
+        Вместо цепочки включить -> цвет -> яркость -> режим состояние меняется
+        сразу, таблица яркости пересчитывается один раз, а на ленту уходит
+        один кадр (в режимах эффектов - первый кадр эффекта).
+        """
+        if isinstance(scene, str):
+            name, scene = scene, self.scenes.get(scene)
+            if scene is None:
+                print(f"[LIGHT] Сцена не найдена: {name}")
+                return False
+        scene = normalize_scene(scene)
+        
+        self._applying_scene = True
+        try:
+            self.is_on = scene["is_on"]
+            self.palette = scene["palette"]
+            self.current_color = self._scene_color(scene)
+            self.brightness = scene["brightness"]
+            self.effects.set_brightness(self.brightness)
+            self._reset_output_filters()
+            self._update_effect_colors()
+            
+            mode = scene["mode"]
+            if mode == "static":
+                self._stop_all_effects()
+                self.current_mode = "static"
+                self.effects.set_effect(SolidEffect())
+            elif mode != self.current_mode:
+                {
+                    "wave": self.start_wave_effect,
+                    "breathing": self.start_breathing_effect,
+                    "music": self.start_music_mode,
+                    "monitor": self.start_monitor_checker,
+                }[mode]()
+            
+            # Эффекты рисуют себя сами со следующего кадра планировщика
+            if not self.is_on:
+                self._writer.submit(self._encode_color(0, 0, 0))
+            elif self.current_mode == "static":
+                self.send_color(*self.current_color)
+        finally:
+            self._applying_scene = False
+        
+        if remember:
+            self._remember_state()
+        print(f"[LIGHT] Сцена применена: {self.current_mode}, {self.palette}, {self.brightness}%"
+              f"{'' if self.is_on else ' (свет выключен)'}")
+        return True
+
+    def save_scene(self, name):
+        """Сохраняет текущее состояние ленты как именованную сцену"""
+        self.scenes.save_preset(name, self.snapshot())
+        print(f"[LIGHT] Сцена сохранена: {name}")
+        return True
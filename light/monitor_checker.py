@@ -1,20 +1,25 @@
-import pyautogui
-import serial
 import time
-import numpy as np
+
+from .screen_capture import ScreenSampler, create_capture_backend
+
+# Общий сэмплер экрана: бэкенд (mss, если установлен, иначе pyautogui)
+# создается при первом обращении
+_sampler = None
+
+
+def get_screen_sampler():
+    """Получить глобальный сэмплер экрана"""
+    global _sampler
+    if _sampler is None:
+        _sampler = ScreenSampler(create_capture_backend())
+        print(f"[MONITOR] Захват экрана через {_sampler.backend.name}")
+    return _sampler
+
 
 def get_stable_color():
     try:
-        screenshot = pyautogui.screenshot()
-        pixels = np.array(screenshot)
-        
-        # Берем только центральную область
-        h, w = pixels.shape[:2]
-        center = pixels[h//3:2*h//3, w//3:2*w//3]
-        
-        # Усредняем цвет
-        avg_color = center.mean(axis=(0, 1))
-        r, g, b = int(avg_color[0]), int(avg_color[1]), int(avg_color[2])
+        # Снимаем только центральную область и усредняем каждый 8-й пиксель
+        r, g, b = get_screen_sampler().center_color()
         
         # Ограничиваем значения
         r = max(10, min(200, r))
@@ -28,6 +33,15 @@ def get_stable_color():
         # Возвращаем нейтральный цвет в случае ошибки
         return 128, 128, 128
 
+
+def get_edge_frame(out=None):
+    """Кадр ленты по краям экрана (лево/верх/право) или None при ошибке"""
+    try:
+        return get_screen_sampler().edge_frame(out)
+    except Exception as e:
+        print(f"[MONITOR] Ошибка захвата краев экрана: {e}")
+        return None
+
 # УБРАТЬ весь код, который выполняется сразу!
 # Оставить только функции
 
@@ -35,7 +49,9 @@ def get_stable_color():
 # можно добавить проверку:
 if __name__ == "__main__":
     # Этот код выполнится только если запустить файл напрямую
-    # python monitor_checker.py
+    # python -m light.monitor_checker
+    import serial
+    
     arduino = serial.Serial('COM11', 115200, timeout=0.1)
     time.sleep(2)
 
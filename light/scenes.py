@@ -0,0 +1,181 @@
+import json
+import os
+import tempfile
+import threading
+
+
+# Режимы, которые можно сохранить в сцене
+SCENE_MODES = ("static", "wave", "breathing", "music", "monitor")
+
+# Встроенные сцены. palette - имя цвета или палитры контроллера,
+# color - запасной цвет, если такого имени нет
+BUILTIN_SCENES = {
+    "вечер": {"is_on": True, "mode": "static", "palette": "ламповая", "color": (255, 200, 150), "brightness": 40},
+    "кино": {"is_on": True, "mode": "static", "palette": "бархатная", "color": (150, 100, 200), "brightness": 15},
+    "работа": {"is_on": True, "mode": "static", "palette": "белый", "color": (255, 255, 255), "brightness": 100},
+    "вечеринка": {"is_on": True, "mode": "music", "palette": "фиолетовый", "color": (255, 0, 255), "brightness": 100},
+    "ночь": {"is_on": True, "mode": "static", "palette": "оранжевый", "color": (255, 165, 0), "brightness": 5},
+}
+
+
+def normalize_scene(data):
+    """Проверяет сцену и приводит ее к виду {is_on, mode, palette, color, brightness}.
+
+    Неверные поля заменяются значениями по умолчанию, яркость и цвет
+    обрезаются до допустимых диапазонов. Если data не словарь - ValueError.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Сцена должна быть словарем, а не {type(data).__name__}")
+
+    mode = data.get("mode", "static")
+    if mode not in SCENE_MODES:
+        mode = "static"
+
+    try:
+        r, g, b = (max(0, min(255, int(c))) for c in data.get("color", (255, 255, 255)))
+    except (TypeError, ValueError):
+        r, g, b = 255, 255, 255
+
+    try:
+        brightness = max(0, min(100, int(data.get("brightness", 100))))
+    except (TypeError, ValueError):
+        brightness = 100
+
+    palette = data.get("palette", "white")
+    if not isinstance(palette, str):
+        palette = "white"
+
+    return {
+        "is_on": bool(data.get("is_on", True)),
+        "mode": mode,
+        "palette": palette,
+        "color": (r, g, b),
+        "brightness": brightness,
+    }
+
+
+class SceneStore:
+    """Сцены света на диске: последнее состояние ленты и именованные пресеты.
+
+    Файл переписывается атомарно (временный файл + os.replace), поэтому
+    выключение компьютера посреди записи не оставляет испорченный JSON.
+
+    Последнее состояние меняется после каждой команды света, поэтому оно
+    пишется отложенно в фоновом таймере - не чаще раза в save_delay секунд,
+    несколько изменений подряд дают одну запись. flush() записывает его
+    сразу (при выходе). Пресеты сохраняются на диск немедленно.
+    """
+
+    def __init__(self, path="cache/light_scenes.json", builtin=None, save_delay=3.0):
+        self.path = path
+        self.builtin = dict(BUILTIN_SCENES if builtin is None else builtin)
+        self.save_delay = save_delay
+        self.saves = 0
+
+        self._lock = threading.Lock()
+        self._last = None
+        self._presets = {}
+        self._dirty = False
+        self._timer = None
+        self._load()
+
+    def _load(self):
+        """Читает файл сцен. Испорченные записи пропускаются"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[LIGHT] Не удалось прочитать сцены {self.path}: {e}")
+            return
+
+        try:
+            if data.get("last") is not None:
+                self._last = normalize_scene(data["last"])
+            for name, scene in data.get("presets", {}).items():
+                self._presets[name] = normalize_scene(scene)
+        except (AttributeError, ValueError) as e:
+            print(f"[LIGHT] Ошибка в файле сцен {self.path}: {e}")
+
+    def _save(self):
+        """Атомарная запись файла (вызывается под блокировкой)"""
+        data = {
+            "last": self._last,
+            "presets": self._presets,
+        }
+        folder = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".scenes-", suffix=".tmp", dir=folder)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.saves += 1
+            self._dirty = False
+        except Exception as e:
+            print(f"[LIGHT] Не удалось сохранить сцены {self.path}: {e}")
+
+    @property
+    def last(self):
+        """Последнее сохраненное состояние ленты или None"""
+        return dict(self._last) if self._last else None
+
+    def remember(self, scene):
+        """Запоминает текущее состояние ленты. True - состояние изменилось.
+
+        Файл записывается позже, в таймере (save_delay <= 0 - сразу).
+        """
+        scene = normalize_scene(scene)
+        with self._lock:
+            if scene == self._last:
+                return False
+            self._last = scene
+            self._dirty = True
+            if self.save_delay <= 0:
+                self._save()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+
+    def flush(self):
+        """Сразу записывает отложенное последнее состояние, если оно есть"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save()
+
+    def save_preset(self, name, scene):
+        """Сохраняет пользовательский пресет (перекрывает встроенный с тем же именем)"""
+        with self._lock:
+            self._presets[name] = normalize_scene(scene)
+            self._save()
+
+    def delete_preset(self, name):
+        """Удаляет пользовательский пресет. True - пресет был"""
+        with self._lock:
+            if self._presets.pop(name, None) is None:
+                return False
+            self._save()
+        return True
+
+    def get(self, name):
+        """Сцена по имени: сначала пользовательские пресеты, потом встроенные"""
+        scene = self._presets.get(name)
+        if scene is None and name in self.builtin:
+            scene = normalize_scene(self.builtin[name])
+        return dict(scene) if scene else None
+
+    def names(self):
+        """Имена всех доступных сцен"""
+        return sorted(set(self.builtin) | set(self._presets))
@@ -0,0 +1,190 @@
+import numpy as np
+
+
+class PyAutoGuiCapture:
+    """Захват через pyautogui (PIL). Медленный, но есть везде"""
+
+    name = "pyautogui"
+    channels = "RGB"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    @property
+    def size(self):
+        width, height = self._pyautogui.size()
+        return width, height
+
+    def grab(self, region):
+        """region = (left, top, width, height) -> массив H x W x 3"""
+        return np.asarray(self._pyautogui.screenshot(region=region))
+
+
+class MssCapture:
+    """Быстрый захват через mss (XShm на Linux, BitBlt на Windows, без PIL)"""
+
+    name = "mss"
+    channels = "BGRA"
+
+    def __init__(self, monitor=1):
+        import mss
+        self._mss = mss
+        self._monitor_index = monitor
+        self._sct = None
+
+    def _instance(self):
+        # Экземпляр mss создается в том потоке, который снимает экран (требование Windows)
+        if self._sct is None:
+            self._sct = self._mss.mss()
+        return self._sct
+
+    @property
+    def size(self):
+        monitor = self._instance().monitors[self._monitor_index]
+        return monitor["width"], monitor["height"]
+
+    def grab(self, region):
+        monitor = self._instance().monitors[self._monitor_index]
+        left, top, width, height = region
+        shot = self._instance().grab({
+            "left": monitor["left"] + left, "top": monitor["top"] + top,
+            "width": width, "height": height,
+        })
+        return np.asarray(shot)
+
+
+class SyntheticCapture:
+    """Захват из заданной картинки (для проверок и бенчмарков без экрана).
+
+    image - массив H x W x 3 (RGB) или функция без аргументов, возвращающая
+    такой массив (например, меняющийся кадр). Регион копируется, как при
+    настоящем захвате.
+    """
+
+    name = "synthetic"
+    channels = "RGB"
+
+    def __init__(self, image):
+        self._source = image
+
+    def _image(self):
+        return self._source() if callable(self._source) else self._source
+
+    @property
+    def size(self):
+        height, width = self._image().shape[:2]
+        return width, height
+
+    def grab(self, region):
+        left, top, width, height = region
+        return self._image()[top:top + height, left:left + width].copy()
+
+
+def create_capture_backend(name="auto"):
+    """Создает бэкенд захвата: "mss", "pyautogui" или "auto" (mss, если установлен)"""
+    if name in ("auto", "mss"):
+        try:
+            return MssCapture()
+        except ImportError:
+            if name == "mss":
+                raise
+    return PyAutoGuiCapture()
+
+
+class ScreenSampler:
+    """Цвета экрана для подсветки без копирования всего кадра.
+
+    Снимается только нужный регион (центр или полосы по краям), затем
+    берется каждый step-й пиксель по обеим осям, и лишь после этого
+    считается среднее. Для краев экрана полосы делятся на сегменты - по
+    одному на светодиод - и усредняются одним np.add.reduceat.
+    """
+
+    # Порядок светодиодов: левый край снизу вверх, верх слева направо, правый край сверху вниз
+    DEFAULT_LAYOUT = (("left", 15), ("top", 30), ("right", 15))
+
+    def __init__(self, backend, step=8, border=0.15, layout=DEFAULT_LAYOUT):
+        self.backend = backend
+        self.step = step
+        self.border = border
+        self.layout = tuple(layout)
+        self.num_leds = sum(count for _, count in self.layout)
+        self._screen_size = None
+
+    @property
+    def screen_size(self):
+        if self._screen_size is None:
+            self._screen_size = self.backend.size
+        return self._screen_size
+
+    def _to_rgb(self, color):
+        """Средний цвет из порядка каналов бэкенда в RGB"""
+        if self.backend.channels == "BGRA":
+            return color[..., 2::-1]
+        return color[..., :3]
+
+    def _subsample(self, region):
+        pixels = self.backend.grab(region)
+        return pixels[::self.step, ::self.step, :3]
+
+    def center_color(self):
+        """Средний цвет центральной трети экрана (R, G, B)"""
+        width, height = self.screen_size
+        region = (width // 3, height // 3, width // 3, height // 3)
+        mean = self._subsample(region).mean(axis=(0, 1))
+        return tuple(int(v) for v in self._to_rgb(mean))
+
+    def _zone_region(self, zone):
+        width, height = self.screen_size
+        band_x = max(1, int(width * self.border))
+        band_y = max(1, int(height * self.border))
+        if zone == "left":
+            return (0, 0, band_x, height)
+        if zone == "right":
+            return (width - band_x, 0, band_x, height)
+        if zone == "top":
+            return (0, 0, width, band_y)
+        if zone == "bottom":
+            return (0, height - band_y, width, band_y)
+        raise ValueError(f"Неизвестная зона экрана: {zone}")
+
+    def _zone_segments(self, zone, count):
+        """Цвета count сегментов вдоль края (массив count x 3, RGB)"""
+        pixels = self._subsample(self._zone_region(zone)).astype(np.float32)
+
+        # Сворачиваем полосу поперек края, остается линия вдоль края
+        vertical = zone in ("left", "right")
+        line = pixels.mean(axis=1 if vertical else 0)
+
+        # Делим линию на count сегментов и усредняем каждый
+        length = len(line)
+        count = min(count, length)
+        starts = (np.arange(count) * length) // count
+        sizes = np.diff(np.append(starts, length))
+        segments = np.add.reduceat(line, starts, axis=0) / sizes[:, None]
+
+        if zone == "left" or zone == "bottom":
+            segments = segments[::-1]
+        return self._to_rgb(segments)
+
+    def zone_colors(self):
+        """Средний цвет каждой зоны раскладки: {"left": (r, g, b), ...}"""
+        return {
+            zone: tuple(int(v) for v in self._zone_segments(zone, 1)[0])
+            for zone, _ in self.layout
+        }
+
+    def edge_frame(self, out=None):
+        """Кадр ленты по краям экрана (num_leds x 3 uint8) по раскладке layout"""
+        if out is None:
+            out = np.zeros((self.num_leds, 3), dtype=np.uint8)
+        position = 0
+        for zone, count in self.layout:
+            segments = self._zone_segments(zone, count)
+            if len(segments) < count:
+                # Полоса короче числа светодиодов - растягиваем сегменты
+                segments = segments[np.arange(count) * len(segments) // count]
+            out[position:position + count] = segments
+            position += count
+        return out
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import serial
+
+
+class SerialConnection:
+    """Постоянное подключение к Arduino с переподключением в фоне.
+
+    Порт открывается в отдельном потоке: после открытия Arduino
+    перезагружается, и ждать ~2 с приходится только этому потоку.
+    Открытый порт передается в SerialWriter; пока соединения нет,
+    команды копятся в его почтовом ящике (остается только последняя).
+    При ошибке записи соединение помечается потерянным и открывается
+    заново с экспоненциальной задержкой между попытками.
+    """
+
+    def __init__(self, port, baudrate, writer, reset_delay=2.0, min_backoff=0.5, max_backoff=10.0,
+                 on_connect=None, serial_factory=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.writer = writer
+        self.reset_delay = reset_delay
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.on_connect = on_connect
+        self.serial_factory = serial_factory or (lambda: serial.Serial(self.port, self.baudrate, timeout=0.1))
+
+        self.serial = None
+        self.connects = 0
+        self.failures = 0
+
+        self._lost = threading.Event()
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Ошибка записи в потоке SerialWriter означает потерю соединения
+        self.writer.on_error = self.mark_lost
+
+    @property
+    def is_connected(self):
+        return self._connected.is_set()
+
+    def start(self):
+        """Запускает фоновое подключение. Не блокирует"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="light-serial-connection", daemon=True)
+        self._thread.start()
+
+    def wait_connected(self, timeout=None):
+        """Ждет подключения. True - порт открыт"""
+        return self._connected.wait(timeout)
+
+    def mark_lost(self, error=None):
+        """Соединение потеряно (вызывается из потока записи)"""
+        self._connected.clear()
+        self._lost.set()
+
+    def _run(self):
+        backoff = self.min_backoff
+        while not self._stop.is_set():
+            try:
+                print(f"[LIGHT] Подключаюсь к Arduino на {self.port}...")
+                handle = self.serial_factory()
+            except Exception as e:
+                self.failures += 1
+                print(f"[LIGHT] Ошибка подключения к Arduino: {e} (повтор через {backoff:.1f} с)")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            # Arduino перезагружается при открытии порта - ждем здесь, а не в вызывающем коде
+            if self._stop.wait(self.reset_delay):
+                handle.close()
+                break
+
+            self.serial = handle
+            self._lost.clear()
+            self.writer.set_port(handle)
+            self._connected.set()
+            self.connects += 1
+            backoff = self.min_backoff
+            print(f"[LIGHT] Успешно подключено к Arduino на {self.port}")
+
+            if self.on_connect:
+                try:
+                    self.on_connect(self.connects == 1)
+                except Exception as e:
+                    print(f"[LIGHT] Ошибка обработчика подключения: {e}")
+
+            # Ждем потери соединения или остановки
+            while not self._stop.is_set() and not self._lost.wait(0.5):
+                pass
+
+            self._connected.clear()
+            self.writer.set_port(None)
+            self.serial = None
+            try:
+                handle.close()
+            except Exception:
+                pass
+            if not self._stop.is_set():
+                print("[LIGHT] Соединение с Arduino потеряно, переподключаюсь...")
+
+    def close(self, timeout=1.0):
+        """Останавливает переподключение и закрывает порт"""
+        self._stop.set()
+        self._lost.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
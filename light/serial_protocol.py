@@ -0,0 +1,91 @@
+import struct
+import numpy as np
+
+# Бинарный протокол ленты:
+#   AA 55 | тип (1 байт) | число светодиодов (uint16 LE) | RGB * N | контрольная сумма
+# Контрольная сумма - младший байт суммы всех байт после AA 55.
+FRAME_MAGIC = b"\xAA\x55"
+FRAME_LEDS = 0x01   # Отдельный цвет для каждого светодиода
+FRAME_FILL = 0x02   # Один цвет на всю ленту (N = 1)
+
+HEADER_SIZE = 5
+MAX_LEDS = 1024
+
+
+def _checksum(header_tail, payload):
+    return (sum(header_tail) + int(payload.sum(dtype=np.uint32))) & 0xFF
+
+
+def encode_frame(frame):
+    """Кадр ленты (массив N x 3 uint8) → бинарный пакет"""
+    payload = np.ascontiguousarray(frame, dtype=np.uint8).reshape(-1)
+    count = len(payload) // 3
+    header_tail = struct.pack("<BH", FRAME_LEDS, count)
+    return FRAME_MAGIC + header_tail + payload.tobytes() + bytes((_checksum(header_tail, payload),))
+
+
+def encode_fill(r, g, b):
+    """Один цвет на всю ленту → бинарный пакет"""
+    payload = np.array((r, g, b), dtype=np.uint8)
+    header_tail = struct.pack("<BH", FRAME_FILL, 1)
+    return FRAME_MAGIC + header_tail + payload.tobytes() + bytes((_checksum(header_tail, payload),))
+
+
+def encode_ascii_frame(frame):
+    """Кадр ленты в старом текстовом формате "r,g,b;r,g,b;...\\n" (для сравнения)"""
+    return (";".join(f"{r},{g},{b}" for r, g, b in np.asarray(frame, dtype=np.uint8).tolist()) + "\n").encode()
+
+
+class FrameDecoder:
+    """Эталонный декодер бинарных пакетов (то же, что делает прошивка).
+
+    Принимает поток байт кусками, находит пакеты по сигнатуре AA 55 и
+    проверяет контрольную сумму. Поврежденные пакеты отбрасываются.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames = 0
+        self.checksum_errors = 0
+        self.skipped_bytes = 0
+
+    def feed(self, data):
+        """Добавляет байты. Возвращает список (тип, массив N x 3 uint8)"""
+        self._buffer += data
+        out = []
+
+        while True:
+            start = self._buffer.find(FRAME_MAGIC)
+            if start < 0:
+                # Оставляем последний байт - он может быть началом сигнатуры
+                keep = 1 if self._buffer[-1:] == FRAME_MAGIC[:1] else 0
+                self.skipped_bytes += len(self._buffer) - keep
+                del self._buffer[:len(self._buffer) - keep]
+                return out
+            if start:
+                self.skipped_bytes += start
+                del self._buffer[:start]
+
+            if len(self._buffer) < HEADER_SIZE:
+                return out
+
+            frame_type, count = struct.unpack_from("<BH", self._buffer, 2)
+            if frame_type not in (FRAME_LEDS, FRAME_FILL) or count > MAX_LEDS:
+                # Ложная сигнатура - ищем дальше
+                del self._buffer[:1]
+                self.skipped_bytes += 1
+                continue
+
+            size = HEADER_SIZE + count * 3 + 1
+            if len(self._buffer) < size:
+                return out
+
+            payload = np.frombuffer(bytes(self._buffer[HEADER_SIZE:size - 1]), dtype=np.uint8)
+            if _checksum(self._buffer[2:HEADER_SIZE], payload) != self._buffer[size - 1]:
+                self.checksum_errors += 1
+                del self._buffer[:1]
+                continue
+
+            del self._buffer[:size]
+            self.frames += 1
+            out.append((frame_type, payload.reshape(count, 3)))
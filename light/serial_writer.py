@@ -0,0 +1,132 @@
+import threading
+import time
+
+
+class SerialWriter:
+    """Единственный поток, который пишет в serial-порт ленты.
+
+    Эффекты, светомузыка и голосовые команды только кладут готовый пакет
+    в почтовый ящик на одно значение. Если поток записи еще не успел
+    отправить предыдущий пакет, тот просто заменяется новым (в очередь
+    ничего не копится - лента всегда получает самое свежее состояние).
+    Частота записи ограничена max_fps, задержка от submit() до конца
+    записи и число отброшенных кадров собираются в stats().
+    """
+
+    def __init__(self, port=None, max_fps=60, on_error=None):
+        self.max_fps = max_fps
+        self.on_error = on_error
+
+        self._port = port
+        self._min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._condition = threading.Condition()
+        self._packet = None
+        self._submitted_at = 0.0
+        self._busy = False
+        self._last_write = 0.0
+        self._running = True
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.bytes_written = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._last_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="light-serial-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self):
+        return self._port
+
+    def set_port(self, port):
+        """Подключает (или отключает при None) открытый serial-порт"""
+        with self._condition:
+            self._port = port
+            self._condition.notify_all()
+
+    def submit(self, packet):
+        """Кладет пакет в почтовый ящик. Никогда не блокирует"""
+        with self._condition:
+            if self._packet is not None:
+                self.dropped += 1
+            self._packet = packet
+            self._submitted_at = time.perf_counter()
+            self._condition.notify_all()
+
+    def flush(self, timeout=1.0):
+        """Ждет, пока последний пакет будет записан. True - записан"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._packet is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._port is None:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and (self._packet is None or self._port is None):
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                # Соблюдаем максимальную частоту кадров. Пока ждем,
+                # пакет в ящике может смениться на более свежий
+                wait = self._last_write + self._min_interval - time.perf_counter()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                packet, submitted_at, port = self._packet, self._submitted_at, self._port
+                self._packet = None
+                self._busy = True
+
+            try:
+                self._last_write = time.perf_counter()
+                port.write(packet)
+                finished = time.perf_counter()
+                self._record(len(packet), finished - submitted_at)
+            except Exception as e:
+                self.errors += 1
+                print(f"[LIGHT] Ошибка записи в порт: {e}")
+                with self._condition:
+                    if self._port is port:
+                        self._port = None
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _record(self, size, latency):
+        self.written += 1
+        self.bytes_written += size
+        self._last_latency = latency
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
+
+    def stats(self):
+        """Счетчики записи: кадры, отброшенные кадры, задержка в мс"""
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "bytes": self.bytes_written,
+            "latency_avg_ms": self._latency_total / self.written * 1000 if self.written else 0.0,
+            "latency_max_ms": self._latency_max * 1000,
+            "latency_last_ms": self._last_latency * 1000,
+        }
+
+    def close(self, timeout=1.0):
+        """Дописывает последний пакет и останавливает поток"""
+        self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
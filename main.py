@@ -1,42 +1,85 @@
 # main.py (исправленная версия)
-import json
-import pyaudio
 from vosk import Model, KaldiRecognizer
-from fuzzywuzzy import fuzz
-from Gelya_voice import GelyaSpeach
-from commands_checker import SmartCommandHandler
+from Gelya_voice import get_tts_service
+from commands_checker import SmartCommandHandler, BackgroundStartup
 import asyncio
 from angelina.config.config import BOT_TOKEN
 from bot_module import YouTubeBot
 import threading
 import time
+import json
+from voice_input import SpeechPipeline, MicrophoneSource, VADGate, WakeWordSpotter, PartialCommandTracker
 
-# Импортируем и инициализируем плеер ДО создания ассистента
+# Плеер создается в фоне (_initialize_player), модуль pygame грузится только там
 from player import set_player_instance
 from config.config import PLAYLISTS_PATH
-from player.player import MusicPlayer
+
+GREETING = "Привет! Я ангелина, твой голосовой помошник"
+
+# Ответы, которые звучат постоянно - озвучиваются в кэш заранее
+COMMON_PHRASES = [GREETING, "Извини, не поняла", "Ошибка"]
 
 class AngelinaAssistient:
     
     def __init__(self):
-        self.gelya = GelyaSpeach()
-        
-        # Инициализируем плеер перед созданием command_handler
-        self._initialize_player()
+        # Голосовой движок, свет и плеер грузятся параллельно в фоне,
+        # их команды ждут готовности в очередях своих доменов
+        self.tts = get_tts_service()
+        self.startup = BackgroundStartup()
+        self.startup.start("tts", self._initialize_tts)
+        self.startup.start("light", self._initialize_light)
+        self.startup.start("player", self._initialize_player)
         
         # Используем новый SmartCommandHandler с Ollama
-        self.command_handler = SmartCommandHandler(ollama_model="llama3")
+        self.command_handler = SmartCommandHandler(ollama_model="llama3", startup=self.startup)
 
+        # Короткие команды выполняются по промежуточной гипотезе, не дожидаясь конца фразы
+        self.partial_tracker = PartialCommandTracker(
+            self.command_handler.match_fast,
+            self.command_handler.execute_result
+        )
+        
         self.model = Model('vosk-model-small-ru-0.22')
-        self.rec = KaldiRecognizer(self.model, 16000)
-        self.p = pyaudio.PyAudio()
-        self.stream = self.p.open(format=pyaudio.paInt16, channels=1, rate=16000, input=True, frames_per_buffer=8000)
-        self.stream.start_stream()
+        # Захват с микрофона и распознавание работают в отдельных потоках
+        self.speech = SpeechPipeline(
+            MicrophoneSource(rate=16000, frames_per_buffer=8000),
+            lambda rate: KaldiRecognizer(self.model, rate),
+            chunk_frames=4000,
+            vad=VADGate(sample_rate=16000, chunk_frames=4000),
+            # Полное распознавание включается только после "геля" / "ангелина"
+            wake_word=WakeWordSpotter.from_model(self.model, 16000, ("геля", "ангелина")),
+            on_partial=self.partial_tracker.on_partial,
+            # Пока Геля говорит, микрофон слышит ее саму - такой звук не распознаем
+            mute=lambda: self.tts.is_speaking
+        )
+        self.speech.start()
+        print(f"[STARTUP] Микрофон слушает через {time.perf_counter() - self.startup.started:.2f} с от старта")
+
+    def _initialize_tts(self):
+        """Загружает голосовую модель"""
+        if not self.tts.warm_up():
+            raise RuntimeError("голосовая модель не загружена")
+        self.tts.prewarm(self._common_phrases())
+
+    def _common_phrases(self):
+        """Частые фразы: приветствие, ошибки и короткие подтверждения команд"""
+        try:
+            with open('responses.json', 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+        except FileNotFoundError:
+            responses = {"positive_responses": ["хорошо", "сделано"]}
+        return COMMON_PHRASES + list(responses.get("positive_responses", []))
+
+    def _initialize_light(self):
+        """Создает контроллер света (порт Arduino открывается уже в его потоке)"""
+        from commands_checker.domains.light import get_light_controller
+        get_light_controller()
 
     def _initialize_player(self):
         """Инициализирует глобальный экземпляр плеера"""
         try:
             from player import get_player_instance
+            from player.player import MusicPlayer
             if get_player_instance() is None:
                 player_instance = MusicPlayer(f"{PLAYLISTS_PATH}/всякое")
                 set_player_instance(player_instance)
@@ -48,25 +91,44 @@ class AngelinaAssistient:
 
     def listen(self):
         try:
-            while True:
-                data = self.stream.read(4000, exception_on_overflow=False)  
-                if self.rec.AcceptWaveform(data) and len(data) > 0:
-                    answer = json.loads(self.rec.Result())
-                    if answer['text']:
-                        yield answer['text']
+            for text in self.speech.results():
+                yield text
         except Exception as e:
             print(f"[CRITICAL] Ошибка в loop: {e}")
+        finally:
+            stats = self.speech.stats()
+            if stats["buffer_overflows"] or stats["input_overflows"]:
+                print(f"[AUDIO] Потери звука: {stats}")
+
+    def _restart_speech(self):
+        """Источник звука закончился (микрофон отключен, ошибка чтения) - переоткрываем с паузой"""
+        delay = 1.0
+        while True:
+            print(f"[AUDIO] Микрофон недоступен, переподключение через {delay:.0f} с")
+            time.sleep(delay)
+            try:
+                self.speech.restart()
+                print("[AUDIO] Микрофон снова слушает")
+                return
+            except Exception as e:
+                print(f"[AUDIO] Не удалось открыть микрофон: {e}")
+                delay = min(delay * 2, 30.0)
 
     def angelina(self):
-        self.gelya.speach("Привет! Я ангелина, твой голосовой помошник")
+        # Приветствие прозвучит, когда загрузится голос - слушать можно уже сейчас
+        self.tts.submit(GREETING)
         while True:
+            if self.speech.finished:
+                self._restart_speech()
             for text in self.listen():
-                print(f"You say: {text}")
-                if fuzz.ratio(text.split()[0], "геля") > 45 or fuzz.ratio(text.split()[0], "ангелина") > 45:
-                    my_text = text.split()[1:]
-                    my_say = " ".join(my_text).strip()
-                    print("log:", my_say)
-                    self.command_handler.process_command(my_say)
+                # Слово-обращение уже услышано и убрано детектором - здесь только команда
+                my_say = text.strip()
+                print(f"You say: {my_say}")
+                handled, executed = self.partial_tracker.consume_final(my_say)
+                if handled:
+                    continue
+                if my_say:
+                    self.command_handler.process_command(my_say, dispatched=executed)
 
 async def start_bot():
     try:
@@ -1,14 +1,25 @@
 # player.py
-import pygame
 import os
 import random
 import time
 import traceback
 import threading
 
+# pygame импортируется при создании плеера, а не при импорте модуля
+pygame = None
+
+
+def _load_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as module
+        pygame = module
+    return pygame
+
 
 class MusicPlayer:
     def __init__(self, music_folder):
+        _load_pygame()
         pygame.mixer.init()
         self.music_folder = music_folder
         self.tracklist = self.load_tracks()
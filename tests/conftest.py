@@ -0,0 +1,78 @@
+# tests/conftest.py
+import pytest
+
+from light import light_controller
+from light.effect_scheduler import EffectScheduler
+
+
+# Контроллер света без порта и потоков: пакеты перехватываем вместо записи,
+# кадры эффектов тест вызывает сам через планировщик
+
+class RecordingWriter:
+    def __init__(self, *args, **kwargs):
+        self.packets = []
+        self.on_error = None
+        self.closed = False
+
+    def submit(self, packet):
+        self.packets.append(packet)
+
+    def set_port(self, port):
+        pass
+
+    def flush(self, timeout=1.0):
+        return True
+
+    def close(self, timeout=1.0):
+        self.closed = True
+
+    def stats(self):
+        return {"written": len(self.packets)}
+
+
+class IdleConnection:
+    is_connected = False
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+
+    def start(self):
+        pass
+
+    def close(self, timeout=1.0):
+        self.closed = True
+
+
+class ManualScheduler(EffectScheduler):
+    def start(self):
+        pass  # Кадры вызывает тест через step(now)
+
+
+@pytest.fixture
+def make_controller(monkeypatch, tmp_path):
+    """Фабрика контроллеров без порта и потоков; все закрываются после теста"""
+    monkeypatch.setattr(light_controller, "SerialWriter", RecordingWriter)
+    monkeypatch.setattr(light_controller, "SerialConnection", IdleConnection)
+    monkeypatch.setattr(light_controller, "EffectScheduler", ManualScheduler)
+    monkeypatch.setattr(light_controller.LightController, "_start_audio_processing", lambda self: None)
+    created = []
+
+    def make(**kwargs):
+        kwargs.setdefault("protocol", "binary")
+        kwargs.setdefault("restore_state", False)
+        kwargs.setdefault("scenes_path", str(tmp_path / "scenes.json"))
+        controller = light_controller.LightController(**kwargs)
+        created.append(controller)
+        return controller
+
+    yield make
+    for controller in created:
+        controller.close_connection()
+
+
+@pytest.fixture
+def controller(make_controller):
+    controller = make_controller(gamma=1.0)
+    controller.turn_on()
+    controller.set_color("красный")
+    return controller
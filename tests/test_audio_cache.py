@@ -0,0 +1,91 @@
+# tests/test_audio_cache.py
+import os
+
+import numpy as np
+import pytest
+
+from Gelya_voice import TTSService
+from Gelya_voice.audio_cache import AudioCache
+
+SAMPLES = 1000  # 4000 байт float32 на фразу
+SAMPLE_RATE = 40000
+
+
+class CountingBackend:
+    """Движок синтеза в память: сигнал зависит от текста, вызовы считаются"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, pitch, index_rate):
+        self.calls.append(text)
+        samples = np.full(SAMPLES, (len(text) % 100) / 100.0, dtype=np.float32)
+        return samples, SAMPLE_RATE
+
+
+@pytest.fixture
+def backend():
+    return CountingBackend()
+
+
+@pytest.fixture
+def make_service(tmp_path, backend):
+    def make(max_memory_bytes=64 * 1024 * 1024, max_disk_bytes=512 * 1024 * 1024):
+        cache = AudioCache(str(tmp_path / "tts_audio"), max_memory_bytes=max_memory_bytes,
+                           max_disk_bytes=max_disk_bytes)
+        return TTSService(device="cpu", backend_factory=lambda *args: backend, cache=cache)
+    return make
+
+
+def test_cache_hit_does_no_synthesis(make_service, backend):
+    service = make_service()
+    first = service.render("Свет включен")
+    second = service.render("  Свет   включен ")
+    assert backend.calls == ["Свет включен"]
+    np.testing.assert_array_equal(first[0], second[0])
+    assert second[1] == SAMPLE_RATE
+    assert service.cache.stats()["memory_hits"] == 1
+
+
+def test_voice_parameters_are_part_of_the_key(make_service, backend):
+    service = make_service()
+    service.render("Привет")
+    service.pitch += 1
+    service.render("Привет")
+    assert len(backend.calls) == 2
+
+
+def test_memory_lru_spills_to_disk_and_reloads(make_service, backend):
+    # В память помещаются две фразы
+    service = make_service(max_memory_bytes=2 * SAMPLES * 4)
+    for text in ("один", "два", "три"):
+        service.render(text)
+    stats = service.cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["disk_entries"] == 3
+
+    # Вытесненная фраза читается с диска без синтеза
+    samples, samplerate = service.render("один")
+    assert backend.calls == ["один", "два", "три"]
+    assert samplerate == SAMPLE_RATE and len(samples) == SAMPLES
+    assert service.cache.stats()["disk_hits"] == 1
+
+
+def test_disk_cache_survives_restart(make_service, backend):
+    make_service().render("Доброе утро")
+    service = make_service()
+    service.render("Доброе утро")
+    assert backend.calls == ["Доброе утро"]
+    assert service.cache.stats()["disk_hits"] == 1
+
+
+def test_disk_size_is_capped(make_service, tmp_path):
+    service = make_service(max_memory_bytes=0, max_disk_bytes=1)
+    for text in ("один", "два", "три"):
+        service.render(text)
+    # Остается только самая свежая запись
+    files = [name for name in os.listdir(tmp_path / "tts_audio") if name.endswith(".npz")]
+    assert len(files) == 1
+    assert service.cache.stats()["disk_entries"] == 1
+    assert files[0][:-4] == service.cache_key("три")
@@ -0,0 +1,141 @@
+# tests/test_audio_output.py
+import numpy as np
+import pytest
+
+from Gelya_voice.audio_output import AudioOutput
+from Gelya_voice.tts_service import split_phrases
+
+SAMPLE_RATE = 1000
+FADE = 10  # crossfade 10 мс при 1000 Гц
+
+
+class FakeStream:
+    """Имитация устройства: колбэк вызывает тест, забирая блоки нужного размера"""
+
+    def __init__(self, samplerate, channels, blocksize, callback):
+        self.callback = callback
+        self.started = False
+        self.closed = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, frames):
+        outdata = np.full((frames, 1), np.nan, dtype=np.float32)
+        self.callback(outdata, frames, None, None)
+        return outdata[:, 0]
+
+
+@pytest.fixture
+def output():
+    streams = []
+
+    def factory(*args):
+        streams.append(FakeStream(*args))
+        return streams[-1]
+
+    output = AudioOutput(blocksize=64, crossfade_ms=10, stream_factory=factory)
+    output.streams = streams
+    yield output
+    output.close()
+
+
+def ones(length):
+    return np.ones(length, dtype=np.float32)
+
+
+def test_chunks_are_joined_with_crossfade(output):
+    output.expect_more(True)
+    output.play(ones(100), SAMPLE_RATE)
+    output.play(ones(100), SAMPLE_RATE)
+    output.expect_more(False)
+    stream = output.streams[0]
+
+    audio = stream.pull(200)
+    # Начало второго куска наложено на хвост первого: звука на FADE меньше
+    assert not audio[190:].any()
+    played = audio[:190]
+    # Нарастание в начале, затухание в конце, а на стыке громкость не проседает
+    assert played[0] == pytest.approx(0.0) and played[-1] == pytest.approx(0.0)
+    np.testing.assert_allclose(played[FADE:-FADE], 1.0, atol=1e-5)
+    assert output.gaps == 0
+    assert output.opens == 1
+
+
+def test_late_chunk_counts_a_gap_and_fades_in(output):
+    output.expect_more(True)
+    output.play(ones(50), SAMPLE_RATE)
+    stream = output.streams[0]
+    stream.pull(64)
+    assert output.gaps == 1
+
+    # Следующий кусок пришел после разрыва - начинается с нарастания, а не щелчка
+    output.play(ones(50), SAMPLE_RATE)
+    audio = stream.pull(50)
+    assert audio[0] == pytest.approx(0.0)
+    assert audio[FADE:-FADE].min() == pytest.approx(1.0)
+
+    # Фраза закончилась - тишина больше не считается разрывом
+    output.expect_more(False)
+    stream.pull(64)
+    assert output.gaps == 1
+
+
+def test_wait_returns_after_queue_is_played(output):
+    assert output.wait(0)
+    output.play(ones(100), SAMPLE_RATE)
+    assert not output.wait(0)
+
+    stream = output.streams[0]
+    stream.pull(64)
+    assert not output.wait(0)
+    stream.pull(64)
+    assert output.wait(0)
+    assert output.first_audio is not None
+
+
+def test_stop_drops_unplayed_audio(output):
+    output.play(ones(100), SAMPLE_RATE)
+    output.stop()
+    assert output.wait(0)
+    assert not output.streams[0].pull(64).any()
+
+
+def test_samplerate_change_reopens_stream(output):
+    output.play(ones(20), SAMPLE_RATE)
+    output.streams[0].pull(64)
+    output.play(ones(20), SAMPLE_RATE * 2)
+    assert output.opens == 2
+    assert output.streams[0].closed
+    assert output.samplerate == SAMPLE_RATE * 2
+
+
+def test_split_phrases_by_sentences():
+    text = "Свет включен на кухне. Музыка играет в спальне! Что-нибудь еще?"
+    assert split_phrases(text) == ["Свет включен на кухне.", "Музыка играет в спальне!", "Что-нибудь еще?"]
+
+
+def test_split_phrases_merges_short_pieces():
+    # Короткое начало приклеивается к следующему куску, короткий конец - к предыдущему
+    assert split_phrases("Ох, Да. Свет включен на кухне. Целую!") == ["Ох, Да. Свет включен на кухне. Целую!"]
+    assert split_phrases("Свет включен на кухне. Музыка играет в спальне. Целую!") == [
+        "Свет включен на кухне.", "Музыка играет в спальне. Целую!"]
+
+
+def test_split_phrases_splits_long_sentence_by_clauses():
+    clause = "очень длинная часть предложения"
+    text = ", ".join([clause] * 6) + "."
+    chunks = split_phrases(text, max_chars=70)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 70 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_split_phrases_empty_text():
+    assert split_phrases("   ") == []
@@ -0,0 +1,107 @@
+# tests/test_command_pipeline.py
+import concurrent.futures
+import threading
+
+import pytest
+
+from commands_checker.core.command_pipeline import CommandPipeline
+
+TIMEOUT = 2.0
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = CommandPipeline(queue_size=2)
+    yield pipeline
+    pipeline.shutdown()
+
+
+def block(pipeline, domain):
+    """Занимает домен командой, пока тест не отпустит release"""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(TIMEOUT)
+        return "blocker"
+
+    future = pipeline.submit(domain, blocker)
+    assert started.wait(TIMEOUT)
+    return release, future
+
+
+def test_commands_of_one_domain_run_in_order(pipeline):
+    release, _ = block(pipeline, "light")
+    done = []
+    futures = [pipeline.submit("light", lambda i=i: done.append(i) or i) for i in range(2)]
+    release.set()
+    assert [f.result(TIMEOUT) for f in futures] == [0, 1]
+    assert done == [0, 1]
+
+
+def test_other_domain_is_not_blocked(pipeline):
+    release, _ = block(pipeline, "light")
+    try:
+        assert pipeline.submit("music", lambda: "play").result(TIMEOUT) == "play"
+    finally:
+        release.set()
+
+
+def test_supersede_cancels_queued_command(pipeline):
+    release, _ = block(pipeline, "music")
+    first = pipeline.submit("music", lambda: 30, name="set_volume", supersede_key="set_volume")
+    second = pipeline.submit("music", lambda: 70, name="set_volume", supersede_key="set_volume")
+    release.set()
+
+    assert second.result(TIMEOUT) == 70
+    assert first.cancelled()
+    assert pipeline.stats["cancelled"] == 1
+
+
+def test_full_queue_rejects_command(pipeline):
+    release, _ = block(pipeline, "light")
+    queued = [pipeline.submit("light", lambda i=i: i) for i in range(2)]
+    rejected = pipeline.submit("light", lambda: "lost")
+
+    with pytest.raises(RuntimeError, match="переполнена"):
+        rejected.result(TIMEOUT)
+    release.set()
+    assert [f.result(TIMEOUT) for f in queued] == [0, 1]
+    assert pipeline.stats["rejected"] == 1
+
+
+def test_command_errors_reach_the_future(pipeline):
+    future = pipeline.submit("system", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        future.result(TIMEOUT)
+    assert pipeline.stats["failed"] == 1
+
+
+def test_gate_holds_commands_until_ready(pipeline):
+    gate = concurrent.futures.Future()
+    pipeline.set_gate("music", gate)
+    future = pipeline.submit("music", lambda: "play")
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        future.result(0.1)
+    gate.set_result(True)
+    assert future.result(TIMEOUT) == "play"
+
+
+def test_supersede_while_waiting_for_gate(pipeline):
+    gate = concurrent.futures.Future()
+    pipeline.set_gate("light", gate)
+    first = pipeline.submit("light", lambda: "red", supersede_key="light_color")
+    second = pipeline.submit("light", lambda: "blue", supersede_key="light_color")
+    gate.set_result(True)
+
+    assert second.result(TIMEOUT) == "blue"
+    assert first.cancelled()
+
+
+def test_failed_gate_still_runs_commands(pipeline):
+    gate = concurrent.futures.Future()
+    pipeline.set_gate("voice", gate)
+    future = pipeline.submit("voice", lambda: "spoken")
+    gate.set_exception(RuntimeError("модель не загрузилась"))
+    assert future.result(TIMEOUT) == "spoken"
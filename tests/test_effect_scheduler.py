@@ -0,0 +1,196 @@
+# tests/test_effect_scheduler.py
+import numpy as np
+import pytest
+
+from light.effect_scheduler import EffectScheduler
+from light.effects import SIN8_TABLE, BreathingEffect, EffectEngine, SolidEffect, WaveEffect
+from light.serial_protocol import FRAME_LEDS, FrameDecoder
+
+NUM_LEDS = 60
+BASE = (200, 100, 50)
+
+
+class FakeClock:
+    """Часы планировщика, которые двигает тест"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run_engine(engine, times):
+    """Кадры движка, вызванные планировщиком в моменты times"""
+    scheduler = EffectScheduler(fps=50)
+    frames = []
+    scheduler.set_effect("engine", lambda now: frames.append(engine.render(now).copy()))
+    for now in times:
+        assert scheduler.step(now)
+    return frames
+
+
+def make_engine(effect=None):
+    engine = EffectEngine(NUM_LEDS)
+    engine.set_color(BASE)
+    if effect is not None:
+        engine.set_effect(effect)
+    return engine
+
+
+def scaled(level):
+    """base * level // 255 для каждого светодиода (level - массив или число)"""
+    level = np.broadcast_to(np.asarray(level, dtype=np.uint16), (NUM_LEDS,))
+    return (np.array(BASE, dtype=np.uint16) * level[:, None] // 255).astype(np.uint8)
+
+
+def test_static_frame_is_base_color():
+    frames = run_engine(make_engine(), [0.0, 0.02, 10.0])
+    for frame in frames:
+        assert (frame == BASE).all()
+
+
+def test_wave_frame_matches_sin8():
+    effect = WaveEffect(NUM_LEDS)
+    frames = run_engine(make_engine(effect), [0.0, 0.02, 0.5])
+    for now, frame in zip([0.0, 0.02, 0.5], frames):
+        phase = int(now * effect.speed)
+        level = SIN8_TABLE[(np.arange(NUM_LEDS) * effect.length + phase) & 0xFF]
+        np.testing.assert_array_equal(frame, scaled(level))
+    # Волна действительно бежит
+    assert not np.array_equal(frames[0], frames[1])
+
+
+def test_breathing_frame_is_uniform_sine():
+    effect = BreathingEffect(NUM_LEDS)
+    times = [0.0, 0.4, 1.2]
+    frames = run_engine(make_engine(effect), times)
+    for now, frame in zip(times, frames):
+        level = int((np.sin(now * effect.rate) + 1) * 127.5)
+        np.testing.assert_array_equal(frame, scaled(level))
+
+
+def test_crossfade_mixes_previous_and_new_effect():
+    engine = make_engine(SolidEffect())
+    wave = WaveEffect(NUM_LEDS)
+    engine.set_effect(wave, fade=0.5)
+    frames = run_engine(engine, [1.0, 1.25, 1.5])
+
+    solid = np.array([BASE] * NUM_LEDS, dtype=np.uint16)
+    wave_frame = lambda now: scaled(SIN8_TABLE[(np.arange(NUM_LEDS) * wave.length + int(now * wave.speed)) & 0xFF])
+
+    # Отсчет перехода начинается с первого кадра: он равен старому эффекту
+    np.testing.assert_array_equal(frames[0], solid.astype(np.uint8))
+    # Середина перехода: (old * (256 - 128) + new * 128) >> 8
+    expected = (solid * 128 + wave_frame(1.25).astype(np.uint16) * 128) >> 8
+    np.testing.assert_array_equal(frames[1], expected.astype(np.uint8))
+    # Переход закончен - только новый эффект
+    np.testing.assert_array_equal(frames[2], wave_frame(1.5))
+    assert not engine.fading
+
+
+def test_interval_limits_slow_effects():
+    scheduler = EffectScheduler(fps=50)
+    calls = []
+    scheduler.set_effect("monitor", calls.append, interval=0.08)
+    assert [scheduler.step(now) for now in (0.0, 0.02, 0.079, 0.08, 0.1)] == [True, False, False, True, False]
+    assert calls == [0.0, 0.08]
+
+
+def test_jitter_and_overrun_counters():
+    clock = FakeClock()
+    scheduler = EffectScheduler(fps=50, clock=clock)
+    work = {"seconds": 0.005}
+
+    def tick(now):
+        clock.now = now + work["seconds"]
+
+    scheduler.set_effect("test", tick)
+
+    # Кадр вовремя и кадр с опозданием 4 мс - оба укладываются в период 20 мс
+    next_time = scheduler.run_frame(0.0, now=0.0)
+    assert next_time == pytest.approx(0.02)
+    next_time = scheduler.run_frame(next_time, now=0.024)
+    assert next_time == pytest.approx(0.04)
+    assert scheduler.overruns == 0
+
+    # Кадр работает 55 мс: пропускаются кадры на 0.06 и 0.08, следующий - 0.1
+    work["seconds"] = 0.055
+    next_time = scheduler.run_frame(next_time, now=0.04)
+    assert next_time == pytest.approx(0.1)
+
+    stats = scheduler.stats()
+    assert stats["ticks"] == 3
+    assert stats["overruns"] == 1
+    assert stats["skipped_frames"] == 2
+    assert stats["jitter_max_ms"] == pytest.approx(4.0)
+    assert stats["jitter_avg_ms"] == pytest.approx(4.0 / 3)
+    assert stats["tick_max_ms"] == pytest.approx(55.0)
+
+
+def test_effect_errors_are_counted():
+    scheduler = EffectScheduler(fps=50)
+    scheduler.set_effect("broken", lambda now: 1 / 0)
+    assert scheduler.step(0.0)
+    assert scheduler.errors == 1
+
+
+# Светомузыка и умная подсветка рисуются контроллером - проверяем их кадры
+# через планировщик без потока (фикстура controller из conftest.py)
+
+def last_frame(controller):
+    frames = FrameDecoder().feed(controller._writer.packets[-1])
+    assert len(frames) == 1
+    frame_type, leds = frames[0]
+    assert frame_type == FRAME_LEDS
+    return leds
+
+
+def tone(frequency, sample_rate=44100, size=1024):
+    t = np.arange(size) / sample_rate
+    return (np.sin(2 * np.pi * frequency * t) * 20000).astype(np.int16).tobytes()
+
+
+def test_music_frame_follows_spectrum(controller):
+    controller.start_music_mode()
+    assert controller._scheduler.active == "music"
+
+    # Пока звука нет, кадров нет
+    sent = len(controller._writer.packets)
+    assert controller._scheduler.step(0.0)
+    assert len(controller._writer.packets) == sent
+
+    for _ in range(10):
+        controller.spectrum.process(tone(80))
+    controller._scheduler.step(0.02)
+    leds = last_frame(controller)
+    assert leds.shape == (NUM_LEDS, 3)
+    # Красная база: басы слева яркие, верх справа темный, зеленого и синего нет
+    assert leds[:5, 0].min() > 100
+    assert leds[-10:, 0].max() < leds[:5, 0].min()
+    assert not leds[:, 1:].any()
+
+    # Спектр не изменился - кадр не отправляется повторно
+    sent = len(controller._writer.packets)
+    controller._scheduler.step(0.04)
+    assert len(controller._writer.packets) == sent
+
+
+def test_monitor_frame_follows_screen_edges(controller):
+    controller.start_monitor_checker()
+    assert controller._scheduler.active == "monitor"
+
+    edges = np.zeros((NUM_LEDS, 3), dtype=np.uint8)
+    edges[:20] = (255, 0, 0)
+    edges[20:40] = (0, 255, 0)
+    edges[40:] = (0, 0, 255)
+    controller._get_edge_frame = lambda: edges
+
+    assert controller._scheduler.step(1.0)
+    leds = last_frame(controller)
+    assert np.abs(leds.astype(int) - edges).max() <= 1
+
+    # Снимок экрана - не чаще раза в 80 мс
+    sent = len(controller._writer.packets)
+    assert not controller._scheduler.step(1.04)
+    assert len(controller._writer.packets) == sent
@@ -0,0 +1,19 @@
+# tests/test_effects.py
+import numpy as np
+import pytest
+
+from light.effects import build_output_lut
+
+
+@pytest.mark.parametrize("brightness", range(1, 101))
+def test_low_brightness_keeps_strip_lit(brightness):
+    lut = build_output_lut(brightness, 2.2)
+    assert lut[255] > 0
+    # Таблица не убывает: более яркий вход не становится темнее
+    assert (np.diff(lut.astype(int)) >= 0).all()
+
+
+def test_lut_bounds():
+    np.testing.assert_array_equal(build_output_lut(100, 1.0), np.arange(256))
+    assert not build_output_lut(0, 2.2).any()
+    assert build_output_lut(100, 2.2)[255] == 255
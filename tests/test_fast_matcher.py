@@ -0,0 +1,54 @@
+# tests/test_fast_matcher.py
+import pytest
+
+from commands_checker.core.fast_matcher import FastIntentMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return FastIntentMatcher()
+
+
+@pytest.mark.parametrize("text, commands", [
+    ("включи свет", ["light_on"]),
+    ("поставь цвет красный", ["set_color_red"]),
+    ("следующий трек", ["next"]),
+    ("включи сцену вечер", ["scene_evening"]),
+    ("включи музыку и красный", ["play", "set_color_red"]),
+])
+def test_single_and_combined_commands(matcher, text, commands):
+    result = matcher.match(text)
+    assert result is not None
+    assert result["commands"] == commands
+
+
+def test_value_command(matcher):
+    result = matcher.match("сделай громкость 50")
+    assert result["commands"] == ["set_volume"]
+    assert result["parameters"] == {"value": 50}
+
+
+@pytest.mark.parametrize("text", [
+    "включи свет и музыку",
+    "включи музыку и свет",
+    "выключи свет и музыку",
+    "включи музыку и сцену",
+])
+def test_unmatched_domain_word_goes_to_llm(matcher, text):
+    # Второй домен не распознан - нельзя молча выполнить только первую команду
+    assert matcher.match(text) is None
+
+
+def test_conflicting_commands_go_to_llm(matcher):
+    assert matcher.match("включи свет выключи свет") is None
+
+
+@pytest.mark.parametrize("text", [
+    "яркость 30 и громкость 70",
+    "громкость двадцать пять и яркость тридцать",
+    "громкость 30 и яркость",
+    "громкость 50 60",
+])
+def test_several_values_go_to_llm(matcher, text):
+    # Одно значение на фразу - иначе обе команды выполнились бы с первым числом
+    assert matcher.match(text) is None
@@ -0,0 +1,87 @@
+# tests/test_light_controller.py
+import numpy as np
+import pytest
+
+from light.scenes import BUILTIN_SCENES, SceneStore
+from light.serial_protocol import FRAME_FILL, FrameDecoder
+
+
+def test_close_sends_off_frame_and_closes_writer_before_port(controller):
+    connection = controller._connection
+    connection.is_connected = True
+    order = []
+    connection.close = lambda timeout=1.0: order.append(("port", controller._writer.closed))
+
+    controller.close_connection()
+
+    # Последний кадр - выключение, и поток записи остановлен до закрытия порта
+    frame_type, leds = FrameDecoder().feed(controller._writer.packets[-1])[0]
+    assert frame_type == FRAME_FILL
+    assert not leds.any()
+    assert order == [("port", True)]
+
+
+def test_close_is_idempotent(controller):
+    controller._connection.is_connected = True
+    controller.close_connection()
+    sent = len(controller._writer.packets)
+    controller.close_connection()
+    assert len(controller._writer.packets) == sent
+
+
+def decoded(packet):
+    frames = FrameDecoder().feed(packet)
+    assert len(frames) == 1
+    return frames[0][1]
+
+
+def tone(frequency, sample_rate=44100, size=1024):
+    t = np.arange(size) / sample_rate
+    return (np.sin(2 * np.pi * frequency * t) * 20000).astype(np.int16).tobytes()
+
+
+@pytest.mark.parametrize("name", sorted(BUILTIN_SCENES))
+def test_builtin_scene_is_not_black(make_controller, name):
+    # Гамма по умолчанию: тусклые сцены ("ночь", 5%) не должны гаснуть
+    controller = make_controller()
+    controller._get_edge_frame = lambda: np.full((controller.NUM_LEDS, 3), 200, dtype=np.uint8)
+    for _ in range(10):
+        controller.spectrum.process(tone(80))
+
+    assert controller.apply_scene(name)
+    # Эффекты рисуют первый кадр на следующем шаге планировщика
+    controller._scheduler.step(0.0)
+    assert decoded(controller._writer.packets[-1]).any()
+
+
+def test_scene_is_one_packet(controller):
+    sent = len(controller._writer.packets)
+    assert controller.apply_scene("вечер")
+    assert len(controller._writer.packets) == sent + 1
+    assert decoded(controller._writer.packets[-1]).any()
+
+
+def test_restore_does_not_turn_strip_off(make_controller, tmp_path):
+    store = SceneStore(str(tmp_path / "scenes.json"), save_delay=0)
+    store.remember(dict(BUILTIN_SCENES["вечер"]))
+
+    controller = make_controller(restore_state=True)
+    assert controller.is_on and controller.brightness == 40
+    packets = controller._writer.packets
+    assert len(packets) == 1
+    assert decoded(packets[0]).any()
+
+
+def test_reconnect_resends_unchanged_monitor_frame(controller):
+    controller._get_edge_frame = lambda: np.full((controller.NUM_LEDS, 3), 120, dtype=np.uint8)
+    controller.start_monitor_checker()
+    assert controller._scheduler.step(1.0)
+    # Экран не меняется - повторный кадр отсеивается фильтром
+    sent = len(controller._writer.packets)
+    assert controller._scheduler.step(1.1)
+    assert len(controller._writer.packets) == sent
+
+    # После переподключения лента погасла - тот же кадр отправляется снова
+    controller._on_connected(False)
+    assert controller._scheduler.step(1.2)
+    assert len(controller._writer.packets) == sent + 1
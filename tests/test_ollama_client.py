@@ -0,0 +1,92 @@
+# tests/test_ollama_client.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from commands_checker.utils.ollama_client import OllamaClient
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Заглушка Ollama: /api/chat отвечает по сценарию сервера"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests.append(body)
+        server.clients.add(self.client_address)
+
+        status, delay = server.script.pop(0) if server.script else (200, 0.0)
+        time.sleep(delay)
+        payload = json.dumps({"message": {"content": "{}"}, "eval_count": 1}).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Клиент уже ушел по таймауту
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    server.requests = []
+    server.clients = set()
+    server.script = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = OllamaClient(f"http://127.0.0.1:{server.server_address[1]}", read_timeout=0.5,
+                          backoff_factor=0.01)
+    yield client
+    client.close()
+
+
+def chat(client):
+    return client.chat("llama3", [{"role": "user", "content": "привет"}])
+
+
+def test_requests_reuse_one_connection(server, client):
+    for _ in range(3):
+        assert chat(client)["message"]["content"] == "{}"
+    assert len(server.requests) == 3
+    assert len(server.clients) == 1
+    assert server.requests[0]["keep_alive"] == "30m"
+
+
+def test_unavailable_status_is_retried(server, client):
+    server.script = [(503, 0.0)]
+    assert chat(client)["message"]["content"] == "{}"
+    assert len(server.requests) == 2
+
+
+def test_retries_are_limited(server, client):
+    server.script = [(503, 0.0)] * 5
+    with pytest.raises(requests.HTTPError):
+        chat(client)
+    assert len(server.requests) == 3  # запрос + max_retries повтора
+
+
+def test_read_timeout_is_not_retried(server, client):
+    server.script = [(200, 1.0)]
+    started = time.perf_counter()
+    with pytest.raises(requests.RequestException, match="Read timed out"):
+        chat(client)
+    assert time.perf_counter() - started < 1.0
+    assert len(server.requests) == 1
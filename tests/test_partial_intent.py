@@ -0,0 +1,87 @@
+# tests/test_partial_intent.py
+import concurrent.futures
+
+import pytest
+
+from commands_checker.core.command_pipeline import CommandPipeline
+from voice_input import PartialCommandTracker
+
+PHRASES = {
+    "включи синий": ["set_color_blue"],
+    "включи голубой": ["set_color_cyan"],
+    "включи свет": ["light_on"],
+}
+GROUPS = {"set_color_blue": "light_color", "set_color_cyan": "light_color", "light_on": "light_power"}
+
+
+def matcher(text):
+    commands = PHRASES.get(text)
+    return {"commands": commands, "parameters": {}} if commands else None
+
+
+class Light:
+    """Исполнитель команд через конвейер с группами вытеснения, как SmartCommandHandler"""
+
+    def __init__(self):
+        self.pipeline = CommandPipeline(domains=("light",))
+        self.ran = []
+        self.futures = []
+
+    def execute(self, result, dispatched=()):
+        for command in result["commands"]:
+            if command not in dispatched:
+                self.futures.append(self.pipeline.submit(
+                    "light", lambda command=command: self.ran.append(command),
+                    name=command, supersede_key=GROUPS[command]))
+
+    def wait(self):
+        concurrent.futures.wait(self.futures, timeout=2.0)
+
+
+@pytest.fixture
+def light():
+    return Light()
+
+
+def hear(tracker, partials):
+    for text in partials:
+        tracker.on_partial(text)
+
+
+def test_stable_partial_fires_once_and_final_is_skipped(light):
+    tracker = PartialCommandTracker(matcher, light.execute)
+    hear(tracker, ["включи", "включи синий", "включи синий", "включи синий"])
+    assert tracker.consume_final("включи синий") == (True, ("set_color_blue",))
+    light.wait()
+    assert light.ran == ["set_color_blue"]
+
+
+def test_different_final_replaces_pending_early_command(light):
+    # Свет еще загружается - ранняя команда ждет в очереди домена
+    gate = concurrent.futures.Future()
+    light.pipeline.set_gate("light", gate)
+    tracker = PartialCommandTracker(matcher, light.execute)
+
+    hear(tracker, ["включи синий", "включи синий"])
+    handled, executed = tracker.consume_final("включи голубой")
+    assert handled and executed == ("set_color_blue",)
+
+    gate.set_result(True)
+    light.wait()
+    assert light.ran == ["set_color_cyan"]
+    assert light.futures[0].cancelled()
+    assert tracker.finals_replaced == 1
+
+
+def test_final_for_llm_reports_executed_commands(light):
+    tracker = PartialCommandTracker(matcher, light.execute)
+    hear(tracker, ["включи свет", "включи свет"])
+    # "и музыку" быстрый матчер не разбирает - фраза уйдет в LLM без повторного light_on
+    assert tracker.consume_final("включи свет и музыку") == (False, ("light_on",))
+
+
+def test_final_without_early_command(light):
+    tracker = PartialCommandTracker(matcher, light.execute)
+    hear(tracker, ["включи синий"])
+    assert tracker.consume_final("включи синий") == (False, ())
+    assert light.ran == []
@@ -0,0 +1,80 @@
+# tests/test_response_cache.py
+import os
+
+import pytest
+
+from commands_checker.utils import response_cache
+from commands_checker.utils.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache(str(tmp_path / "intent_cache.sqlite3"), max_entries=3, ttl=60, clock=clock)
+
+
+def test_hit_and_miss_counters(cache):
+    key = cache.make_key("Включи свет", "промпт", "llama3")
+    assert cache.get(key) is None
+    cache.put(key, {"commands": ["light_on"]})
+    # Ключ не зависит от регистра и пробелов фразы
+    assert cache.get(cache.make_key("  включи   СВЕТ ", "промпт", "llama3")) == {"commands": ["light_on"]}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["size"]) == (1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_prompt_and_model_change_the_key(cache):
+    key = cache.make_key("включи свет", "промпт", "llama3")
+    assert key != cache.make_key("включи свет", "новый промпт", "llama3")
+    assert key != cache.make_key("включи свет", "промпт", "qwen")
+
+
+def test_entry_expires_after_ttl(cache, clock):
+    cache.put("key", {"commands": ["play"]})
+    clock.now += 59
+    assert cache.get("key") == {"commands": ["play"]}
+    clock.now += 2
+    assert cache.get("key") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        clock.now += 1
+    # "a" прочитан последним - вытесняется "b"
+    assert cache.get("a") == "a"
+    clock.now += 1
+    cache.put("d", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()["size"] == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_survive_reopen(tmp_path, clock):
+    path = str(tmp_path / "intent_cache.sqlite3")
+    ResponseCache(path, clock=clock).put("key", {"commands": ["next"]})
+    assert ResponseCache(path, clock=clock).get("key") == {"commands": ["next"]}
+
+
+def test_default_path_is_in_project_cache():
+    # Не зависит от текущей папки процесса: cache/ в корне проекта
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert response_cache.DEFAULT_CACHE_PATH == os.path.join(root, "cache", "intent_cache.sqlite3")
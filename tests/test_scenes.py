@@ -0,0 +1,47 @@
+# tests/test_scenes.py
+import json
+import time
+
+from light.scenes import SceneStore
+
+
+def state(brightness, mode="static"):
+    return {"is_on": True, "mode": mode, "palette": "белый", "color": (255, 255, 255), "brightness": brightness}
+
+
+def test_last_state_writes_are_coalesced(tmp_path):
+    path = tmp_path / "scenes.json"
+    store = SceneStore(str(path), save_delay=60.0)
+    for brightness in range(10, 60, 10):
+        assert store.remember(state(brightness))
+    assert not store.remember(state(50))
+
+    # Пять изменений подряд - ни одной записи до flush, одна запись после
+    assert store.saves == 0 and not path.exists()
+    store.flush()
+    store.flush()
+    assert store.saves == 1
+    assert json.loads(path.read_text(encoding="utf-8"))["last"]["brightness"] == 50
+
+
+def test_delayed_write_happens_in_background(tmp_path):
+    path = tmp_path / "scenes.json"
+    store = SceneStore(str(path), save_delay=0.05)
+    store.remember(state(30))
+    store.remember(state(40))
+    deadline = time.monotonic() + 2.0
+    while store.saves == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.saves == 1
+    assert SceneStore(str(path)).last["brightness"] == 40
+
+
+def test_presets_are_saved_immediately(tmp_path):
+    path = tmp_path / "scenes.json"
+    store = SceneStore(str(path), save_delay=60.0)
+    store.save_preset("моя", state(70, mode="wave"))
+    assert store.saves == 1
+
+    restored = SceneStore(str(path))
+    assert restored.get("моя")["mode"] == "wave"
+    assert "моя" in restored.names() and "вечер" in restored.names()
@@ -0,0 +1,78 @@
+# tests/test_screen_capture.py
+import numpy as np
+
+from light.screen_capture import ScreenSampler, SyntheticCapture
+
+WIDTH, HEIGHT = 320, 240
+
+
+def screen():
+    """Экран: левый край - красный с яркостью по высоте, верх - синий, правый - зеленый, центр - серый"""
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    image[:, :, 0] = np.linspace(0, 240, HEIGHT)[:, None]  # Красный растет сверху вниз
+    image[:, WIDTH // 2:, 0] = 0
+    image[:40, :, :] = (0, 0, 200)
+    image[:, -48:, :] = (0, 180, 0)
+    image[HEIGHT // 3:2 * HEIGHT // 3, WIDTH // 3:2 * WIDTH // 3] = (90, 90, 90)
+    return image
+
+
+class RecordingCapture(SyntheticCapture):
+    def __init__(self, image):
+        super().__init__(image)
+        self.regions = []
+
+    def grab(self, region):
+        self.regions.append(region)
+        return super().grab(region)
+
+
+class BgraCapture(SyntheticCapture):
+    channels = "BGRA"
+
+    def grab(self, region):
+        rgb = super().grab(region)
+        alpha = np.full(rgb.shape[:2] + (1,), 255, dtype=np.uint8)
+        return np.concatenate([rgb[..., ::-1], alpha], axis=2)
+
+
+def test_center_color_grabs_only_center():
+    backend = RecordingCapture(screen())
+    assert ScreenSampler(backend).center_color() == (90, 90, 90)
+    assert backend.regions == [(WIDTH // 3, HEIGHT // 3, WIDTH // 3, HEIGHT // 3)]
+
+
+def test_zone_colors():
+    colors = ScreenSampler(SyntheticCapture(screen()), step=4).zone_colors()
+    assert colors["right"] == (0, 180, 0)
+    assert colors["top"][2] > 150
+
+
+def test_edge_frame_follows_layout():
+    sampler = ScreenSampler(SyntheticCapture(screen()), step=4, layout=(("left", 10), ("top", 20), ("right", 10)))
+    frame = sampler.edge_frame()
+    assert frame.shape == (40, 3) and frame.dtype == np.uint8
+
+    left, top, right = frame[:10], frame[10:30], frame[30:]
+    # Левый край идет снизу вверх: внизу красный ярче, верхний светодиод попадает на синюю полосу
+    assert left[0, 0] > left[5, 0] > left[8, 0]
+    assert left[-1, 2] > 0
+    # Верх слева направо: синяя полоса, в правом углу - зеленый правый край
+    assert (top[:15] == (0, 0, 200)).all()
+    assert (top[-1] == (0, 180, 0)).all()
+    assert (right == (0, 180, 0)).all()
+
+
+def test_bgra_backend_is_converted_to_rgb():
+    rgb = ScreenSampler(SyntheticCapture(screen()), step=4)
+    bgra = ScreenSampler(BgraCapture(screen()), step=4)
+    assert bgra.center_color() == rgb.center_color()
+    np.testing.assert_array_equal(bgra.edge_frame(), rgb.edge_frame())
+
+
+def test_callable_image_is_grabbed_every_time():
+    level = [10]
+    sampler = ScreenSampler(SyntheticCapture(lambda: np.full((HEIGHT, WIDTH, 3), level[0], np.uint8)))
+    assert sampler.center_color() == (10, 10, 10)
+    level[0] = 200
+    assert sampler.center_color() == (200, 200, 200)
@@ -0,0 +1,71 @@
+# tests/test_serial_connection.py
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from light.serial_protocol import encode_fill
+
+pytest.importorskip("serial")
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="нужен pty (POSIX)")
+
+
+@pytest.fixture
+def device():
+    from light.fake_device import FakeLedDevice
+
+    device = FakeLedDevice()
+    yield device
+    device.close()
+
+
+@pytest.fixture
+def link(device):
+    from light.serial_connection import SerialConnection
+    from light.serial_writer import SerialWriter
+
+    connected = []
+    event = threading.Event()
+
+    def on_connect(first):
+        connected.append(first)
+        event.set()
+
+    writer = SerialWriter(max_fps=0)
+    connection = SerialConnection(device.port, 115200, writer, reset_delay=0.05, min_backoff=0.05,
+                                  on_connect=on_connect)
+    yield connection, writer, connected, event
+    connection.close()
+    writer.close()
+
+
+def test_commands_wait_in_mailbox_until_connected(device, link):
+    connection, writer, connected, event = link
+    # Порт еще не открыт - команда ждет в почтовом ящике
+    writer.submit(encode_fill(1, 2, 3))
+    connection.start()
+    assert device.wait_frames(1)
+    assert (device.frame == (1, 2, 3)).all()
+    assert event.wait(2.0)
+    assert connected == [True]
+
+
+def test_reconnects_after_port_is_closed(device, link):
+    connection, writer, connected, event = link
+    connection.start()
+    assert event.wait(2.0)
+    event.clear()
+
+    # Порт закрылся под писателем (как при отключении Arduino): запись падает,
+    # соединение помечается потерянным и slave-сторона pty открывается заново
+    connection.serial.close()
+    writer.submit(encode_fill(9, 9, 9))
+    assert event.wait(2.0)
+    assert connected == [True, False]
+    assert connection.connects == 2
+    assert writer.stats()["errors"] == 1
+
+    writer.submit(encode_fill(40, 50, 60))
+    assert device.wait_frames(1)
+    np.testing.assert_array_equal(device.frame[0], (40, 50, 60))
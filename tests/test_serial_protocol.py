@@ -0,0 +1,71 @@
+# tests/test_serial_protocol.py
+import os
+
+import numpy as np
+import pytest
+
+from light.serial_protocol import FRAME_FILL, FRAME_LEDS, FrameDecoder, encode_fill, encode_frame
+
+serial = pytest.importorskip("serial")
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="нужен pty (POSIX)")
+
+NUM_LEDS = 60
+
+
+@pytest.fixture
+def device():
+    from light.fake_device import FakeLedDevice
+
+    device = FakeLedDevice(num_leds=NUM_LEDS)
+    yield device
+    device.close()
+
+
+@pytest.fixture
+def port(device):
+    port = serial.Serial(device.port, 115200, timeout=0.1)
+    yield port
+    port.close()
+
+
+def gradient():
+    frame = np.zeros((NUM_LEDS, 3), dtype=np.uint8)
+    frame[:, 0] = np.arange(NUM_LEDS) * 4
+    frame[:, 2] = 255 - np.arange(NUM_LEDS) * 4
+    return frame
+
+
+def test_decoder_round_trip_in_pieces():
+    frame = gradient()
+    packets = encode_frame(frame) + encode_fill(1, 2, 3)
+    decoder = FrameDecoder()
+    # Пакеты приходят кусками произвольной длины
+    decoded = []
+    for start in range(0, len(packets), 7):
+        decoded += decoder.feed(packets[start:start + 7])
+
+    assert [frame_type for frame_type, _ in decoded] == [FRAME_LEDS, FRAME_FILL]
+    np.testing.assert_array_equal(decoded[0][1], frame)
+    np.testing.assert_array_equal(decoded[1][1], [[1, 2, 3]])
+
+
+def test_device_receives_frame_and_fill(device, port):
+    frame = gradient()
+    port.write(encode_frame(frame))
+    assert device.wait_frames(1)
+    np.testing.assert_array_equal(device.frame, frame)
+
+    port.write(encode_fill(10, 20, 30))
+    assert device.wait_frames(2)
+    assert (device.frame == (10, 20, 30)).all()
+
+
+def test_device_rejects_bad_checksum(device, port):
+    corrupted = bytearray(encode_frame(gradient()))
+    corrupted[-1] ^= 0xFF
+    # Поврежденный пакет отбрасывается, следующий целый - принимается
+    port.write(bytes(corrupted) + encode_fill(5, 6, 7))
+    assert device.wait_frames(1)
+    assert device.frames == 1
+    assert device.checksum_errors == 1
+    assert (device.frame == (5, 6, 7)).all()
@@ -0,0 +1,105 @@
+# tests/test_serial_writer.py
+import threading
+import time
+
+import pytest
+
+from light.serial_writer import SerialWriter
+
+TIMEOUT = 2.0
+
+
+class FakePort:
+    """Порт, запоминающий записанные пакеты; hold задерживает запись"""
+
+    def __init__(self, fail=False):
+        self.writes = []
+        self.times = []
+        self.fail = fail
+        self.hold = threading.Event()
+        self.hold.set()
+        self.writing = threading.Event()
+
+    def write(self, packet):
+        self.writing.set()
+        self.hold.wait(TIMEOUT)
+        if self.fail:
+            raise OSError("порт отключен")
+        self.times.append(time.perf_counter())
+        self.writes.append(packet)
+        return len(packet)
+
+
+@pytest.fixture
+def writer():
+    writer = SerialWriter(max_fps=0)
+    yield writer
+    writer.close()
+
+
+def test_mailbox_keeps_only_latest_packet(writer):
+    # Порта еще нет: три кадра подряд - в ящике остается последний
+    for packet in (b"1", b"2", b"3"):
+        writer.submit(packet)
+    assert writer.dropped == 2
+    assert not writer.flush(timeout=0.05)
+
+    port = FakePort()
+    writer.set_port(port)
+    assert writer.flush(TIMEOUT)
+    assert port.writes == [b"3"]
+    assert writer.stats()["written"] == 1
+
+
+def test_packets_submitted_during_write_are_coalesced(writer):
+    port = FakePort()
+    port.hold.clear()
+    writer.set_port(port)
+
+    writer.submit(b"first")
+    assert port.writing.wait(TIMEOUT)
+    # Пока порт занят первым кадром, приходят еще три - записан будет только последний
+    for packet in (b"a", b"b", b"c"):
+        writer.submit(packet)
+    port.hold.set()
+
+    assert writer.flush(TIMEOUT)
+    assert port.writes == [b"first", b"c"]
+    assert writer.dropped == 2
+
+
+def test_max_fps_limits_write_rate():
+    writer = SerialWriter(port=FakePort(), max_fps=20)
+    try:
+        port = writer.port
+        for packet in (b"1", b"2", b"3"):
+            writer.submit(packet)
+            assert writer.flush(TIMEOUT)
+        assert port.writes == [b"1", b"2", b"3"]
+        intervals = [b - a for a, b in zip(port.times, port.times[1:])]
+        assert min(intervals) >= 0.045
+    finally:
+        writer.close()
+
+
+def test_write_error_detaches_port(writer):
+    errors = []
+    writer.on_error = errors.append
+    writer.set_port(FakePort(fail=True))
+    writer.submit(b"1")
+
+    deadline = time.monotonic() + TIMEOUT
+    while writer.port is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.port is None
+    assert writer.errors == 1
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+
+
+def test_close_writes_last_packet():
+    port = FakePort()
+    writer = SerialWriter(port=port, max_fps=0)
+    writer.submit(b"off")
+    writer.close()
+    assert port.writes == [b"off"]
+    assert not writer._thread.is_alive()
@@ -0,0 +1,54 @@
+# tests/test_stream_json.py
+import json
+import random
+
+import pytest
+
+from commands_checker.utils.stream_json import IncrementalJSONParser
+
+DOCUMENT = {
+    "commands": ["light_on", "set_color_red"],
+    "parameters": {"value": 50, "search_query": "котики \"и\" {собачки}"},
+    "response": "Включаю свет, котик! " * 3,
+    "confidence": 0.95,
+    "is_command": True,
+    "extra": None,
+}
+
+
+def feed_all(parser, pieces):
+    events = []
+    for piece in pieces:
+        events += parser.feed(piece)
+    return events
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fields_survive_any_split(seed):
+    text = json.dumps(DOCUMENT, ensure_ascii=False, indent=seed % 3 or None)
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+    pieces = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+    parser = IncrementalJSONParser()
+    events = feed_all(parser, pieces)
+    assert [key for key, _ in events] == list(DOCUMENT)
+    assert parser.fields == DOCUMENT
+    assert parser.done
+
+
+def test_field_is_emitted_before_object_ends():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"commands": ["pla') == []
+    assert parser.feed('y"], "resp') == [("commands", ["play"])]
+    assert parser.feed('onse": "ok"') == [("response", "ok")]
+    assert not parser.done
+
+
+def test_long_value_split_into_many_chunks():
+    parser = IncrementalJSONParser()
+    parser.feed('{"commands": [], "response": "')
+    for _ in range(1000):
+        assert parser.feed("слово ") == []
+    assert parser.feed('"}') == [("response", "слово " * 1000)]
+    assert parser.done
@@ -0,0 +1,45 @@
+# tests/test_tts_service.py
+import pytest
+
+from Gelya_voice import GelyaSpeach, TTSService
+
+
+class BrokenBackend:
+    """Движок синтеза, который всегда падает, и считает попытки"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text, pitch, index_rate):
+        self.calls += 1
+        raise RuntimeError("синтез недоступен")
+
+
+@pytest.fixture
+def backend():
+    return BrokenBackend()
+
+
+@pytest.fixture
+def service(backend):
+    service = TTSService(device="cpu", max_retries=3, retry_delay=0.0,
+                         backend_factory=lambda *args: backend, player=lambda samples, samplerate: None)
+    yield service
+    service.shutdown()
+
+
+def test_service_retries_by_default(service, backend):
+    assert service.speak("Привет") is False
+    assert backend.calls == 3
+
+
+def test_speak_uses_per_call_retries(service, backend):
+    assert service.speak("Привет", max_retries=1) is False
+    assert backend.calls == 1
+
+
+def test_gelya_speach_passes_max_retries(service, backend):
+    gelya = GelyaSpeach.__new__(GelyaSpeach)
+    gelya.service = service
+    assert gelya.speach("Привет", max_retries=2) is False
+    assert backend.calls == 2
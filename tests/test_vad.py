@@ -0,0 +1,58 @@
+# tests/test_vad.py
+import numpy as np
+
+from voice_input import EnergyVAD, VADGate
+
+SAMPLE_RATE = 16000
+CHUNK = 4000
+
+
+def chunks(signal):
+    return [signal[i:i + CHUNK].astype(np.int16).tobytes() for i in range(0, len(signal), CHUNK)]
+
+
+def tone(seconds, frequency, amplitude, rng=None, noise=0.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = amplitude * np.sin(2 * np.pi * frequency * t)
+    if rng is not None:
+        signal += rng.normal(0, noise, len(t))
+    return signal
+
+
+def speech(seconds, amplitude=6000):
+    """Речеподобный сигнал: слоги по 200 мс с паузами по 100 мс"""
+    signal = tone(seconds, 220, amplitude)
+    t = np.arange(len(signal)) / SAMPLE_RATE
+    signal[(t % 0.3) >= 0.2] = 0
+    return signal
+
+
+def test_silence_and_speech():
+    gate = VADGate(SAMPLE_RATE, CHUNK)
+    silence = np.zeros(SAMPLE_RATE * 2)
+    passed = [bool(gate.process(chunk)[0]) for chunk in chunks(np.concatenate([silence, speech(1.0)]))]
+    assert not any(passed[:8])
+    assert all(passed[8:])
+
+
+def test_gate_closes_under_constant_loud_background():
+    rng = np.random.default_rng(0)
+    fan = tone(10.0, 120, 3000, rng, noise=800)
+    detector = EnergyVAD(SAMPLE_RATE)
+    speech_ratio = [detector.speech_frames(np.frombuffer(chunk, np.int16)).mean() for chunk in chunks(fan)]
+
+    # Сначала фон громче порога и считается речью, но порог догоняет его
+    assert speech_ratio[0] == 1.0
+    assert max(speech_ratio[-12:]) == 0.0
+
+    # Речь поверх того же фона по-прежнему слышна
+    loud = speech(1.0, amplitude=15000) + tone(1.0, 120, 3000, rng, noise=800)
+    assert np.mean([detector.speech_frames(np.frombuffer(c, np.int16)).mean() for c in chunks(loud)]) > 0.5
+
+
+def test_floor_does_not_climb_during_speech():
+    detector = EnergyVAD(SAMPLE_RATE)
+    floor = detector.noise_floor
+    for chunk in chunks(speech(10.0)):
+        assert detector.speech_frames(np.frombuffer(chunk, np.int16)).any()
+    assert detector.noise_floor <= floor * 1.5
@@ -0,0 +1,153 @@
+# tests/test_wake_word.py
+import json
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from voice_input import SpeechPipeline, WakeWordSpotter, WavFileSource
+
+SAMPLE_RATE = 16000
+CHUNK = 4000  # 250 мс - одно "слово" на порцию
+
+# Вместо речи - тоны: каждое слово звучит своей частотой
+WORDS = {"геля": 300.0, "включи": 600.0, "свет": 900.0, "хорошо": 1200.0}
+SILENCE = None
+
+
+class AudioClock:
+    """Время по звуку: двигается на длину порции при каждой проверке mute()"""
+
+    def __init__(self, muted=()):
+        self.now = 0.0
+        self.muted = muted
+
+    def __call__(self):
+        return self.now
+
+    def mute(self):
+        # Вызывается конвейером один раз на порцию, до распознавания
+        self.now += CHUNK / SAMPLE_RATE
+        return any(start <= self.now < end for start, end in self.muted)
+
+
+class ToneRecognizer:
+    """Заглушка KaldiRecognizer: порция с тоном - слово, тишина после слов - конец фразы"""
+
+    def __init__(self):
+        self.words = []
+        self.text = ""
+
+    def _word(self, chunk):
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float64)
+        if np.abs(samples).max() < 1000:
+            return None
+        frequency = np.argmax(np.abs(np.fft.rfft(samples))) * SAMPLE_RATE / len(samples)
+        return min(WORDS, key=lambda word: abs(WORDS[word] - frequency))
+
+    def AcceptWaveform(self, chunk):
+        word = self._word(chunk)
+        if word is not None:
+            self.words.append(word)
+            return False
+        if not self.words:
+            return False
+        self.text, self.words = " ".join(self.words), []
+        return True
+
+    def Result(self):
+        return json.dumps({"text": self.text}, ensure_ascii=False)
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.words)}, ensure_ascii=False)
+
+    def FinalResult(self):
+        self.text, self.words = " ".join(self.words), []
+        return self.Result()
+
+    def Reset(self):
+        self.words = []
+
+
+def write_wav(path, words):
+    """WAV 16 кГц моно: по порции на слово, SILENCE - порция тишины"""
+    t = np.arange(CHUNK) / SAMPLE_RATE
+    chunks = [np.zeros(CHUNK) if word is SILENCE else 12000 * np.sin(2 * np.pi * WORDS[word] * t)
+              for word in words]
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(np.concatenate(chunks).astype(np.int16).tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def recognize(tmp_path):
+    def run(words, armed_timeout=2.0, muted=()):
+        clock = AudioClock(muted)
+        spotter = WakeWordSpotter(ToneRecognizer(), ("геля",), armed_timeout=armed_timeout, clock=clock)
+        pipeline = SpeechPipeline(WavFileSource(write_wav(tmp_path / "speech.wav", words)),
+                                  lambda rate: ToneRecognizer(), chunk_frames=CHUNK,
+                                  wake_word=spotter, mute=clock.mute)
+        pipeline.start()
+        results = list(pipeline.results())
+        pipeline.stop()
+        return results, pipeline
+    return run
+
+
+def test_wake_word_then_command(recognize):
+    results, pipeline = recognize(["геля", "включи", "свет", SILENCE, SILENCE])
+    assert results == ["включи свет"]
+    assert pipeline.stats()["wake_detections"] == 1
+
+
+def test_command_without_wake_word_is_ignored(recognize):
+    results, pipeline = recognize([SILENCE, "включи", "свет", SILENCE, SILENCE])
+    assert results == []
+    assert pipeline.stats()["wake_detections"] == 0
+
+
+def test_command_after_timeout_is_ignored(recognize):
+    words = ["геля"] + [SILENCE] * 8 + ["включи", "свет", SILENCE, SILENCE]
+    results, _ = recognize(words, armed_timeout=1.0)
+    assert results == []
+
+
+def test_recognized_phrase_does_not_extend_window(recognize):
+    # Окно 1.5 с от обращения; фраза в нем не продлевает окно для следующей
+    words = ["геля", "включи", "свет", SILENCE, SILENCE, SILENCE, "включи", "свет", SILENCE, SILENCE]
+    results, _ = recognize(words, armed_timeout=1.5)
+    assert results == ["включи свет"]
+
+
+def test_own_reply_is_not_recognized_while_muted(recognize):
+    # Ассистент отвечает "хорошо" (1.25-2.25 с), пока окно команды еще открыто
+    words = ["геля", "включи", "свет", SILENCE, "хорошо", "хорошо", "хорошо", SILENCE, SILENCE, SILENCE]
+    results, pipeline = recognize(words, armed_timeout=5.0, muted=[(1.25, 2.25)])
+    assert results == ["включи свет"]
+    assert pipeline.stats()["muted_chunks"] == 4
+
+
+def test_results_after_source_end_do_not_block(tmp_path):
+    source = WavFileSource(write_wav(tmp_path / "speech.wav", ["включи", "свет", SILENCE]))
+    pipeline = SpeechPipeline(source, lambda rate: ToneRecognizer(), chunk_frames=CHUNK)
+    pipeline.start()
+    assert list(pipeline.results()) == ["включи свет"]
+    assert pipeline.finished
+
+    # Повторный вызов не ждет вечно фраз от закончившегося источника
+    second = []
+    reader = threading.Thread(target=lambda: second.extend(pipeline.results()), daemon=True)
+    reader.start()
+    reader.join(timeout=2.0)
+    assert not reader.is_alive()
+    assert second == []
+
+    # После restart() источник открывается заново
+    pipeline.restart()
+    assert not pipeline.finished
+    assert list(pipeline.results()) == ["включи свет"]
+    pipeline.stop()
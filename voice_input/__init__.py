@@ -0,0 +1,14 @@
+"""
+Пакет захвата и распознавания речи
+"""
+
+from .ring_buffer import AudioRingBuffer
+from .audio_source import MicrophoneSource, WavFileSource
+from .speech_pipeline import SpeechPipeline
+from .vad import EnergyVAD, WebRTCVAD, VADGate
+from .wake_word import WakeWordSpotter
+from .partial_intent import PartialCommandTracker
+
+__all__ = ['AudioRingBuffer', 'MicrophoneSource', 'WavFileSource', 'SpeechPipeline',
+           'EnergyVAD', 'WebRTCVAD', 'VADGate', 'WakeWordSpotter',
+           'PartialCommandTracker']
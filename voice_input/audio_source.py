@@ -0,0 +1,101 @@
+# voice_input/audio_source.py
+import time
+import wave
+
+
+class MicrophoneSource:
+    """Захват звука с микрофона через PyAudio (16 бит, моно)"""
+
+    realtime = True
+
+    def __init__(self, rate=16000, frames_per_buffer=8000, device_index=None):
+        self.sample_rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.device_index = device_index
+        self.input_overflows = 0
+        self._pyaudio = None
+        self._stream = None
+
+    def open(self):
+        import pyaudio
+
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.frames_per_buffer,
+            input_device_index=self.device_index
+        )
+        self._stream.start_stream()
+
+    def read(self, frames):
+        """Читает frames сэмплов. Переполнение драйвера считается, а не теряется молча.
+
+        С exception_on_overflow=True PyAudio выбросил бы уже прочитанный буфер,
+        поэтому переполнение определяется до чтения: буфер драйвера заполнен
+        целиком - значит, новые сэмплы в нем уже затирали старые.
+        """
+        try:
+            available = self._stream.get_read_available()
+        except OSError:
+            available = 0
+        if available >= self.frames_per_buffer:
+            self.input_overflows += 1
+            print(f"[AUDIO] Переполнение входного буфера микрофона: {available} сэмплов не прочитано вовремя")
+        return self._stream.read(frames, exception_on_overflow=False)
+
+    def close(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception as e:
+                print(f"[AUDIO] Ошибка закрытия потока микрофона: {e}")
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+
+
+class WavFileSource:
+    """Источник звука из WAV-файла (16 бит, моно) - для проверок без микрофона.
+
+    realtime=True отдает данные с той же скоростью, что и настоящий микрофон.
+    """
+
+    def __init__(self, path, realtime=False):
+        self.path = path
+        self.realtime = realtime
+        self.sample_rate = None
+        self.input_overflows = 0
+        self._wav = None
+        self._started = None
+        self._frames_read = 0
+
+    def open(self):
+        self._wav = wave.open(self.path, "rb")
+        if self._wav.getsampwidth() != 2 or self._wav.getnchannels() != 1:
+            raise ValueError(f"{self.path}: нужен WAV 16 бит моно")
+        self.sample_rate = self._wav.getframerate()
+        self._started = time.monotonic()
+        self._frames_read = 0
+
+    def read(self, frames):
+        """Читает frames сэмплов. В конце файла возвращает None"""
+        data = self._wav.readframes(frames)
+        if not data:
+            return None
+
+        self._frames_read += len(data) // 2
+        if self.realtime:
+            delay = self._started + self._frames_read / self.sample_rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
@@ -0,0 +1,101 @@
+# voice_input/partial_intent.py
+import json
+import threading
+import time
+
+
+class PartialCommandTracker:
+    """Раннее срабатывание коротких команд по промежуточным гипотезам Vosk.
+
+    Каждая частичная гипотеза прогоняется через быстрый локальный матчер.
+    Если одна и та же команда держится stable_frames порций подряд и не
+    требует параметров (числа, текста), она выполняется сразу, не дожидаясь
+    тишины в конце фразы. Финальный результат с той же командой после этого
+    пропускается, чтобы команда не выполнилась дважды.
+
+    Если финал оказался другой командой ("включи синий" -> "включи голубой"),
+    он не добавляется к ранней, а заменяет ее: executor(result, executed)
+    получает уже выполненные команды, не повторяет их, а новые ставит в те же
+    группы вытеснения конвейера - еще не начатая ранняя команда отменяется.
+    """
+
+    def __init__(self, matcher, executor, stable_frames=2, dedupe_window=5.0, clock=time.monotonic):
+        self.matcher = matcher
+        self.executor = executor
+        self.stable_frames = stable_frames
+        self.dedupe_window = dedupe_window
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._candidate = None
+        self._stable = 0
+        self._fired = None
+        self._fired_commands = ()
+        self._fired_at = 0.0
+
+        self.early_fired = 0
+        self.finals_skipped = 0
+        self.finals_replaced = 0
+
+    def _signature(self, result):
+        if not result:
+            return None
+        return tuple(result["commands"]), json.dumps(result.get("parameters", {}), sort_keys=True)
+
+    def on_partial(self, text):
+        """Обрабатывает частичную гипотезу (вызывается из потока распознавания)"""
+        result = self.matcher(text) if text else None
+        # Команды с параметрами ждут финала: "громкость двадцать" может оказаться "двадцать пять"
+        if result is not None and result.get("parameters"):
+            result = None
+
+        with self._lock:
+            signature = self._signature(result)
+            if signature is None or signature != self._candidate:
+                self._candidate = signature
+                self._stable = 1 if signature is not None else 0
+                return
+
+            self._stable += 1
+            if self._stable < self.stable_frames or self._fired == signature:
+                return
+
+            self._fired = signature
+            self._fired_commands = tuple(result["commands"])
+            self._fired_at = self.clock()
+            self.early_fired += 1
+
+        print(f"[PARTIAL] Ранняя команда по гипотезе '{text}': {result['commands']}")
+        self.executor(result)
+
+    def consume_final(self, text):
+        """Обрабатывает финальную фразу.
+
+        Возвращает (handled, executed): handled - фраза уже обработана (ее
+        команда выполнена по гипотезе или заменила раннюю), executed - команды,
+        выполненные по гипотезе; при разборе фразы через LLM их не повторяют.
+        """
+        with self._lock:
+            fired, executed, fired_at = self._fired, self._fired_commands, self._fired_at
+            self._candidate = None
+            self._stable = 0
+            self._fired = None
+            self._fired_commands = ()
+
+        if fired is None or self.clock() - fired_at > self.dedupe_window:
+            return False, ()
+
+        result = self.matcher(text) if text else None
+        if self._signature(result) == fired:
+            self.finals_skipped += 1
+            print(f"[PARTIAL] Финальная фраза '{text}' уже выполнена по гипотезе")
+            return True, executed
+
+        if result is None:
+            # Финал разберет LLM - ранние команды он не должен запускать повторно
+            return False, executed
+
+        self.finals_replaced += 1
+        print(f"[PARTIAL] Финальная фраза '{text}' заменяет раннюю команду {list(executed)}: {result['commands']}")
+        self.executor(result, executed)
+        return True, executed
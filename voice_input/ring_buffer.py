@@ -0,0 +1,103 @@
+# voice_input/ring_buffer.py
+import threading
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Кольцевой буфер PCM-сэмплов с заранее выделенной памятью.
+
+    Поток захвата пишет, поток распознавания читает. Если читатель не
+    успевает и буфер заполнен, самые старые сэмплы перезаписываются, а
+    потери учитываются в счетчиках overflows / dropped_samples.
+    """
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._buffer = np.zeros(self.capacity, dtype=self.dtype)
+        self._read_pos = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.written_samples = 0
+        self.overflows = 0
+        self.dropped_samples = 0
+
+    def write(self, data):
+        """Записывает сэмплы (bytes или numpy-массив). Никогда не блокирует"""
+        samples = np.frombuffer(data, dtype=self.dtype) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        count = len(samples)
+        if count == 0:
+            return
+
+        # Если порция больше всего буфера - сохраняем только ее хвост
+        if count > self.capacity:
+            self.dropped_samples += count - self.capacity
+            samples = samples[-self.capacity:]
+            count = self.capacity
+
+        with self._cond:
+            free = self.capacity - self._size
+            if count > free:
+                lost = count - free
+                self._read_pos = (self._read_pos + lost) % self.capacity
+                self._size -= lost
+                self.overflows += 1
+                self.dropped_samples += lost
+
+            write_pos = (self._read_pos + self._size) % self.capacity
+            first = min(count, self.capacity - write_pos)
+            self._buffer[write_pos:write_pos + first] = samples[:first]
+            if first < count:
+                self._buffer[:count - first] = samples[first:]
+
+            self._size += count
+            self.written_samples += count
+            self._cond.notify_all()
+
+    def read(self, count, timeout=None):
+        """Читает ровно count сэмплов. Возвращает bytes или None (таймаут / буфер закрыт)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._size >= count or self._closed, timeout):
+                return None
+            if self._size < count:
+                # Буфер закрыт - отдаем остаток
+                if self._size == 0:
+                    return None
+                count = self._size
+
+            first = min(count, self.capacity - self._read_pos)
+            out = np.empty(count, dtype=self.dtype)
+            out[:first] = self._buffer[self._read_pos:self._read_pos + first]
+            if first < count:
+                out[first:] = self._buffer[:count - first]
+
+            self._read_pos = (self._read_pos + count) % self.capacity
+            self._size -= count
+            self._cond.notify_all()
+            return out.tobytes()
+
+    def wait_for_space(self, count, timeout=None):
+        """Ждет, пока в буфере освободится место под count сэмплов.
+
+        Нужно только источникам без реального времени (файлы), чтобы не терять данные
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self.capacity - self._size >= min(count, self.capacity) or self._closed, timeout
+            )
+
+    def available(self):
+        with self._cond:
+            return self._size
+
+    def close(self):
+        """Закрывает буфер: читатели получают остаток и затем None"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
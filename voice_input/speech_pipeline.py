@@ -0,0 +1,213 @@
+# voice_input/speech_pipeline.py
+import json
+import queue
+import threading
+
+from .ring_buffer import AudioRingBuffer
+
+
+class SpeechPipeline:
+    """Захват звука и распознавание речи в разных потоках.
+
+    Поток захвата только читает источник и пишет в кольцевой буфер, поэтому
+    микрофон вычитывается вовремя, даже если распознавание или потребитель
+    результатов (Ollama, TTS) заняты. Поток распознавания забирает звук из
+    буфера и передает его KaldiRecognizer, готовые фразы попадают в очередь.
+
+    Пока mute() возвращает True (например, ассистент сам говорит), звук
+    из буфера выбрасывается, а недослушанная фраза сбрасывается - иначе
+    микрофон принял бы ответ ассистента за команду.
+    """
+
+    def __init__(self, source, recognizer_factory, chunk_frames=4000, buffer_seconds=10.0, vad=None,
+                 wake_word=None, on_partial=None, mute=None):
+        self.source = source
+        self.recognizer_factory = recognizer_factory
+        self.chunk_frames = chunk_frames
+        self.buffer_seconds = buffer_seconds
+        # VADGate: тишина не доходит до распознавателя
+        self.vad = vad
+        # WakeWordSpotter: полное распознавание только после слова-обращения
+        self.wake_word = wake_word
+        # Обработчик промежуточных гипотез (PartialResult) - для ранних команд
+        self.on_partial = on_partial
+        self._last_partial = ""
+        self.mute = mute
+        self._muted = False
+        self.muted_chunks = 0
+
+        self.ring = None
+        self.recognized = 0
+        self._results = queue.Queue()
+        self._finished = False
+        self._running = False
+        self._capture_thread = None
+        self._recognize_thread = None
+
+    def start(self):
+        """Открывает источник и запускает потоки захвата и распознавания"""
+        self.source.open()
+        self.ring = AudioRingBuffer(int(self.source.sample_rate * self.buffer_seconds))
+        self._results = queue.Queue()
+        self._finished = False
+        self._running = True
+
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="audio-capture", daemon=True)
+        self._recognize_thread = threading.Thread(target=self._recognize_loop, name="speech-recognizer", daemon=True)
+        self._recognize_thread.start()
+        self._capture_thread.start()
+
+    def stop(self):
+        """Останавливает захват; распознавание дочитывает буфер и завершается"""
+        self._running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2.0)
+        if self._recognize_thread is not None:
+            self._recognize_thread.join(timeout=2.0)
+
+    def restart(self):
+        """Переоткрывает источник после его завершения (например, отключения микрофона)"""
+        self.stop()
+        try:
+            self.start()
+        except Exception:
+            self.source.close()
+            raise
+
+    @property
+    def finished(self):
+        """Источник закончился, results() больше ничего не вернет до restart()"""
+        return self._finished
+
+    def _capture_loop(self):
+        # Файл без реального времени читается быстрее, чем распознается - ждем места в буфере
+        lossless = not getattr(self.source, "realtime", True)
+        try:
+            while self._running:
+                if lossless:
+                    self.ring.wait_for_space(self.chunk_frames)
+                data = self.source.read(self.chunk_frames)
+                if data is None:
+                    break
+                self.ring.write(data)
+        except Exception as e:
+            print(f"[AUDIO] Ошибка захвата звука: {e}")
+        finally:
+            self.ring.close()
+            self.source.close()
+
+    def _recognize_loop(self):
+        try:
+            recognizer = self.recognizer_factory(self.source.sample_rate)
+            while True:
+                data = self.ring.read(self.chunk_frames, timeout=0.5)
+                if data is None:
+                    if self.ring.closed and self.ring.available() == 0:
+                        break
+                    continue
+                self._process_chunk(recognizer, data)
+
+            # Источник закончился - забираем то, что осталось в распознавателе
+            self._emit(json.loads(recognizer.FinalResult()).get("text", ""))
+        except Exception as e:
+            print(f"[CRITICAL] Ошибка распознавания: {e}")
+        finally:
+            self._results.put(None)
+
+    def _process_chunk(self, recognizer, data):
+        """Передает порцию звука распознавателю (через VAD и детектор обращения, если заданы)"""
+        if self._is_muted(recognizer):
+            return
+
+        if self.vad is None:
+            self._accept(recognizer, data)
+            return
+
+        chunks, segment_ended = self.vad.process(data)
+        for chunk in chunks:
+            self._accept(recognizer, chunk)
+        if segment_ended and self._recognizer_active():
+            # Речь закончилась - не ждем эндпоинтинга Vosk, забираем результат сразу
+            self._emit(json.loads(recognizer.FinalResult()).get("text", ""))
+
+    def _is_muted(self, recognizer):
+        """Проверяет mute(); в момент включения сбрасывает недослушанную фразу"""
+        if self.mute is None:
+            return False
+        try:
+            muted = bool(self.mute())
+        except Exception as e:
+            print(f"[AUDIO] Ошибка проверки mute: {e}")
+            muted = False
+
+        if muted:
+            if not self._muted:
+                recognizer.Reset()
+                self._last_partial = ""
+            self.muted_chunks += 1
+        self._muted = muted
+        return muted
+
+    def _recognizer_active(self):
+        return self.wake_word is None or self.wake_word.armed
+
+    def _accept(self, recognizer, data):
+        if self.wake_word is None:
+            chunks = [data]
+        else:
+            if self.wake_word.check_expired():
+                # Окно команды закрылось - дочитываем незаконченную фразу
+                self._emit(json.loads(recognizer.FinalResult()).get("text", ""))
+            chunks = self.wake_word.process(data)
+
+        for chunk in chunks:
+            if recognizer.AcceptWaveform(chunk):
+                self._emit(json.loads(recognizer.Result()).get("text", ""))
+            elif self.on_partial is not None:
+                self._emit_partial(json.loads(recognizer.PartialResult()).get("partial", ""))
+
+    def _emit_partial(self, text):
+        if self.wake_word is not None:
+            text = self.wake_word.strip_wake_word(text)
+        if not text and not self._last_partial:
+            return
+        self._last_partial = text
+        try:
+            self.on_partial(text)
+        except Exception as e:
+            print(f"[PARTIAL] Ошибка обработки гипотезы: {e}")
+
+    def _emit(self, text):
+        self._last_partial = ""
+        if self.wake_word is not None and text:
+            text = self.wake_word.strip_wake_word(text)
+        if text:
+            self.recognized += 1
+            self._results.put(text)
+
+    def results(self):
+        """Генератор распознанных фраз. Завершается, когда источник закончился.
+
+        После завершения повторный вызов сразу возвращается, а не ждет
+        фраз, которых уже не будет.
+        """
+        while not self._finished:
+            text = self._results.get()
+            if text is None:
+                self._finished = True
+                return
+            yield text
+
+    def stats(self):
+        """Счетчики потерь звука и распознанных фраз"""
+        ring = self.ring
+        return {
+            "buffer_overflows": ring.overflows if ring else 0,
+            "dropped_samples": ring.dropped_samples if ring else 0,
+            "buffered_samples": ring.available() if ring else 0,
+            "input_overflows": self.source.input_overflows,
+            "recognized": self.recognized,
+            "muted_chunks": self.muted_chunks,
+            "vad": self.vad.stats() if self.vad is not None else None,
+            "wake_detections": self.wake_word.detections if self.wake_word is not None else None,
+        }
@@ -0,0 +1,157 @@
+# voice_input/vad.py
+from collections import deque
+
+import numpy as np
+
+
+class EnergyVAD:
+    """Детектор речи по энергии и частоте переходов через ноль (ZCR).
+
+    Звук режется на кадры по frame_ms, все кадры порции считаются одним
+    векторным проходом NumPy. Порог энергии адаптивный: он держится выше
+    оцененного уровня фонового шума в ratio раз.
+
+    Шум оценивается по кадрам без речи, а кроме того уровень медленно
+    подтягивается к минимуму энергии за последние noise_window_ms - даже
+    если все кадры сочтены речью. Иначе под постоянным громким фоном
+    (вентилятор, музыка) порог никогда не догнал бы шум и ворота не
+    закрылись бы. В настоящей речи паузы между словами держат минимум окна
+    низким.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=20, ratio=3.0, min_energy=300.0,
+                 max_zcr=0.35, noise_adapt=0.05, noise_window_ms=2000, noise_track=0.01):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.max_zcr = max_zcr
+        self.noise_adapt = noise_adapt
+        # Скорость подтягивания к минимуму окна - на кадр
+        self.noise_track = noise_track
+        self.noise_floor = min_energy / ratio
+        self._recent_energy = deque(maxlen=max(1, int(noise_window_ms / frame_ms)))
+
+    def speech_frames(self, samples):
+        """Возвращает булев массив: есть ли речь в каждом кадре порции"""
+        count = len(samples) // self.frame_len
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+
+        frames = samples[:count * self.frame_len].reshape(count, self.frame_len).astype(np.float32)
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_len
+
+        threshold = max(self.min_energy, self.noise_floor * self.ratio)
+        # Громкие кадры - речь всегда; кадры около порога - только с "речевым" ZCR (не шипение)
+        speech = (energy > 2 * threshold) | ((energy > threshold) & (zcr < self.max_zcr))
+
+        quiet = energy[~speech]
+        if len(quiet):
+            self.noise_floor += self.noise_adapt * (float(quiet.mean()) - self.noise_floor)
+
+        # Минимум энергии за окно: ниже него фон не опускался - это тоже шум
+        self._recent_energy.extend(energy.tolist())
+        window_min = min(self._recent_energy)
+        if window_min > self.noise_floor:
+            rate = 1.0 - (1.0 - self.noise_track) ** count
+            self.noise_floor += rate * (window_min - self.noise_floor)
+        return speech
+
+
+class WebRTCVAD:
+    """Детектор речи на webrtcvad (если пакет установлен)"""
+
+    def __init__(self, sample_rate=16000, frame_ms=20, aggressiveness=2):
+        import webrtcvad
+
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def speech_frames(self, samples):
+        count = len(samples) // self.frame_len
+        return np.array([
+            self._vad.is_speech(samples[i * self.frame_len:(i + 1) * self.frame_len].tobytes(), self.sample_rate)
+            for i in range(count)
+        ], dtype=bool)
+
+
+class VADGate:
+    """Пропускает к распознавателю только речь.
+
+    Пока тишина - порции копятся в буфере предзаписи (pre-roll) и никуда не
+    идут. С началом речи распознаватель получает предзапись и текущий звук;
+    после hangover_ms тишины сегмент закрывается (ended=True), чтобы
+    распознаватель выдал финальный результат.
+    """
+
+    def __init__(self, sample_rate=16000, chunk_frames=4000, hangover_ms=400, preroll_ms=300,
+                 detector=None, use_webrtc=False):
+        self.sample_rate = sample_rate
+        self.detector = detector or self._create_detector(sample_rate, use_webrtc)
+
+        chunk_ms = 1000.0 * chunk_frames / sample_rate
+        self.hangover_ms = hangover_ms
+        self._preroll = deque(maxlen=max(1, int(np.ceil(preroll_ms / chunk_ms))))
+        self._active = False
+        self._silence_ms = 0.0
+
+        self.chunks_total = 0
+        self.chunks_passed = 0
+        self.segments = 0
+
+    def _create_detector(self, sample_rate, use_webrtc):
+        if use_webrtc:
+            try:
+                return WebRTCVAD(sample_rate)
+            except ImportError:
+                print("[VAD] webrtcvad не установлен, использую энергетический детектор")
+        return EnergyVAD(sample_rate)
+
+    def process(self, data):
+        """Обрабатывает порцию звука (bytes).
+
+        Возвращает (список порций для распознавателя, закончился ли речевой сегмент)
+        """
+        self.chunks_total += 1
+        samples = np.frombuffer(data, dtype=np.int16)
+        chunk_ms = 1000.0 * len(samples) / self.sample_rate
+        has_speech = bool(self.detector.speech_frames(samples).any())
+
+        if not self._active:
+            if not has_speech:
+                self._preroll.append(data)
+                return [], False
+            # Начало речи: отдаем предзапись, чтобы не потерять начало слова
+            self._active = True
+            self._silence_ms = 0.0
+            self.segments += 1
+            out = list(self._preroll) + [data]
+            self._preroll.clear()
+            self.chunks_passed += len(out)
+            return out, False
+
+        self.chunks_passed += 1
+        if has_speech:
+            self._silence_ms = 0.0
+            return [data], False
+
+        self._silence_ms += chunk_ms
+        if self._silence_ms >= self.hangover_ms:
+            self._active = False
+            return [data], True
+        return [data], False
+
+    @property
+    def active(self):
+        return self._active
+
+    def stats(self):
+        return {
+            "chunks_total": self.chunks_total,
+            "chunks_passed": self.chunks_passed,
+            "segments": self.segments,
+            "pass_ratio": self.chunks_passed / self.chunks_total if self.chunks_total else 0.0,
+        }
@@ -0,0 +1,92 @@
+# voice_input/wake_word.py
+import json
+import time
+from collections import deque
+from difflib import SequenceMatcher
+
+
+class WakeWordSpotter:
+    """Легкий детектор слова-обращения перед полным распознаванием.
+
+    Пока ассистент "спит", звук слушает отдельный KaldiRecognizer с
+    ограниченной грамматикой (только слова-обращения и [unk]) - это намного
+    дешевле полного декодирования всей речи вокруг. После слова-обращения
+    детектор "взводится": звук (вместе с предзаписью, где прозвучало само
+    обращение) идет в полный распознаватель, пока не истечет armed_timeout
+    с момента обращения. Распознанные фразы окно не продлевают: иначе
+    собственные ответы ассистента, услышанные микрофоном, держали бы его
+    открытым бесконечно.
+    """
+
+    def __init__(self, recognizer, wake_words=("геля", "ангелина"), armed_timeout=8.0,
+                 preroll_chunks=2, clock=time.monotonic):
+        self.recognizer = recognizer
+        self.wake_words = tuple(wake_words)
+        self.armed_timeout = armed_timeout
+        self.clock = clock
+        self._recent = deque(maxlen=preroll_chunks)
+        self._armed_until = None
+
+        self.detections = 0
+
+    @classmethod
+    def from_model(cls, model, sample_rate=16000, wake_words=("геля", "ангелина"), **kwargs):
+        """Создает детектор на модели Vosk с грамматикой из слов-обращений"""
+        from vosk import KaldiRecognizer
+
+        grammar = json.dumps(list(wake_words) + ["[unk]"], ensure_ascii=False)
+        return cls(KaldiRecognizer(model, sample_rate, grammar), wake_words, **kwargs)
+
+    @property
+    def armed(self):
+        return self._armed_until is not None and self.clock() < self._armed_until
+
+    def arm(self):
+        self._armed_until = self.clock() + self.armed_timeout
+
+    def disarm(self):
+        self._armed_until = None
+
+    def check_expired(self):
+        """Закрывает окно команды, если время истекло. Возвращает True в момент закрытия"""
+        if self._armed_until is not None and not self.armed:
+            print("[WAKE] Время ожидания команды истекло")
+            self.disarm()
+            return True
+        return False
+
+    def process(self, chunk):
+        """Принимает порцию звука. Возвращает порции для полного распознавателя.
+
+        Пока детектор не взведен, возвращает пустой список.
+        """
+        self.check_expired()
+        if self.armed:
+            return [chunk]
+
+        self._recent.append(chunk)
+        if self.recognizer.AcceptWaveform(chunk):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+
+        if not any(word in self.wake_words for word in text.split()):
+            return []
+
+        self.detections += 1
+        print("[WAKE] Услышала обращение")
+        self.recognizer.Reset()
+        self.arm()
+        out = list(self._recent)
+        self._recent.clear()
+        return out
+
+    def strip_wake_word(self, text):
+        """Убирает слово-обращение в начале фразы (с учетом неточного распознавания)"""
+        words = (text or "").split()
+        if words and self._is_wake_word(words[0]):
+            words = words[1:]
+        return " ".join(words).strip()
+
+    def _is_wake_word(self, word):
+        return any(SequenceMatcher(None, word, wake).ratio() >= 0.6 for wake in self.wake_words)